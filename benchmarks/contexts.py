@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: missing-keyword context extraction.
+
+Compares the per-keyword scan (find_keyword_occurrences slices the JD token
+list at every position) with the positional TokenIndex used by JobProfile,
+for every keyword of a category against JDs of increasing length.
+
+    python -m benchmarks.contexts --category engineering --jd tests/engineering/jd.txt
+"""
+import argparse
+import sys
+import time
+
+from src.backend.services.keyword_catalogue import keyword_catalogue
+from src.backend.services.keyword_matcher import TokenIndex, tokenize
+from src.backend.services.scoring import extract_context, find_keyword_occurrences
+
+
+def scan_contexts(jd_tokens, keywords):
+    """The old lookup: first occurrence of each keyword by linear scan."""
+    contexts = {}
+    for kw in keywords:
+        kw_tokens = tokenize(kw)
+        contexts[kw] = ["", ""]
+        for idx in find_keyword_occurrences(jd_tokens, kw_tokens):
+            contexts[kw] = list(extract_context(jd_tokens, idx, len(kw_tokens)))
+            break
+    return contexts
+
+
+def index_contexts(jd_tokens, keywords):
+    """TokenIndex lookup of every occurrence of each keyword (index build included)."""
+    index = TokenIndex(jd_tokens)
+    contexts = {}
+    for kw in keywords:
+        kw_tokens = tokenize(kw)
+        contexts[kw] = [extract_context(jd_tokens, idx, len(kw_tokens)) for idx in index.occurrences(kw_tokens)]
+    return contexts
+
+
+def best_of(fn, *args, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--category", default="engineering")
+    parser.add_argument("--jd", default="tests/engineering/jd.txt")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50], help="JD repetitions")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    keywords = keyword_catalogue.get(args.category).keywords
+    with open(args.jd, encoding="utf-8") as f:
+        jd_text = f.read()
+
+    print(f"{len(keywords)} keywords ({args.category})")
+    print(f"{'JD tokens':>10} {'scan ms':>10} {'index ms':>10} {'speed-up':>9}")
+    for scale in args.scales:
+        jd_tokens = tokenize("\n".join([jd_text] * scale))
+        scan_ms = best_of(scan_contexts, jd_tokens, keywords, repeat=args.repeat)
+        index_ms = best_of(index_contexts, jd_tokens, keywords, repeat=args.repeat)
+        print(f"{len(jd_tokens):>10} {scan_ms:>10.2f} {index_ms:>10.2f} {scan_ms / index_ms:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,488 @@
+"""
+Load test for /analyse against a local stand-in for the Groq API.
+
+`run` starts the fake Groq server and the API (uvicorn, pointed at the fake
+through GROQ_BASE_URL), replays the tests/engineering fixtures and generated
+PDF resumes at a fixed request rate (open loop: requests are sent on schedule
+whether or not earlier ones finished) and writes a JSON report with achieved
+RPS, client latency, p50/p95/p99 per pipeline stage (from the difference of
+two /metrics scrapes), status and error counts, RSS of the API process and its
+workers over the run, and temp files the API left behind.
+
+    python -m benchmarks.load run --rate 5 --duration 60 --out data/benchmarks/load.json
+    python -m benchmarks.load run --groq-latency 1.5 --groq-error-rate 0.1 --unique
+    python -m benchmarks.load fake-groq --port 8765 --latency 0.8   # standalone, GROQ_BASE_URL=http://127.0.0.1:8765
+
+Memory is read from /proc, so it is only reported on Linux.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import re
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.synthetic import FIXTURE_DIR, make_pdf, synthetic_resume
+from src.backend.core.config import BASE_DIR
+
+DEFAULT_PAGES = [1, 2, 5]
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# -- fake Groq
+
+def fake_groq_app(latency: float, jitter: float, error_rate: float, error_status: int, seed: int = 0):
+    """
+    OpenAI-compatible chat completions endpoint that answers the resume and JD
+    extraction prompts after a normally distributed delay. The skills it returns
+    are the catalogue keywords found in the prompt, so results are deterministic;
+    `error_rate` of the calls fail with `error_status` instead.
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+
+    from src.backend.services.keyword_catalogue import keyword_catalogue
+
+    app = FastAPI()
+    rng = random.Random(seed)
+    stats = Counter()
+
+    def skills(text: str) -> List[str]:
+        return sorted(keyword_catalogue.union().matcher.find_all(text.lower()))
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat(request: Request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        kind = "resume" if "Resume Text:" in prompt else "jd"
+        stats[f"{kind}_calls"] += 1
+        await asyncio.sleep(max(0.0, rng.gauss(latency, jitter)))
+        if rng.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": {"message": "injected error", "type": "load_test"}},
+                                status_code=error_status, headers={"retry-after": "0"})
+        if kind == "resume":
+            found = skills(prompt.split("Resume Text:", 1)[1])
+            content = {"personal_info": {"name": "Load Test", "email": None}, "skills": found, "summary": ""}
+        else:
+            found = skills(prompt.split("Job Description Text:", 1)[1])
+            content = {"role_title": "Engineer", "required_skills": found[::2], "nice_to_have_skills": found[1::2],
+                       "experience_level": "Mid", "key_responsibilities": []}
+        return {
+            "id": f"load-{sum(stats.values())}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": json.dumps(content)}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    @app.get("/stats")
+    async def fake_stats():
+        return dict(stats)
+
+    return app
+
+
+# -- payloads
+
+def build_payloads(category: str, pages_list: List[int]) -> List[Tuple[str, Dict[str, str], Optional[str]]]:
+    """(name, form fields, PDF resume text or None): the fixture resumes as text, then one generated PDF per page count."""
+    from src.backend.services.scoring import get_keywords_list
+
+    with open(os.path.join(FIXTURE_DIR, "jd.txt"), encoding="utf-8") as f:
+        job_text = f.read()
+    payloads = []
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.startswith("resume") and name.endswith(".txt"):
+            with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+                payloads.append((name, {"resume_textarea": f.read(), "jobdesc_textarea": job_text,
+                                        "jobdesc_category": category}, None))
+    keywords = get_keywords_list(category)
+    for pages in pages_list:
+        payloads.append((f"synthetic_{pages}p.pdf", {"jobdesc_textarea": job_text, "jobdesc_category": category},
+                         synthetic_resume(keywords, pages, category)))
+    return payloads
+
+
+# -- metrics and processes
+
+_BUCKET_LINE = re.compile(r'^(\w+)_bucket\{(.*),le="([^"]+)"\} (\S+)$')
+
+
+def parse_buckets(text: str, name: str) -> Dict[str, List[Tuple[float, float]]]:
+    """Label string -> [(upper bound, cumulative count)] for one histogram of a /metrics scrape."""
+    series: Dict[str, List[Tuple[float, float]]] = {}
+    for line in text.splitlines():
+        match = _BUCKET_LINE.match(line)
+        if match and match.group(1) == name:
+            series.setdefault(match.group(2), []).append((float(match.group(3)), float(match.group(4))))
+    return series
+
+
+def bucket_quantile(buckets: List[Tuple[float, float]], q: float) -> Optional[float]:
+    """Quantile estimated by linear interpolation inside the bucket, like Prometheus' histogram_quantile."""
+    total = buckets[-1][1] if buckets else 0
+    if not total:
+        return None
+    rank = q * total
+    lower, below = 0.0, 0.0
+    for bound, cumulative in buckets:
+        if cumulative >= rank:
+            if bound == float("inf"):
+                return lower # only known to be above the largest finite bucket
+            return lower + (bound - lower) * (rank - below) / max(cumulative - below, 1e-12)
+        lower, below = bound, cumulative
+    return lower
+
+
+def histogram_delta(before: str, after: str, name: str) -> Dict[str, List[Tuple[float, float]]]:
+    """Per-series buckets of the observations made between two scrapes."""
+    old = parse_buckets(before, name)
+    delta = {}
+    for labels, buckets in parse_buckets(after, name).items():
+        previous = dict(old.get(labels, []))
+        delta[labels] = [(bound, count - previous.get(bound, 0.0)) for bound, count in buckets]
+    return delta
+
+
+def summarise_buckets(buckets: List[Tuple[float, float]]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"count": int(buckets[-1][1]) if buckets else 0}
+    for q in QUANTILES:
+        value = bucket_quantile(buckets, q)
+        summary[f"p{int(q * 100)}_ms"] = None if value is None else round(value * 1000, 2)
+    return summary
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    out = {f"p{int(q * 100)}_ms": round(values[min(len(values) - 1, int(q * len(values)))], 2) if values else None
+           for q in QUANTILES}
+    out["max_ms"] = round(values[-1], 2) if values else None
+    return out
+
+
+def process_tree(pid: int) -> List[int]:
+    """pid and all of its descendants (the API process and its executor workers)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+async def sample_memory(pid: int, interval: float, samples: Dict[int, List[float]], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        for child in process_tree(pid):
+            rss = rss_mb(child)
+            if rss is not None:
+                samples.setdefault(child, []).append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def memory_report(pid: int, samples: Dict[int, List[float]]) -> Dict[str, Any]:
+    processes = [{
+        "pid": child,
+        "role": "api" if child == pid else "worker",
+        "start_mb": round(values[0], 1),
+        "peak_mb": round(max(values), 1),
+        "end_mb": round(values[-1], 1),
+        "growth_mb": round(values[-1] - values[0], 1),
+    } for child, values in sorted(samples.items())]
+    return {
+        "processes": processes,
+        "total_growth_mb": round(sum(p["growth_mb"] for p in processes), 1),
+        "total_end_mb": round(sum(p["end_mb"] for p in processes), 1),
+    }
+
+
+# -- load generation
+
+@lru_cache(maxsize=None)
+def _pdf(text: str) -> bytes:
+    return make_pdf(text)
+
+
+async def send(client: httpx.AsyncClient, url: str, payload, nonce: Optional[int], timeout: float) -> Tuple[str, float]:
+    """POST one analysis; returns (status code or exception name, latency in ms)."""
+    name, data, pdf_text = payload
+    if nonce is not None:
+        # a unique JD and resume per request, so caches cannot absorb the load
+        data = dict(data, jobdesc_textarea=f"{data['jobdesc_textarea']}\nReference {nonce}")
+        if pdf_text is None:
+            data["resume_textarea"] += f"\nReference {nonce}"
+        else:
+            pdf_text += f"\nReference {nonce}"
+    files = None
+    if pdf_text is not None:
+        files = {"resume_pdf": (name, _pdf(pdf_text) if nonce is None else make_pdf(pdf_text), "application/pdf")}
+    start = time.perf_counter()
+    try:
+        response = await client.post(url, data=data, files=files, timeout=timeout)
+        outcome = str(response.status_code)
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    return outcome, (time.perf_counter() - start) * 1000
+
+
+async def drive(base_url: str, payloads, rate: float, duration: float, timeout: float,
+                unique: bool, pid: Optional[int], sample_interval: float) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        metrics_before = (await client.get("/metrics")).text
+        samples: Dict[int, List[float]] = {}
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_memory(pid, sample_interval, samples, stop)) if pid else None
+
+        tasks = []
+        start = loop.time()
+        total = max(1, int(rate * duration))
+        for i in range(total):
+            await asyncio.sleep(max(0.0, start + i / rate - loop.time()))
+            tasks.append(asyncio.create_task(
+                send(client, "/analyse", payloads[i % len(payloads)], i if unique else None, timeout)))
+        outcomes = await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+
+        stop.set()
+        if sampler is not None:
+            await sampler
+        metrics_after = (await client.get("/metrics")).text
+
+    statuses = Counter(outcome for outcome, _ in outcomes)
+    ok = [latency for outcome, latency in outcomes if outcome == "200"]
+    stages = histogram_delta(metrics_before, metrics_after, "resume_analyser_stage_seconds")
+    server = histogram_delta(metrics_before, metrics_after, "resume_analyser_request_seconds")
+    server_analyse = [buckets for labels, buckets in server.items() if 'path="/analyse"' in labels]
+    return {
+        "requests": {
+            "sent": len(outcomes),
+            "ok": len(ok),
+            "errors": len(outcomes) - len(ok),
+            "error_rate": round((len(outcomes) - len(ok)) / len(outcomes), 4),
+            "statuses": dict(statuses),
+            "elapsed_s": round(elapsed, 2),
+            "target_rps": rate,
+            "achieved_rps": round(len(ok) / elapsed, 2) if elapsed else None,
+            "latency": percentiles(ok),
+        },
+        "server_latency": summarise_buckets([
+            (bound, sum(buckets[i][1] for buckets in server_analyse))
+            for i, (bound, _) in enumerate(server_analyse[0])]) if server_analyse else None,
+        "stages": {
+            re.sub(r'^stage="(.*)"$', r"\1", labels): summarise_buckets(buckets)
+            for labels, buckets in sorted(stages.items()) if buckets and buckets[-1][1]
+        },
+        "memory": memory_report(pid, samples) if samples else None,
+    }
+
+
+# -- processes
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def stop(process: subprocess.Popen) -> None:
+    """Terminate a server, then kill it and any executor workers it left behind."""
+    descendants = process_tree(process.pid)[1:] if os.path.isdir("/proc") else []
+    process.terminate()
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    for pid in descendants:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def _wait_for(url: str, timeout: float, ready=lambda response: response.status_code == 200) -> httpx.Response:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = httpx.get(url, timeout=2)
+            if ready(response):
+                return response
+        except httpx.HTTPError:
+            response = None
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+        time.sleep(0.25)
+
+
+def run(args) -> int:
+    payloads = build_payloads(args.category, args.pages)
+    groq_port, api_port = _free_port(), _free_port()
+    tmp_dir = tempfile.mkdtemp(prefix="resume-analyser-load-")
+    env = dict(os.environ, GROQ_BASE_URL=f"http://127.0.0.1:{groq_port}", TMPDIR=tmp_dir)
+    env.setdefault("GROQ_API_KEY", "load-test")
+    if not args.ai_cache:
+        env["AI_CACHE_ENABLED"] = "false" # every analysis reaches the fake Groq
+
+    processes = []
+    # stop the fake Groq and the API even when the harness itself is terminated
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    try:
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.load", "fake-groq", "--port", str(groq_port),
+             "--latency", str(args.groq_latency), "--jitter", str(args.groq_jitter),
+             "--error-rate", str(args.groq_error_rate), "--error-status", str(args.groq_error_status)],
+            cwd=BASE_DIR, env=env))
+        _wait_for(f"http://127.0.0.1:{groq_port}/stats", args.startup_timeout)
+
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.backend.main:app", "--host", "127.0.0.1",
+             "--port", str(api_port), "--log-level", "warning"], cwd=BASE_DIR, env=env)
+        processes.append(api)
+        base_url = f"http://127.0.0.1:{api_port}"
+        # /ready answers 503 while the models load; a failed warm-up is reported in the body
+        status = _wait_for(f"{base_url}/ready", args.startup_timeout,
+                           lambda response: response.status_code == 200 or response.json().get("error")).json()
+        if status.get("error"):
+            print(f"API model warm-up failed: {status['error']}", file=sys.stderr)
+            return 1
+
+        print(f"{args.rate} req/s for {args.duration}s over {len(payloads)} payloads ...", file=sys.stderr)
+        results = asyncio.run(drive(base_url, payloads, args.rate, args.duration, args.timeout, args.unique,
+                                    api.pid if os.path.isdir("/proc") else None, args.sample_interval))
+        results["groq"] = httpx.get(f"http://127.0.0.1:{groq_port}/stats").json()
+        results["temp_files_left"] = sum(len(files) for _, _, files in os.walk(tmp_dir))
+    finally:
+        for process in reversed(processes):
+            stop(process)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "rate": args.rate,
+            "duration": args.duration,
+            "unique": args.unique,
+            "ai_cache": args.ai_cache,
+            "payloads": [name for name, _, _ in payloads],
+            "groq": {"latency": args.groq_latency, "jitter": args.groq_jitter,
+                     "error_rate": args.groq_error_rate, "error_status": args.groq_error_status},
+        },
+        **results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"Wrote '{args.out}'.", file=sys.stderr)
+    return 0
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    requests = report["requests"]
+    latency = requests["latency"]
+    print(f"sent {requests['sent']}, ok {requests['ok']}, error rate {requests['error_rate']:.1%} "
+          f"{requests['statuses']}, {requests['achieved_rps']} req/s (target {requests['target_rps']})")
+    print(f"client latency p50 {latency['p50_ms']} ms, p95 {latency['p95_ms']} ms, p99 {latency['p99_ms']} ms")
+    print(f"{'stage':<28} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for stage, row in report["stages"].items():
+        print(f"{stage:<28} {row['count']:>7} " + " ".join(
+            f"{row[key] if row[key] is not None else '-':>10}" for key in ("p50_ms", "p95_ms", "p99_ms")))
+    print(f"groq {report['groq']}")
+    if report["memory"]:
+        for process in report["memory"]["processes"]:
+            print(f"{process['role']:<7} pid {process['pid']:<8} {process['start_mb']:>8} -> {process['end_mb']} MB "
+                  f"(peak {process['peak_mb']}, growth {process['growth_mb']:+})")
+    print(f"temp files left by the API: {report['temp_files_left']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test /analyse with a fake Groq server")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    groq = sub.add_parser("fake-groq", help="serve the fake Groq API")
+    groq.add_argument("--port", type=int, default=8765)
+    groq.add_argument("--latency", type=float, default=0.8, help="mean seconds per completion")
+    groq.add_argument("--jitter", type=float, default=0.2, help="standard deviation of the latency")
+    groq.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls that fail")
+    groq.add_argument("--error-status", type=int, default=429, choices=[429, 500, 503])
+    groq.add_argument("--seed", type=int, default=0)
+
+    load = sub.add_parser("run", help="start the fake Groq and the API, run the load and write a report")
+    load.add_argument("--rate", type=float, default=5.0, help="requests per second")
+    load.add_argument("--duration", type=float, default=30.0, help="seconds")
+    load.add_argument("--category", default="engineering")
+    load.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES, help="generated PDF resume sizes")
+    load.add_argument("--unique", action="store_true", help="make every request distinct so caches do not help")
+    load.add_argument("--ai-cache", action="store_true", help="keep the AI extraction cache on")
+    load.add_argument("--groq-latency", type=float, default=0.8)
+    load.add_argument("--groq-jitter", type=float, default=0.2)
+    load.add_argument("--groq-error-rate", type=float, default=0.0)
+    load.add_argument("--groq-error-status", type=int, default=429, choices=[429, 500, 503])
+    load.add_argument("--timeout", type=float, default=120.0, help="client timeout per request")
+    load.add_argument("--sample-interval", type=float, default=1.0, help="seconds between memory samples")
+    load.add_argument("--startup-timeout", type=float, default=180.0)
+    load.add_argument("--out", default=os.path.join(BASE_DIR, "data", "benchmarks", "load.json"))
+
+    args = parser.parse_args(argv)
+    if args.command == "fake-groq":
+        import uvicorn
+
+        uvicorn.run(fake_groq_app(args.latency, args.jitter, args.error_rate, args.error_status, args.seed),
+                    host="127.0.0.1", port=args.port, log_level="warning")
+        return 0
+    if args.rate <= 0 or args.duration <= 0:
+        parser.error("--rate and --duration must be positive")
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
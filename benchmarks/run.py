@@ -0,0 +1,229 @@
+"""
+Benchmark suite for the scoring pipeline.
+
+Times segment_sections, section_weighted_score, extract_keywords,
+semantic_match_score, get_weighted_score, extract_pdf_text and the full
+/analyse pipeline (with a stubbed AI service) for every keyword category and
+synthetic resumes of 1 to 20 pages, and writes the results as JSON.
+
+    python -m benchmarks.run run --out data/benchmarks/before.json
+    python -m benchmarks.run compare data/benchmarks/before.json data/benchmarks/after.json
+
+Cases that need the spaCy model are recorded as skipped when it is not installed.
+"""
+import os
+
+# scoring runs in-process so the numbers measure computation rather than IPC,
+# and a missing model is reported instead of downloaded
+os.environ.setdefault("CPU_WORKERS", "0")
+os.environ.setdefault("SPACY_AUTO_DOWNLOAD", "false")
+os.environ.setdefault("AI_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import datetime
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import make_pdf, synthetic_jd, synthetic_resume
+from src.backend.core.config import BASE_DIR, settings
+from src.backend.schemas.analysis import JobDescriptionData, PersonalInfo, ResumeData
+from src.backend.services.keyword_catalogue import keyword_catalogue
+from src.backend.services.keyword_matcher import compile_keywords
+from src.backend.services.nlp import get_nlp
+from src.backend.services.parser import extract_pdf_text
+from src.backend.services.scoring import (extract_keywords, get_keywords_list, get_weighted_score,
+                                          section_weighted_score, segment_sections, semantic_match_score)
+
+DEFAULT_PAGES = [1, 2, 5, 10, 20]
+
+
+class StubAIService:
+    """Stands in for the Groq-backed AIService: instant, deterministic extractions."""
+
+    def __init__(self, keywords):
+        self.matcher = compile_keywords(tuple(keywords))
+
+    def _skills(self, text: str) -> List[str]:
+        return sorted(self.matcher.find_all(text.lower()))
+
+    async def extract_resume_data(self, text: str) -> ResumeData:
+        return ResumeData(personal_info=PersonalInfo(name="Alex Candidate", email=None),
+                          skills=self._skills(text), summary="")
+
+    async def extract_job_description(self, text: str) -> JobDescriptionData:
+        skills = self._skills(text)
+        return JobDescriptionData(role_title="Engineer", required_skills=skills[::2],
+                                  nice_to_have_skills=skills[1::2], experience_level="Mid")
+
+    async def extract_all(self, resume_text: str, job_text: str):
+        return await asyncio.gather(self.extract_resume_data(resume_text), self.extract_job_description(job_text))
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Wall-clock statistics of `repeat` calls in milliseconds, after `warmup` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {
+        "min_ms": round(times[0], 4),
+        "median_ms": round(statistics.median(times), 4),
+        "mean_ms": round(statistics.fmean(times), 4),
+        "p95_ms": round(times[min(len(times) - 1, int(0.95 * len(times)))], 4),
+        "max_ms": round(times[-1], 4),
+    }
+
+
+def _spacy_error() -> Optional[str]:
+    try:
+        get_nlp()
+        return None
+    except (Exception, SystemExit) as e:
+        return f"spaCy model unavailable: {e}"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(categories: List[str], pages_list: List[int], repeat: int, pdf_repeat: int) -> Dict[str, Any]:
+    from src.backend import main as api
+    from src.backend.services.document_cache import document_cache
+
+    spacy_error = _spacy_error()
+    needs_spacy = {"extract_keywords", "semantic_match_score"}
+    if settings.SEMANTIC_ENGINE != "vectors":
+        needs_spacy |= {"get_weighted_score", "analyse_pipeline_cold", "analyse_pipeline_cached"}
+
+    loop = asyncio.new_event_loop() # one loop for the whole run, like a server process
+    results = []
+    for category in categories:
+        keywords = get_keywords_list(category)
+        job_text = synthetic_jd(keywords, category)
+        stub = StubAIService(keywords)
+        api.ai_service = stub # run_analysis looks the service up on the module
+        ai_jd = loop.run_until_complete(stub.extract_job_description(job_text))
+
+        for pages in pages_list:
+            resume_text = synthetic_resume(keywords, pages, category)
+            resume_pdf = make_pdf(resume_text)
+            sections = segment_sections(resume_text)
+            ai_resume = loop.run_until_complete(stub.extract_resume_data(resume_text))
+            chunks = (extract_keywords(resume_text), extract_keywords(job_text)) if spacy_error is None else None
+
+            def analyse(cold: bool):
+                if cold:
+                    document_cache.clear()
+                return loop.run_until_complete(api.run_analysis(None, None, resume_text, job_text, category))
+
+            cases = {
+                "segment_sections": (lambda: segment_sections(resume_text), repeat),
+                "section_weighted_score": (lambda: section_weighted_score(sections, job_text, keywords), repeat),
+                "extract_keywords": (lambda: extract_keywords(resume_text), repeat),
+                "semantic_match_score": (lambda: semantic_match_score(*chunks), repeat),
+                "get_weighted_score": (lambda: get_weighted_score(
+                    resume_text, job_text, category, ai_resume.skills, ai_jd.required_skills, ai_jd.nice_to_have_skills), repeat),
+                "extract_pdf_text": (lambda: extract_pdf_text(resume_pdf), pdf_repeat),
+                "analyse_pipeline_cold": (lambda: analyse(True), repeat),
+                "analyse_pipeline_cached": (lambda: analyse(False), repeat),
+            }
+            for name, case in cases.items():
+                row = {"name": name, "category": category, "pages": pages,
+                       "chars": len(resume_text), "pdf_bytes": len(resume_pdf)}
+                if name in needs_spacy and spacy_error is not None:
+                    row["skipped"] = spacy_error
+                else:
+                    fn, n = case
+                    row.update(repeat=n, **measure(fn, n))
+                results.append(row)
+                print(f"{category:<12} {pages:>3}p {name:<26} "
+                      + (f"{row['median_ms']:>10.3f} ms" if "median_ms" in row else "   skipped"), file=sys.stderr)
+
+    loop.close()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "semantic_engine": settings.SEMANTIC_ENGINE,
+            "spacy_model": settings.SPACY_MODEL if spacy_error is None else None,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(old_path: str, new_path: str, threshold: float) -> int:
+    """Print the median change per case; exit status 1 if any case slowed down by more than threshold."""
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r["name"], r["category"], r["pages"]): r for r in json.load(f)["results"] if "median_ms" in r}
+    with open(new_path, encoding="utf-8") as f:
+        new = [r for r in json.load(f)["results"] if "median_ms" in r]
+
+    regressions = 0
+    print(f"{'case':<52} {'old ms':>10} {'new ms':>10} {'change':>8}")
+    for row in new:
+        key = (row["name"], row["category"], row["pages"])
+        if key not in old:
+            continue
+        before, after = old[key]["median_ms"], row["median_ms"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{row['name'] + ' ' + row['category'] + ' ' + str(row['pages']) + 'p':<52} "
+              f"{before:>10.3f} {after:>10.3f} {change:>+8.1%}{flag}")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scoring pipeline benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--out", default=os.path.join(BASE_DIR, "data", "benchmarks", "results.json"))
+    run.add_argument("--categories", nargs="+", default=None, help="default: every keyword category")
+    run.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES)
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--pdf-repeat", type=int, default=2, help="PDF extraction is slow, so it gets fewer runs")
+
+    diff = sub.add_parser("compare", help="compare two result files")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=0.10, help="relative slow-down reported as a regression")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return compare(args.old, args.new, args.threshold)
+
+    keyword_catalogue.load_all()
+    categories = args.categories or keyword_catalogue.categories()
+    report = run_suite(categories, args.pages, max(args.repeat, 1), max(args.pdf_repeat, 1))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to '{args.out}'.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
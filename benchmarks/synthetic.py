@@ -0,0 +1,104 @@
+"""
+Deterministic synthetic documents for benchmarks: multi-page resumes and JDs
+built from the fixture texts and a category's keywords, and a minimal PDF
+writer so PDF extraction can be measured without binary fixtures.
+"""
+import glob
+import os
+import random
+import zlib
+from typing import List, Sequence
+
+from src.backend.core.config import BASE_DIR
+
+FIXTURE_DIR = os.path.join(BASE_DIR, "tests", "engineering")
+LINES_PER_PAGE = 45
+
+
+def _fixture_sentences() -> List[str]:
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            sentences.extend(line.strip() for line in f if len(line.split()) >= 5)
+    return sentences
+
+
+def _rng(kind: str, category: str, pages: int, seed: int) -> random.Random:
+    # crc32 rather than hash(): str hashes are salted per process
+    return random.Random(zlib.crc32(f"{kind}:{category}:{pages}:{seed}".encode()))
+
+
+def _bullet(rng: random.Random, sentences: Sequence[str], keywords: Sequence[str]) -> str:
+    words = rng.choice(sentences).split()
+    for _ in range(rng.randint(1, 3)):
+        words.insert(rng.randint(0, len(words)), rng.choice(keywords))
+    return "- " + " ".join(words)
+
+
+def synthetic_resume(keywords: Sequence[str], pages: int, category: str = "", seed: int = 0) -> str:
+    """A resume of roughly `pages` pages (LINES_PER_PAGE lines each) mentioning some of `keywords`."""
+    rng = _rng("resume", category, pages, seed)
+    sentences = _fixture_sentences()
+    keywords = list(keywords) or ["communication"]
+    lines = ["Alex Candidate", "alex@example.com | linkedin.com/in/alex", "", "Summary", _bullet(rng, sentences, keywords), ""]
+    target = pages * LINES_PER_PAGE
+    while len(lines) < target:
+        lines.append("Experience")
+        for job in range(rng.randint(2, 4)):
+            lines.append(f"Engineer {job + 1} | Company {rng.randint(1, 99)} | 20{rng.randint(10, 24)} - Present")
+            lines.extend(_bullet(rng, sentences, keywords) for _ in range(rng.randint(3, 6)))
+            lines.append("")
+        lines.append("Projects")
+        lines.extend(_bullet(rng, sentences, keywords) for _ in range(rng.randint(2, 5)))
+        lines.append("")
+        lines.append("Education")
+        lines.append(f"Bachelor of Engineering, University {rng.randint(1, 50)}")
+        lines.append("")
+        lines.append("Skills")
+        lines.append(", ".join(rng.sample(keywords, min(len(keywords), rng.randint(8, 16)))))
+        lines.append("")
+    return "\n".join(lines[:target])
+
+
+def synthetic_jd(keywords: Sequence[str], category: str = "", seed: int = 0) -> str:
+    """A one-page job description asking for some of `keywords`, with a few acronyms as extra keywords."""
+    rng = _rng("jd", category, 1, seed)
+    sentences = _fixture_sentences()
+    keywords = list(keywords) or ["communication"]
+    lines = ["Requirements"]
+    lines.extend(_bullet(rng, sentences, keywords) for _ in range(12))
+    lines.append("Experience with " + ", ".join(rng.sample(keywords, min(len(keywords), 10))) + " and CI/CD, REST APIs, AWS.")
+    return "\n".join(lines)
+
+
+def make_pdf(text: str, lines_per_page: int = LINES_PER_PAGE) -> bytes:
+    """Minimal single-font PDF with one page per `lines_per_page` lines of text."""
+    lines = text.splitlines()
+    pages = [lines[i:i + lines_per_page] for i in range(0, max(len(lines), 1), lines_per_page)]
+    objects: List[bytes] = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages_id = 2 * len(pages) + 2
+    page_ids = []
+    for page in pages:
+        ops = ["BT /F1 9 Tf 40 800 Td 11 TL"]
+        for line in page:
+            line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({line}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 1 0 R >> >> >>" % (pages_id, len(objects)))
+        page_ids.append(len(objects))
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % p for p in page_ids), len(page_ids)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, len(objects), xref)
+    return out
@@ -1,5 +1,70 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
 class Settings:
     PROJECT_NAME: str = "Resume Analyser"
     VERSION: str = "2.0.0"
 
+    # Keyword catalogue
+    KEYWORD_DATA_DIR: str = os.path.join(BASE_DIR, "src", "frontend", "static", "data")
+    KEYWORD_CHECK_INTERVAL: float = float(os.getenv("KEYWORD_CHECK_INTERVAL", "5")) # seconds between mtime checks
+    # compiled catalogue (python -m src.backend.services.catalogue_artifact build), mmapped when present; empty = JSON only
+    KEYWORD_ARTIFACT: str = os.getenv("KEYWORD_ARTIFACT", os.path.join(KEYWORD_DATA_DIR, "keywords.bin"))
+
+    # Semantic similarity: "spacy" (noun chunks from a full parse) or "vectors" (precomputed NumPy table)
+    SEMANTIC_ENGINE: str = os.getenv("SEMANTIC_ENGINE", "spacy")
+    SPACY_MODEL: str = os.getenv("SPACY_MODEL", "en_core_web_md")
+    SPACY_AUTO_DOWNLOAD: bool = os.getenv("SPACY_AUTO_DOWNLOAD", "true").lower() == "true" # download the model if missing
+    VECTOR_TABLE_DIR: str = os.getenv("VECTOR_TABLE_DIR", os.path.join(BASE_DIR, "data", "vectors"))
+    NLP_BATCH_SIZE: int = int(os.getenv("NLP_BATCH_SIZE", "32"))
+
+    # AI skill matching: exact/alias matches first, then word-vector cosine for the rest (above 1 = aliases only)
+    SKILL_ALIAS_FILE: str = os.getenv("SKILL_ALIAS_FILE", os.path.join(KEYWORD_DATA_DIR, "skill_aliases.json"))
+    SKILL_MATCH_THRESHOLD: float = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.8"))
+
+    # Parsed-document cache (text, sections, tokens, noun chunks, vector per uploaded document)
+    DOCUMENT_CACHE_ITEMS: int = int(os.getenv("DOCUMENT_CACHE_ITEMS", "2048"))
+    DOCUMENT_CACHE_BYTES: int = int(os.getenv("DOCUMENT_CACHE_BYTES", str(256 * 1024 * 1024)))
+
+    # Job posting index for reverse search (best postings for a resume)
+    JOB_INDEX_DIR: str = os.getenv("JOB_INDEX_DIR", os.path.join(BASE_DIR, "data", "job_index"))
+
+    # Stored results re-scored incrementally when a JD or keyword file changes
+    SCORE_STORE_PATH: str = os.getenv("SCORE_STORE_PATH", os.path.join(BASE_DIR, "data", "scores.sqlite3"))
+
+    # Batch analysis
+    BATCH_MAX_RESUMES: int = int(os.getenv("BATCH_MAX_RESUMES", "1000"))
+    BATCH_CHUNK_SIZE: int = int(os.getenv("BATCH_CHUNK_SIZE", "16")) # documents per stage job (each has the stage timeout)
+
+    # Uploads and PDF extraction (the AI service only reads the first 15000 characters)
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    BATCH_ZIP_MAX_BYTES: int = int(os.getenv("BATCH_ZIP_MAX_BYTES", str(200 * 1024 * 1024)))
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "20"))
+    PDF_MAX_CHARS: int = int(os.getenv("PDF_MAX_CHARS", "30000"))
+
+    # Executors: blocking I/O runs on threads, pdfminer/spaCy on worker processes
+    IO_THREADS: int = int(os.getenv("IO_THREADS", "16"))
+    CPU_WORKERS: int = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 2))) # 0 = run CPU stages on threads
+    CPU_CONCURRENCY: int = max(CPU_WORKERS, 1)
+    STAGE_MAX_QUEUE: int = int(os.getenv("STAGE_MAX_QUEUE", "32")) # waiting jobs per stage before 429
+    PDF_TIMEOUT: float = float(os.getenv("PDF_TIMEOUT", "30")) # seconds
+    SCORING_TIMEOUT: float = float(os.getenv("SCORING_TIMEOUT", "60"))
+
+    # Observability: X-Profile: 1 request header returns a Server-Timing stage breakdown
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
+
+    # Groq extraction (async client shared by all requests)
+    AI_MAX_CONCURRENCY: int = int(os.getenv("AI_MAX_CONCURRENCY", "16")) # in-flight Groq calls across all requests
+    AI_TIMEOUT: float = float(os.getenv("AI_TIMEOUT", "30")) # seconds per call attempt
+    AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "3"))
+    AI_RETRY_BASE_DELAY: float = float(os.getenv("AI_RETRY_BASE_DELAY", "0.5")) # seconds, doubled per attempt
+
+    # AI extraction cache (in-memory LRU in front of SQLite)
+    AI_CACHE_ENABLED: bool = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+    AI_CACHE_PATH: str = os.getenv("AI_CACHE_PATH", os.path.join(BASE_DIR, "data", "ai_cache.sqlite3")) # empty = memory only
+    AI_CACHE_MEMORY_ITEMS: int = int(os.getenv("AI_CACHE_MEMORY_ITEMS", "1024"))
+    AI_CACHE_DISK_ITEMS: int = int(os.getenv("AI_CACHE_DISK_ITEMS", "100000"))
+    AI_CACHE_TTL: float = float(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600))) # seconds
+
 settings = Settings()
@@ -0,0 +1,221 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.backend.core.config import settings
+from src.backend.core.metrics import call_with_spans, record
+
+logger = logging.getLogger(__name__)
+
+
+class StageOverloaded(Exception):
+    """Raised when a stage already has its maximum of running + queued jobs (mapped to 429)."""
+    def __init__(self, stage: str):
+        super().__init__(f"Stage '{stage}' is at capacity, try again shortly.")
+        self.stage = stage
+
+
+class StageTimeout(Exception):
+    """Raised when a stage job does not finish within its timeout (mapped to 504)."""
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' timed out after {timeout}s.")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class StageUnavailable(Exception):
+    """Raised when a stage's worker pool broke and the job failed again on a fresh pool (mapped to 503)."""
+    def __init__(self, stage: str):
+        super().__init__(f"Stage '{stage}' workers are unavailable, try again shortly.")
+        self.stage = stage
+
+
+def chunk_slices(count: int, size: int) -> List[slice]:
+    """Slices splitting count items into chunks of at most size items."""
+    size = max(size, 1)
+    return [slice(start, start + size) for start in range(0, count, size)]
+
+
+class Stage:
+    """
+    Runs blocking work for one pipeline stage on an executor, off the event loop.
+
+    At most `concurrency` jobs run at once and at most `max_queue` more may wait
+    for a slot; anything beyond that is rejected immediately with StageOverloaded
+    instead of queueing without bound. `timeout` covers queueing plus execution.
+    A timed out job still counts towards that limit until its worker finishes it.
+    """
+
+    def __init__(self, name: str, pool: str, concurrency: int, max_queue: int, timeout: float):
+        self.name = name
+        self.pool = pool
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.broken = 0 # jobs that hit a broken worker pool
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock() # in_flight is also released from pool threads
+
+    @staticmethod
+    async def _submit(pool: Executor, job: Callable, submitted: List[Future]) -> Any:
+        future = pool.submit(job)
+        submitted.append(future)
+        return await asyncio.wrap_future(future)
+
+    async def _run(self, fn: Callable, submitted: List[Future], *args, **kwargs) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        queued = time.perf_counter()
+        async with self._semaphore:
+            record(f"{self.name}_queue", time.perf_counter() - queued)
+            job = functools.partial(call_with_spans, fn, *args, **kwargs)
+            pool = get_pool(self.pool)
+            try:
+                result, spans = await self._submit(pool, job, submitted)
+            except BrokenProcessPool:
+                # a worker died (OOM kill, segfault); every later job on this pool would fail too
+                self.broken += 1
+                logger.warning("Stage '%s' worker pool broke, restarting it", self.name)
+                reset_pool(self.pool, pool)
+                try:
+                    result, spans = await self._submit(get_pool(self.pool), job, submitted)
+                except BrokenProcessPool:
+                    reset_pool(self.pool, get_pool(self.pool))
+                    raise StageUnavailable(self.name)
+        # spans recorded inside the job (possibly in another process) are observed here
+        for stage, seconds in spans:
+            record(stage, seconds)
+        return result
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        if self.in_flight >= self.concurrency + self.max_queue:
+            self.rejected += 1
+            raise StageOverloaded(self.name)
+        with self._lock:
+            self.in_flight += 1
+        submitted: List[Future] = []
+        try:
+            return await asyncio.wait_for(self._run(fn, submitted, *args, **kwargs), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise StageTimeout(self.name, self.timeout)
+        finally:
+            self._release_when_done(submitted[-1] if submitted else None)
+
+    def _release_when_done(self, future: Optional[Future]) -> None:
+        """
+        Free a job's in_flight slot. A timed out job that already started keeps running
+        in the pool to completion (only the caller stopped waiting), so its slot is
+        freed when the pool future finishes rather than when the caller gives up.
+        """
+        if future is None:
+            self._release()
+        else:
+            # runs at once if the future is done, otherwise on the thread that completes it
+            future.add_done_callback(self._release)
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    async def run_chunks(self, fn: Callable, jobs: List[Tuple]) -> List[Any]:
+        """
+        Run fn(*args) for every args tuple in jobs and concatenate the returned lists.
+
+        Each job is a separate stage job with its own timeout, so a large batch is
+        spread over the workers and its time limit grows with its size. At most
+        `concurrency` of this call's jobs are submitted at once, leaving the queue
+        for other requests.
+        """
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run_job(args: Tuple) -> Any:
+            async with slots:
+                return await self.run(fn, *args)
+
+        results = []
+        for result in await asyncio.gather(*(run_job(args) for args in jobs)):
+            results.extend(result)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "broken": self.broken,
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+        }
+
+
+def _init_worker() -> None:
+    """Load the keyword catalogue and models once per worker process instead of on its first job."""
+    from src.backend.services.scoring import warm_up
+    try:
+        warm_up()
+    except (Exception, SystemExit) as e: # spacy's download exits on failure
+        # an initializer error would break the whole pool; the job that needs the model reports it instead
+        logger.warning("Worker warm-up failed: %s", e)
+
+
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(kind: str) -> Executor:
+    """Shared "thread" (blocking I/O) or "process" (CPU-bound) executor, created on first use."""
+    with _pools_lock:
+        if kind not in _pools:
+            if kind == "process" and settings.CPU_WORKERS > 0:
+                _pools[kind] = ProcessPoolExecutor(max_workers=settings.CPU_WORKERS, initializer=_init_worker)
+            elif kind == "process":
+                # CPU_WORKERS=0 keeps CPU work in-process (threads), e.g. for debugging
+                _pools[kind] = ThreadPoolExecutor(max_workers=settings.CPU_CONCURRENCY, thread_name_prefix="cpu")
+            else:
+                _pools[kind] = ThreadPoolExecutor(max_workers=settings.IO_THREADS, thread_name_prefix="io")
+        return _pools[kind]
+
+
+def reset_pool(kind: str, broken: Executor) -> None:
+    """Drop a broken pool so the next get_pool creates a fresh one (no-op if it was already replaced)."""
+    with _pools_lock:
+        if _pools.get(kind) is broken:
+            del _pools[kind]
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _forget_pools() -> None:
+    """
+    After a fork the child has none of the parent's pool threads or processes,
+    and a pool it inherited would queue jobs that never run. Start from scratch.
+    """
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    _pools.clear()
+
+
+os.register_at_fork(after_in_child=_forget_pools)
+
+
+def shutdown_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+# Pipeline stages
+pdf_stage = Stage("pdf", "process", settings.CPU_CONCURRENCY, settings.STAGE_MAX_QUEUE, settings.PDF_TIMEOUT)
+scoring_stage = Stage("scoring", "process", settings.CPU_CONCURRENCY, settings.STAGE_MAX_QUEUE, settings.SCORING_TIMEOUT)
+
+stages = {stage.name: stage for stage in (pdf_stage, scoring_stage)}
@@ -0,0 +1,144 @@
+"""
+Per-stage latency histograms and request profiling, without a metrics dependency.
+
+Code under measurement wraps itself in `span("stage")`. In the API process a
+span is observed into STAGE_SECONDS (and added to the request's profile when
+the client asked for one). Inside executor jobs, spans are collected by
+`call_with_spans` and returned with the result, so the API process records
+them whether the job ran in a worker process or a thread.
+"""
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Span = Tuple[str, float] # (stage, seconds)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], List[float]] = {} # labels -> bucket counts + [sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for labels, values in series:
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative:g}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-2]!r}")
+            lines.append(f"{self.name}_count{{{label_text}}} {values[-1]:g}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGE_SECONDS = Histogram("resume_analyser_stage_seconds", "Time spent in each pipeline stage.", ["stage"])
+REQUEST_SECONDS = Histogram("resume_analyser_request_seconds", "HTTP request latency.", ["method", "path", "status"])
+REGISTRY = [STAGE_SECONDS, REQUEST_SECONDS]
+
+
+def render_metrics() -> str:
+    return "\n".join(line for histogram in REGISTRY for line in histogram.render()) + "\n"
+
+
+# spans collected inside an executor job, shipped back to the API process
+_job_spans: ContextVar[Optional[List[Span]]] = ContextVar("job_spans", default=None)
+# stage breakdown of the current request, when profiling was requested
+_request_profile: ContextVar[Optional[List[Span]]] = ContextVar("request_profile", default=None)
+
+
+def record(stage: str, seconds: float) -> None:
+    spans = _job_spans.get()
+    if spans is not None:
+        spans.append((stage, seconds))
+        return
+    STAGE_SECONDS.observe(seconds, stage)
+    profile = _request_profile.get()
+    if profile is not None:
+        profile.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as one observation of `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """Decorator form of span() for functions that are a whole stage."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def call_with_spans(fn: Callable, *args, **kwargs) -> Tuple[object, List[Span]]:
+    """Run fn and return (result, spans recorded while it ran); used for executor jobs."""
+    spans: List[Span] = []
+    token = _job_spans.set(spans)
+    try:
+        return fn(*args, **kwargs), spans
+    finally:
+        _job_spans.reset(token)
+
+
+@contextmanager
+def profile_request() -> Iterator[List[Span]]:
+    """Collect the stage breakdown of everything recorded in this context (including child tasks)."""
+    profile: List[Span] = []
+    token = _request_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _request_profile.reset(token)
+
+
+def server_timing(profile: List[Span]) -> str:
+    """Server-Timing header value: total milliseconds per stage, in order of first appearance."""
+    totals: Dict[str, List[float]] = {}
+    for stage, seconds in profile:
+        total = totals.setdefault(stage, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+    return ", ".join(
+        f'{stage};dur={seconds * 1000:.2f}' + (f';desc="{count} calls"' if count > 1 else "")
+        for stage, (seconds, count) in totals.items()
+    )
@@ -1,17 +1,31 @@
-from fastapi import FastAPI, UploadFile, File, Request, Body, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, UploadFile, File, Request, Form, HTTPException, Query
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-import tempfile
+from contextlib import nullcontext
+from typing import List, Optional
+import asyncio
+import logging
+import time
+import zipfile
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Import services from new location
-from src.backend.services.parser import extract_pdf_text
-from src.backend.services.scoring import get_weighted_score
+from src.backend.services.parser import extract_upload_pdf, document_text, document_texts, zip_members, pdf_stats
+from src.backend.services.scoring import build_document_profile, build_document_profiles, score_batch, score_categories, score_documents, warm_up
+from src.backend.services.document_cache import DocumentProfile, document_cache
 from src.backend.services.ai_service import ai_service
+from src.backend.services.keyword_catalogue import keyword_catalogue
+from src.backend.services.job_index import get_job_index
+from src.backend.schemas.analysis import AnalysisResult, BatchAnalysisResponse, CategoryAnalysisResponse, JobMatch, JobSearchResponse, ResumeScore
+from src.backend.core.config import settings
+from src.backend.core.metrics import REQUEST_SECONDS, profile_request, render_metrics, server_timing, span
+from src.backend.core.executor import StageOverloaded, StageTimeout, StageUnavailable, chunk_slices, get_pool, pdf_stage, scoring_stage, stages, shutdown_pools
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Resume Analyser")
 
@@ -33,49 +47,182 @@ STATIC_DIR = os.path.join(BASE_DIR, "src", "frontend", "static")
 templates = Jinja2Templates(directory=TEMPLATE_DIR)
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
+# jobdesc_category value that scores every category and picks the best one
+AUTO_CATEGORY = "auto"
+
+# Model readiness, reported by /ready
+model_status = {"ready": False, "engine": None, "error": None, "seconds": None}
+
+async def warm_up_models():
+    """Load spaCy (or the vector table) in the scoring workers without blocking startup."""
+    start = time.perf_counter()
+    try:
+        model_status["engine"] = await asyncio.get_running_loop().run_in_executor(get_pool("process"), warm_up)
+        model_status["ready"] = True
+    except (Exception, SystemExit) as e:
+        model_status["error"] = str(e)
+        logger.error("Model warm-up failed: %s", e)
+    model_status["seconds"] = round(time.perf_counter() - start, 3)
+
+@app.on_event("startup")
+async def load_models():
+    keyword_catalogue.load_all()
+    # keep a reference so the task is not garbage collected
+    app.state.warm_up = asyncio.create_task(warm_up_models())
+
+@app.on_event("shutdown")
+async def stop_executors():
+    shutdown_pools()
+    await ai_service.aclose()
+
+@app.exception_handler(StageOverloaded)
+async def stage_overloaded_handler(request: Request, exc: StageOverloaded):
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+@app.exception_handler(StageTimeout)
+async def stage_timeout_handler(request: Request, exc: StageTimeout):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+@app.exception_handler(StageUnavailable)
+async def stage_unavailable_handler(request: Request, exc: StageUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """Request latency histogram, plus a Server-Timing stage breakdown when the client sends X-Profile: 1."""
+    start = time.perf_counter()
+    profiling = settings.PROFILING_ENABLED and request.headers.get("x-profile") == "1"
+    with (profile_request() if profiling else nullcontext()) as profile:
+        response = await call_next(request)
+    elapsed = time.perf_counter() - start
+    # label by route template, not raw path, to keep the number of series bounded
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(elapsed, request.method, getattr(route, "path", "unmatched"), str(response.status_code))
+    if profile is not None:
+        response.headers["Server-Timing"] = server_timing(profile + [("total", elapsed)])
+    return response
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of the stage and request latency histograms."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/ready")
+async def ready():
+    """200 once the models are loaded, 503 while they are still loading (or failed to load)."""
+    return JSONResponse(status_code=200 if model_status["ready"] else 503, content=model_status)
+
+@app.get("/stats/keywords")
+async def keyword_stats():
+    return keyword_catalogue.stats()
+
+@app.get("/stats/ai-cache")
+async def ai_cache_stats():
+    return ai_service.cache.stats() if ai_service.cache else {"enabled": False}
+
+@app.get("/stats/pdf")
+async def pdf_extraction_stats():
+    return pdf_stats.stats()
+
+@app.get("/stats/documents")
+async def document_cache_stats():
+    return document_cache.stats()
+
+@app.get("/stats/jobs")
+async def job_index_stats():
+    return await in_thread(lambda: get_job_index().stats())
+
+@app.get("/stats/executors")
+async def executor_stats():
+    return {name: stage.stats() for name, stage in stages.items()}
+
+async def in_thread(fn, *args):
+    """Run blocking work (index files, small NumPy jobs) on the I/O thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(get_pool("thread"), fn, *args)
+
+async def read_upload(upload: UploadFile, max_bytes: int) -> bytes:
+    """Read an uploaded file into memory, rejecting it with 413 once it exceeds max_bytes."""
+    if upload.size is not None and upload.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Uploaded file is larger than {max_bytes} bytes.")
+    content = await upload.read(max_bytes + 1)
+    if len(content) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Uploaded file is larger than {max_bytes} bytes.")
+    return content
+
+async def extract_upload(content: bytes) -> str:
+    """Extract an uploaded PDF from memory on the pdf stage and record its per-page stats."""
+    extraction = await pdf_stage.run(extract_upload_pdf, content)
+    pdf_stats.record(extraction)
+    return extraction.text
+
+def _document_key(kind: str, content: bytes) -> str:
+    return document_cache.key(kind, content, settings.SEMANTIC_ENGINE)
+
+async def analyse_text(text: str) -> DocumentProfile:
+    """Segmented, tokenized and parsed document for text, from the document cache when possible."""
+    key = _document_key("text", text.encode("utf-8"))
+    document = document_cache.get(key)
+    if document is None:
+        document = await scoring_stage.run(build_document_profile, text)
+        document_cache.put(key, document)
+    return document
+
+async def analyse_texts(texts: List[str]) -> List[DocumentProfile]:
+    """analyse_text for many texts; the uncached ones are parsed in nlp.pipe chunks spread over the workers."""
+    keys = [_document_key("text", text.encode("utf-8")) for text in texts]
+    documents = [document_cache.get(key) for key in keys]
+    missing = [i for i, document in enumerate(documents) if document is None]
+    if missing:
+        built = await scoring_stage.run_chunks(build_document_profiles, [
+            ([texts[i] for i in missing[chunk]],) for chunk in chunk_slices(len(missing), settings.BATCH_CHUNK_SIZE)])
+        for i, document in zip(missing, built):
+            documents[i] = document
+            document_cache.put(keys[i], document)
+    return documents
+
+async def analyse_pdf(content: bytes) -> DocumentProfile:
+    """Like analyse_text, but keyed by the PDF bytes so a re-upload also skips extraction."""
+    key = _document_key("pdf", content)
+    document = document_cache.get(key)
+    if document is None:
+        document = await analyse_text(await extract_upload(content))
+        document_cache.put(key, document)
+    return document
+
+async def analyse_input(upload: Optional[UploadFile], text: Optional[str]) -> DocumentProfile:
+    """Document for a form input: the PDF upload if there is one, otherwise the textarea."""
+    if upload and upload.filename:
+        content = await read_upload(upload, settings.UPLOAD_MAX_BYTES)
+        if len(content) > 0:
+            return await analyse_pdf(content)
+        return await analyse_text("")
+    return await analyse_text(text or "")
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates.TemplateResponse(request, "index.html")
 
-@app.post("/analyse", response_class=HTMLResponse)
-async def analyse(
-    request: Request,
-    resume_pdf: UploadFile = File(None),
-    jobdesc_pdf: UploadFile = File(None),
-    resume_textarea: str = Form(None),
-    jobdesc_textarea: str = Form(None),
-    jobdesc_category: str = Form("fallback")
-):
-    # Handle Resume Input
-    resume_text = ""
-    if resume_pdf and resume_pdf.filename:
-        res_file_content = await resume_pdf.read()
-        if len(res_file_content) > 0:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_resume:
-                tmp_resume.write(res_file_content)
-                tmp_resume.flush()
-                resume_text = extract_pdf_text(tmp_resume.name)
-    elif resume_textarea:
-        resume_text = resume_textarea
-
-    # Handle Job Description Input
-    job_text = ""
-    if jobdesc_pdf and jobdesc_pdf.filename:
-        job_file_content = await jobdesc_pdf.read()
-        if len(job_file_content) > 0:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_job:
-                tmp_job.write(job_file_content)
-                tmp_job.flush()
-                job_text = extract_pdf_text(tmp_job.name)
-    elif jobdesc_textarea:
-        job_text = jobdesc_textarea
+async def run_analysis(resume_pdf: Optional[UploadFile], jobdesc_pdf: Optional[UploadFile],
+                       resume_textarea: Optional[str], jobdesc_textarea: Optional[str], jobdesc_category: str,
+                       categories: Optional[List[str]] = None):
+    """
+    Shared body of /analyse and the JSON endpoints. Returns (resume text, job text, AI resume data,
+    AI JD data, {category: scoring result}, category), or None if both inputs are empty.
+    With jobdesc_category "auto", every category in `categories` (default: all) is scored
+    and the returned category is the best fit.
+    """
+    # Handle Resume and Job Description Inputs
+    # (extraction, segmentation and parsing are skipped for documents seen before)
+    resume_document, job_document = await asyncio.gather(
+        analyse_input(resume_pdf, resume_textarea),
+        analyse_input(jobdesc_pdf, jobdesc_textarea)
+    )
+    resume_text = resume_document.text
+    job_text = job_document.text
 
     # if all fields are empty
     if not resume_text and not job_text and not resume_pdf and not jobdesc_pdf:
-        return templates.TemplateResponse("index.html", {
-            "request": request,
-            "error": "Please provide both Resume and Job Description."
-        })
+        return None
 
     # AI Extraction
     # We use the raw text for the legacy scorer for now to ensure continuity, 
@@ -86,11 +233,9 @@ async def analyse(
     # For matching, the legacy scorer works on raw text and keywords.
     # To fully utilize AI, ideally use the AI extracted skills for matching.
     
-    # 1. Extract Structured Data
-    print("Extracting Resume Data with AI...")
-    resume_data = ai_service.extract_resume_data(resume_text)
-    print("Extracting JD Data with AI...")
-    jd_data = ai_service.extract_job_description(job_text)
+    # 1. Extract Structured Data (resume and JD concurrently)
+    logger.info("Extracting Resume and JD Data with AI...")
+    resume_data, jd_data = await ai_service.extract_all(resume_text, job_text)
     
     # 2. Hybrid Scoring
     # If AI extraction succeeds, inject extracted skills into the scoring algorithm 
@@ -99,32 +244,268 @@ async def analyse(
     jd_required = jd_data.required_skills if jd_data else []
     jd_nice = jd_data.nice_to_have_skills if jd_data else []
     
-    (score, keyword_score, resume_sections, section_scores, density, matched_keywords, missing_keywords, semantic_score) = get_weighted_score(
-        resume_text, 
-        job_text, 
+    if jobdesc_category == AUTO_CATEGORY:
+        # every category in one job: one JD scan, one resume scan, one parse of each document
+        best, results = await scoring_stage.run(
+            score_categories,
+            resume_document,
+            job_document,
+            categories,
+            ai_resume_skills=resume_skills,
+            ai_jd_required=jd_required,
+            ai_jd_nice=jd_nice
+        )
+        return resume_text, job_text, resume_data, jd_data, results, best
+
+    result = await scoring_stage.run(
+        score_documents,
+        resume_document,
+        job_document,
         jobdesc_category,
         ai_resume_skills=resume_skills,
         ai_jd_required=jd_required,
         ai_jd_nice=jd_nice
     )
+    return resume_text, job_text, resume_data, jd_data, {jobdesc_category: result}, jobdesc_category
+
+@app.post("/analyse", response_class=HTMLResponse)
+async def analyse(
+    request: Request,
+    resume_pdf: UploadFile = File(None),
+    jobdesc_pdf: UploadFile = File(None),
+    resume_textarea: str = Form(None),
+    jobdesc_textarea: str = Form(None),
+    jobdesc_category: str = Form("fallback")
+):
+    analysis = await run_analysis(resume_pdf, jobdesc_pdf, resume_textarea, jobdesc_textarea, jobdesc_category)
+    if analysis is None:
+        return templates.TemplateResponse(request, "index.html", {
+            "error": "Please provide both Resume and Job Description."
+        })
+
+    resume_text, job_text, resume_data, jd_data, results, jobdesc_category = analysis
+    result = results[jobdesc_category]
+    (score, keyword_score, resume_sections, section_scores, density, matched_keywords, missing_keywords, semantic_score) = result
 
     # JSON response
     resume_json = resume_data.model_dump() if resume_data else {}
-    print("resume json from ai:", resume_json)
+    logger.debug("resume json from ai: %s", resume_json)
     jd_json = jd_data.model_dump() if jd_data else {}
     
-    return templates.TemplateResponse("results.html", {
-        "request": request,
-        "job_category": jobdesc_category,
-        "score": score,
-        "keyword_score": keyword_score,
-        "resume_sections": resume_sections,
-        "job_text": job_text,
-        "section_scores": section_scores,
-        "density": density,
-        "matched_keywords": matched_keywords,
-        "missing_keywords": missing_keywords,
-        "semantic_score": semantic_score,
-        "ai_resume_data": resume_json,
-        "ai_jd_data": jd_json
-    })
+    with span("template_render"):
+        return templates.TemplateResponse(request, "results.html", {
+            "job_category": jobdesc_category,
+            "score": score,
+            "keyword_score": keyword_score,
+            "resume_sections": resume_sections,
+            "job_text": job_text,
+            "section_scores": section_scores,
+            "density": density,
+            "matched_keywords": matched_keywords,
+            "missing_keywords": missing_keywords,
+            "semantic_score": semantic_score,
+            "ai_resume_data": resume_json,
+            "ai_jd_data": jd_json
+        })
+
+@app.post("/api/v1/analyse", response_model=AnalysisResult)
+async def api_analyse(
+    resume_pdf: UploadFile = File(None),
+    jobdesc_pdf: UploadFile = File(None),
+    resume_textarea: str = Form(None),
+    jobdesc_textarea: str = Form(None),
+    jobdesc_category: str = Form("fallback"),
+    fields: str = Query(None, description="Comma-separated AnalysisResult fields to return, e.g. 'score'")
+):
+    """Same analysis as /analyse, returned as compact JSON instead of a rendered page."""
+    include = None
+    if fields:
+        include = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = include - set(AnalysisResult.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    analysis = await run_analysis(resume_pdf, jobdesc_pdf, resume_textarea, jobdesc_textarea, jobdesc_category)
+    if analysis is None:
+        raise HTTPException(status_code=400, detail="Please provide both Resume and Job Description.")
+
+    _, _, _, _, results, category = analysis
+    result = analysis_result(category, results[category])
+    # serialized by pydantic-core directly, skipping FastAPI's jsonable_encoder pass
+    with span("json_render"):
+        content = result.model_dump_json(include=include)
+    return Response(content=content, media_type="application/json")
+
+@app.post("/api/v1/analyse/categories", response_model=CategoryAnalysisResponse)
+async def api_analyse_categories(
+    resume_pdf: UploadFile = File(None),
+    jobdesc_pdf: UploadFile = File(None),
+    resume_textarea: str = Form(None),
+    jobdesc_textarea: str = Form(None),
+    categories: str = Form(None, description="Comma-separated keyword categories, default all")
+):
+    """Analyse one resume/JD pair against several keyword categories at once and pick the best fit."""
+    selected = list(keyword_catalogue.categories())
+    if categories:
+        selected = list(dict.fromkeys(c.strip() for c in categories.split(",") if c.strip()))
+        unknown = set(selected) - set(keyword_catalogue.categories())
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown categories: {', '.join(sorted(unknown))}")
+
+    analysis = await run_analysis(resume_pdf, jobdesc_pdf, resume_textarea, jobdesc_textarea, AUTO_CATEGORY, selected)
+    if analysis is None:
+        raise HTTPException(status_code=400, detail="Please provide both Resume and Job Description.")
+
+    _, _, _, _, results, best = analysis
+    response = CategoryAnalysisResponse(
+        best_category=best,
+        results={category: analysis_result(category, result) for category, result in results.items()}
+    )
+    with span("json_render"):
+        content = response.model_dump_json()
+    return Response(content=content, media_type="application/json")
+
+def analysis_result(category: str, result) -> AnalysisResult:
+    """AnalysisResult from a score_profile tuple."""
+    score, keyword_score, _, section_scores, density, matched_keywords, missing_keywords, semantic_score = result
+    return AnalysisResult(
+        job_category=category,
+        score=score,
+        keyword_score=keyword_score,
+        semantic_score=semantic_score,
+        density=density,
+        section_scores=section_scores,
+        matched_keywords=matched_keywords,
+        missing_keywords=missing_keywords
+    )
+
+@app.post("/analyse/batch", response_model=BatchAnalysisResponse)
+async def analyse_batch(
+    resume_files: List[UploadFile] = File(None),
+    resumes_zip: UploadFile = File(None),
+    jobdesc_pdf: UploadFile = File(None),
+    jobdesc_textarea: str = Form(None),
+    jobdesc_category: str = Form("fallback"),
+    ai_resume_extraction: bool = Form(False),
+    top_k: int = Form(None)
+):
+    """Score many resumes against one job description and return them ranked by score."""
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1.")
+
+    # Handle Job Description Input
+    job_text = ""
+    if jobdesc_pdf and jobdesc_pdf.filename:
+        job_text = await pdf_stage.run(document_text, jobdesc_pdf.filename, await read_upload(jobdesc_pdf, settings.UPLOAD_MAX_BYTES))
+    elif jobdesc_textarea:
+        job_text = jobdesc_textarea
+    if not job_text:
+        raise HTTPException(status_code=400, detail="Please provide a Job Description.")
+
+    # Handle Resume Inputs (multi-file upload and/or a zip archive)
+    files = []
+    for upload in resume_files or []:
+        if upload.filename:
+            files.append((upload.filename, await read_upload(upload, settings.UPLOAD_MAX_BYTES)))
+    if resumes_zip and resumes_zip.filename:
+        try:
+            files.extend(await in_thread(zip_members, await read_upload(resumes_zip, settings.BATCH_ZIP_MAX_BYTES)))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Resume archive is not a valid zip file.")
+    if len(files) > settings.BATCH_MAX_RESUMES:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BATCH_MAX_RESUMES} resumes per batch.")
+    # extracted in chunks, each its own pdf stage job (and timeout) spread over the workers
+    texts = await pdf_stage.run_chunks(
+        document_texts, [(files[chunk],) for chunk in chunk_slices(len(files), settings.BATCH_CHUNK_SIZE)])
+    documents = [(name, text) for (name, _), text in zip(files, texts) if text.strip()]
+    if not documents:
+        raise HTTPException(status_code=400, detail="Please provide at least one Resume.")
+
+    # AI extraction is opt-in for batches: the JD is extracted once, resumes concurrently
+    # (bounded by the AI service's global concurrency limit)
+    resume_skills = None
+    jd_required, jd_nice = [], []
+    if ai_resume_extraction:
+        jd_data, *resume_datas = await asyncio.gather(
+            ai_service.extract_job_description(job_text),
+            *(ai_service.extract_resume_data(text) for _, text in documents)
+        )
+        jd_required = jd_data.required_skills if jd_data else []
+        jd_nice = jd_data.nice_to_have_skills if jd_data else []
+        resume_skills = [resume_data.skills if resume_data else [] for resume_data in resume_datas]
+
+    # JD keywords, extra keywords and JD parse are shared by every resume
+    job_document, resume_documents = await asyncio.gather(
+        analyse_text(job_text), analyse_texts([text for _, text in documents]))
+    scores = await scoring_stage.run_chunks(score_batch, [
+        (resume_documents[chunk], job_document, jobdesc_category,
+         resume_skills[chunk] if resume_skills is not None else None, jd_required, jd_nice)
+        for chunk in chunk_slices(len(resume_documents), settings.BATCH_CHUNK_SIZE)
+    ])
+
+    ranked = sorted(zip(documents, scores), key=lambda item: item[1][0], reverse=True)
+    if top_k is not None:
+        ranked = ranked[:top_k]
+
+    results = []
+    for rank, ((filename, _), result) in enumerate(ranked, start=1):
+        score, keyword_score, _, section_scores, density, matched_keywords, missing_keywords, semantic_score = result
+        results.append(ResumeScore(
+            rank=rank,
+            filename=filename,
+            score=score,
+            keyword_score=keyword_score,
+            semantic_score=semantic_score,
+            density=density,
+            section_scores=section_scores,
+            matched_keywords=matched_keywords,
+            missing_keywords=missing_keywords
+        ))
+
+    return BatchAnalysisResponse(job_category=jobdesc_category, count=len(results), results=results)
+
+@app.post("/api/v1/jobs")
+async def add_job(
+    job_id: str = Form(...),
+    title: str = Form(""),
+    jobdesc_pdf: UploadFile = File(None),
+    jobdesc_textarea: str = Form(None),
+    jobdesc_category: str = Form("fallback")
+):
+    """Add a job posting to the reverse-search index, replacing any posting with the same id."""
+    if jobdesc_category not in keyword_catalogue.categories():
+        raise HTTPException(status_code=400, detail=f"Unknown category: {jobdesc_category}")
+    job_document = await analyse_input(jobdesc_pdf, jobdesc_textarea)
+    if not job_document.text.strip():
+        raise HTTPException(status_code=400, detail="Please provide a Job Description.")
+    index = get_job_index()
+    try:
+        await in_thread(index.add, job_id, jobdesc_category, title, job_document)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"id": job_id, "postings": len(index.postings)}
+
+@app.delete("/api/v1/jobs/{job_id}")
+async def remove_job(job_id: str):
+    index = get_job_index()
+    if not await in_thread(index.remove, job_id):
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return {"id": job_id, "postings": len(index.postings)}
+
+@app.post("/api/v1/jobs/search", response_model=JobSearchResponse)
+async def search_jobs(
+    resume_pdf: UploadFile = File(None),
+    resume_textarea: str = Form(None),
+    jobdesc_category: str = Form(None),
+    top_k: int = Form(10)
+):
+    """The indexed job postings that best fit a resume, best first."""
+    resume_document = await analyse_input(resume_pdf, resume_textarea)
+    if not resume_document.text.strip():
+        raise HTTPException(status_code=400, detail="Please provide a Resume.")
+    index = get_job_index()
+    try:
+        matches = await in_thread(index.search, resume_document, max(top_k, 1), jobdesc_category or None)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JobSearchResponse(count=len(index.postings), results=[JobMatch(**match) for match in matches])
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class PersonalInfo(BaseModel):
     name: str = Field(description="Full name of the candidate")
@@ -42,3 +42,46 @@ class JobDescriptionData(BaseModel):
     nice_to_have_skills: List[str] = Field(default_factory=list, description="Optional or preferred skills")
     experience_level: str = Field(description="Required experience level (e.g., Senior, Junior, 3+ years)")
     key_responsibilities: List[str] = Field(default_factory=list, description="Main responsibilities of the role")
+
+class ResumeScore(BaseModel):
+    rank: int = Field(description="1-based position in the ranking, highest score first")
+    filename: str = Field(description="Uploaded file name (or path inside the zip)")
+    score: float = Field(description="Final match score out of 100")
+    keyword_score: float
+    semantic_score: float
+    density: float = Field(description="Percentage of JD keywords found in the resume")
+    section_scores: List[float] = Field(description="Scores for others, education, experience, skills")
+    matched_keywords: Dict[str, int] = Field(default_factory=dict)
+    missing_keywords: Dict[str, List[str]] = Field(default_factory=dict, description="Keyword -> [context before, context after]")
+
+class BatchAnalysisResponse(BaseModel):
+    job_category: str
+    count: int = Field(description="Number of results returned (at most top_k)")
+    results: List[ResumeScore] = Field(default_factory=list)
+
+class AnalysisResult(BaseModel):
+    job_category: str
+    score: float = Field(description="Final match score out of 100")
+    keyword_score: float
+    semantic_score: float
+    density: float = Field(description="Percentage of JD keywords found in the resume")
+    section_scores: List[float] = Field(description="Scores for others, education, experience, skills")
+    matched_keywords: Dict[str, int] = Field(default_factory=dict)
+    missing_keywords: Dict[str, List[str]] = Field(default_factory=dict, description="Keyword -> [context before, context after]")
+
+class CategoryAnalysisResponse(BaseModel):
+    best_category: Optional[str] = Field(description="Category whose keywords the job description mentions most")
+    results: Dict[str, AnalysisResult] = Field(default_factory=dict, description="Category -> analysis against its keywords")
+
+class JobMatch(BaseModel):
+    id: str
+    title: str
+    category: str
+    score: float = Field(description="Final match score out of 100, as /api/v1/analyse would compute without AI data")
+    keyword_score: float
+    semantic_score: float
+    matched_keywords: List[str] = Field(default_factory=list)
+
+class JobSearchResponse(BaseModel):
+    count: int = Field(description="Postings searched")
+    results: List[JobMatch] = Field(default_factory=list)
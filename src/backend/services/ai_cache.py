@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-flowed copies of the same document share a key."""
+    return " ".join(text.split())
+
+
+def cache_key(kind: str, text: str, model: str, prompt_version: str) -> str:
+    """Content address of an extraction: what was asked, of which model, about which text."""
+    digest = hashlib.sha256()
+    for part in (kind, model, prompt_version, normalize_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier cache for validated AI extraction JSON.
+
+    An in-memory LRU sits in front of a SQLite table. Both tiers are bounded
+    (LRU by item count in memory, oldest-accessed rows on disk) and entries
+    expire after `ttl` seconds. The memory tier is cheap enough to use from the
+    event loop; the disk tier (`get_disk`, `set_disk`) blocks and is opened on
+    first use, so async callers run it on a thread.
+    """
+
+    def __init__(self, path: Optional[str], memory_items: int = 1024, disk_items: int = 100000, ttl: float = 7 * 24 * 3600):
+        self.path = path or None
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict() # key -> (expires_at, payload)
+        self._lock = threading.Lock() # memory tier
+        self._db_lock = threading.Lock() # disk tier, held across SQLite calls
+        self._db: Optional[sqlite3.Connection] = None
+        self._inherited: List[sqlite3.Connection] = [] # connections of a parent process, never used
+        self._writes_since_evict = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def persistent(self) -> bool:
+        """Whether there is a disk tier (it may not be open yet)."""
+        return self.path is not None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """The SQLite connection, opened on first use (call with _db_lock held)."""
+        if self._db is None and self.path is not None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS extractions ("
+                    "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS extractions_accessed ON extractions (accessed_at)")
+            except sqlite3.Error as e:
+                logger.error("Error opening AI cache database, using memory only: %s", e)
+                self._db = None
+                self.path = None
+        return self._db
+
+    def after_fork(self) -> None:
+        """
+        Call in a forked child: the parent's SQLite connection must not be used
+        there, and a lock may have been held by a parent thread at fork time.
+        The inherited connection is kept referenced, not closed, so closing it
+        cannot disturb the parent's; a new one is opened on the next disk access.
+        """
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        if self._db is not None:
+            self._inherited.append(self._db)
+            self._db = None
+
+    def _remember(self, key: str, expires_at: float, payload: str) -> None:
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get_memory(self, key: str) -> Optional[str]:
+        """Memory tier lookup; never blocks on disk."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+        return None
+
+    def get_disk(self, key: str) -> Optional[str]:
+        """Disk tier lookup (blocking); a hit is promoted into memory. Counts the miss otherwise."""
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            if db is not None:
+                try:
+                    row = db.execute("SELECT payload, expires_at FROM extractions WHERE key = ?", (key,)).fetchone()
+                    if row is not None and row[1] > now:
+                        db.execute("UPDATE extractions SET accessed_at = ? WHERE key = ?", (now, key))
+                        with self._lock:
+                            self._remember(key, row[1], row[0])
+                            self.disk_hits += 1
+                        return row[0]
+                    if row is not None:
+                        db.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                except sqlite3.Error as e:
+                    logger.error("Error reading AI cache: %s", e)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get(self, key: str) -> Optional[str]:
+        payload = self.get_memory(key)
+        return payload if payload is not None else self.get_disk(key)
+
+    def set_memory(self, key: str, payload: str) -> float:
+        """Store in the memory tier and return the entry's expiry time."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, payload)
+        return expires_at
+
+    def set_disk(self, key: str, payload: str, expires_at: float) -> None:
+        """Store in the disk tier (blocking), trimming it every so often."""
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO extractions (key, payload, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, payload, expires_at, now),
+                )
+                self._writes_since_evict += 1
+                # trimming needs a COUNT, so only do it every so often
+                if self._writes_since_evict >= max(1, self.disk_items // 100):
+                    self._writes_since_evict = 0
+                    self._evict_disk(now)
+            except sqlite3.Error as e:
+                logger.error("Error writing AI cache: %s", e)
+
+    def set(self, key: str, payload: str) -> None:
+        self.set_disk(key, payload, self.set_memory(key, payload))
+
+    def _evict_disk(self, now: float) -> None:
+        deleted = self._db.execute("DELETE FROM extractions WHERE expires_at <= ?", (now,)).rowcount
+        (count,) = self._db.execute("SELECT COUNT(*) FROM extractions").fetchone()
+        if count > self.disk_items:
+            deleted += self._db.execute(
+                "DELETE FROM extractions WHERE key IN (SELECT key FROM extractions ORDER BY accessed_at LIMIT ?)",
+                (count - self.disk_items,),
+            ).rowcount
+        with self._lock:
+            self.evictions += max(deleted, 0)
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_items": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -1,18 +1,164 @@
+import asyncio
+import logging
 import os
 import json
-from groq import Groq
+import random
+import httpx
+from groq import AsyncGroq, APIConnectionError, InternalServerError, RateLimitError
 from src.backend.schemas.analysis import ResumeData, JobDescriptionData
-from typing import Optional
+from src.backend.services.ai_cache import ExtractionCache, cache_key
+from src.backend.core.config import settings
+from src.backend.core.executor import get_pool
+from src.backend.core.metrics import span
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: rate limits, dropped connections/timeouts, 5xx responses and
+# attempts cut off by AI_TIMEOUT
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError, asyncio.TimeoutError)
+
+# Bump when a prompt changes so cached extractions from the old prompt are not reused
+RESUME_PROMPT_VERSION = "1"
+JD_PROMPT_VERSION = "1"
 
 class AIService:
     def __init__(self):
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            print("Warning: GROQ_API_KEY not found in environment variables.")
-        self.client = Groq(api_key=api_key)
+        self.api_key = os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            logger.warning("GROQ_API_KEY not found in environment variables.")
+        self.base_url = os.getenv("GROQ_BASE_URL") or None # point at a local stub server for tests
         self.model = "llama-3.3-70b-versatile" # Using a capable model for extraction
+        self._client: Optional[AsyncGroq] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache: Optional[ExtractionCache] = None
+
+    @property
+    def cache(self) -> Optional[ExtractionCache]:
+        """Extraction cache, created on first use (its SQLite file is opened on the first disk lookup)."""
+        if self._cache is None and settings.AI_CACHE_ENABLED:
+            self._cache = ExtractionCache(
+                settings.AI_CACHE_PATH,
+                memory_items=settings.AI_CACHE_MEMORY_ITEMS,
+                disk_items=settings.AI_CACHE_DISK_ITEMS,
+                ttl=settings.AI_CACHE_TTL,
+            )
+        return self._cache
+
+    @property
+    def client(self) -> AsyncGroq:
+        """Shared async client; one pooled HTTP connection pool for every request."""
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.AI_MAX_CONCURRENCY,
+                    max_keepalive_connections=settings.AI_MAX_CONCURRENCY,
+                ),
+                timeout=settings.AI_TIMEOUT,
+            )
+            # retries are handled in _complete so they share the concurrency limit and jitter
+            self._client = AsyncGroq(api_key=self.api_key, base_url=self.base_url, max_retries=0, http_client=http_client)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff with full jitter, honouring Retry-After on rate limits."""
+        if isinstance(error, RateLimitError):
+            retry_after = error.response.headers.get("retry-after")
+            try:
+                if retry_after is not None:
+                    return float(retry_after) + random.uniform(0, settings.AI_RETRY_BASE_DELAY)
+            except ValueError:
+                pass
+        return random.uniform(0, settings.AI_RETRY_BASE_DELAY * (2 ** attempt))
+
+    async def _complete(self, prompt: str) -> str:
+        """Run one JSON chat completion with timeout, global concurrency limit and retries."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+
+        for attempt in range(settings.AI_MAX_RETRIES + 1):
+            try:
+                async with self._semaphore:
+                    with span("groq_call"):
+                        completion = await asyncio.wait_for(
+                            self.client.chat.completions.create(
+                                messages=[
+                                    {"role": "system", "content": "You are a helpful assistant that outputs only JSON."},
+                                    {"role": "user", "content": prompt}
+                                ],
+                                model=self.model,
+                                response_format={"type": "json_object"},
+                                temperature=0.1
+                            ),
+                            settings.AI_TIMEOUT,
+                        )
+                return completion.choices[0].message.content
+            except RETRYABLE_ERRORS as e:
+                if attempt == settings.AI_MAX_RETRIES:
+                    raise
+                # sleep outside the semaphore so waiting retries don't hold a slot
+                await asyncio.sleep(self._retry_delay(attempt, e))
+
+    async def _cached(self, kind: str, prompt_version: str, text: str, schema, extract: Callable[[], Awaitable]):
+        """
+        Serve an extraction from the cache, or run it once and cache the validated result.
+        Concurrent requests for the same uncached text share a single LLM call.
+        """
+        cache = self.cache
+        if cache is None:
+            return await extract()
+
+        # the memory tier is checked on the event loop, SQLite reads and writes run on the I/O threads
+        key = cache_key(kind, text, self.model, prompt_version)
+        payload = cache.get_memory(key)
+        if payload is not None:
+            return schema.model_validate_json(payload)
+
+        task = self._inflight.get(key)
+        if task is None:
+            async def lookup_or_extract():
+                """(result, whether it was freshly extracted)"""
+                if cache.persistent:
+                    payload = await asyncio.get_running_loop().run_in_executor(get_pool("thread"), cache.get_disk, key)
+                else:
+                    payload = cache.get_disk(key)
+                if payload is not None:
+                    return schema.model_validate_json(payload), False
+                return await extract(), True
+
+            def _done(finished: asyncio.Future) -> None:
+                self._inflight.pop(key, None)
+                if finished.cancelled() or finished.exception() is not None:
+                    return
+                result, extracted = finished.result()
+                # failed extractions return None and are not cached
+                if extracted and result is not None:
+                    payload = result.model_dump_json()
+                    expires_at = cache.set_memory(key, payload)
+                    if cache.persistent:
+                        get_pool("thread").submit(cache.set_disk, key, payload, expires_at)
+
+            task = asyncio.ensure_future(lookup_or_extract())
+            self._inflight[key] = task
+            task.add_done_callback(_done)
+        result, _ = await asyncio.shield(task)
+        return result
+
+    async def extract_resume_data(self, text: str) -> Optional[ResumeData]:
+        """Extracts structured data from resume text using Groq (cached by content)."""
+        return await self._cached("resume", RESUME_PROMPT_VERSION, text, ResumeData, lambda: self._extract_resume_data(text))
+
+    async def extract_job_description(self, text: str) -> Optional[JobDescriptionData]:
+        """Extracts structured data from job description text using Groq (cached by content)."""
+        return await self._cached("jd", JD_PROMPT_VERSION, text, JobDescriptionData, lambda: self._extract_job_description(text))
 
-    def extract_resume_data(self, text: str) -> Optional[ResumeData]:
+    async def _extract_resume_data(self, text: str) -> Optional[ResumeData]:
         """Extracts structured data from resume text using Groq."""
         prompt = f"""
         You are an expert Resume Parser. Extract the following information from the resume text provided below.
@@ -30,25 +176,16 @@ class AIService:
         Resume Text:
         {text[:15000]}  # Truncate to avoid context limit issues if extremely long
         """
-        
+
         try:
-            completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that outputs only JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                response_format={"type": "json_object"},
-                temperature=0.1
-            )
-            content = completion.choices[0].message.content
+            content = await self._complete(prompt)
             data = json.loads(content)
             return ResumeData(**data)
         except Exception as e:
-            print(f"Error extracting resume data: {e}")
+            logger.error("Error extracting resume data: %s", e)
             return None
 
-    def extract_job_description(self, text: str) -> Optional[JobDescriptionData]:
+    async def _extract_job_description(self, text: str) -> Optional[JobDescriptionData]:
         """Extracts structured data from job description text using Groq."""
         prompt = f"""
         You are an expert HR Specialist. Extract the following information from the Job Description text provided below.
@@ -66,20 +203,18 @@ class AIService:
         """
 
         try:
-            completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that outputs only JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                response_format={"type": "json_object"},
-                temperature=0.1
-            )
-            content = completion.choices[0].message.content
+            content = await self._complete(prompt)
             data = json.loads(content)
             return JobDescriptionData(**data)
         except Exception as e:
-            print(f"Error extracting JD data: {e}")
+            logger.error("Error extracting JD data: %s", e)
             return None
-            
+
+    async def extract_all(self, resume_text: str, job_text: str) -> Tuple[Optional[ResumeData], Optional[JobDescriptionData]]:
+        """Run the resume and JD extractions concurrently."""
+        return await asyncio.gather(
+            self.extract_resume_data(resume_text),
+            self.extract_job_description(job_text),
+        )
+
 ai_service = AIService()
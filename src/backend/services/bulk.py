@@ -0,0 +1,273 @@
+"""
+Offline bulk scoring: stream resumes from directories or NDJSON, score them
+against one job description in a process pool and write NDJSON results.
+
+    python -m src.backend.services.bulk --jd jd.pdf --category engineering \\
+        --input resumes/ --out results.ndjson --no-ai
+
+Rerunning the same command with --resume continues after the last checkpoint.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.backend.core.config import settings
+
+# (id, path, text): directory inputs carry a path and are read in the worker, NDJSON inputs carry the text.
+# Unreadable NDJSON lines have neither and are reported as errors.
+Record = Tuple[str, Optional[str], Optional[str]]
+
+DOCUMENT_EXTENSIONS = (".pdf", ".txt")
+
+
+def _read_document(path: str) -> str:
+    from src.backend.services.parser import document_text
+    with open(path, "rb") as f:
+        return document_text(path, f.read())
+
+
+def iter_records(inputs: List[str]) -> Iterator[Record]:
+    """Yield resumes from directories (walked in sorted order), PDF/text files or NDJSON files ("-" = stdin)."""
+    for source in inputs:
+        if source == "-" or source.lower().endswith((".ndjson", ".jsonl")):
+            yield from _iter_ndjson(sys.stdin if source == "-" else open(source, encoding="utf-8"), source)
+        elif os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(DOCUMENT_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        yield os.path.relpath(path, source), path, None
+        else:
+            yield source, source, None
+
+
+def _iter_ndjson(lines, source: str) -> Iterator[Record]:
+    """NDJSON lines of {"id": ..., "text": ...}; "id" defaults to source:line."""
+    with lines:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                yield str(item.get("id", f"{source}:{line_no}")), None, str(item.get("text") or "")
+            except (ValueError, AttributeError) as e:
+                print(f"Invalid NDJSON at {source}:{line_no}: {e}", file=sys.stderr)
+                yield f"{source}:{line_no}", None, None
+
+
+def _chunks(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Per-process state, set once by _init_bulk_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_bulk_worker(job_text: str, category: str, use_ai: bool,
+                      ai_jd_required: Optional[List[str]], ai_jd_nice: Optional[List[str]]) -> None:
+    """Load spaCy, the keyword catalogue and the prepared job once per worker process."""
+    from src.backend.services.keyword_catalogue import keyword_catalogue
+    from src.backend.services.scoring import prepare_job
+
+    keyword_catalogue.load_all()
+    _worker["job"] = prepare_job(job_text, category)
+    _worker["use_ai"] = use_ai and bool(ai_jd_required)
+    _worker["ai_jd_required"] = ai_jd_required
+    _worker["ai_jd_nice"] = ai_jd_nice
+    # one loop per worker, so the shared AI client and its connection pool outlive a chunk
+    _worker["loop"] = asyncio.new_event_loop() if _worker["use_ai"] else None
+
+
+def _init_forked_bulk_worker(*args) -> None:
+    """_init_bulk_worker in a pool process, which inherited the parent's AI cache connection."""
+    if "src.backend.services.ai_service" in sys.modules:
+        from src.backend.services.ai_service import ai_service
+        if ai_service.cache is not None:
+            ai_service.cache.after_fork()
+    _init_bulk_worker(*args)
+
+
+def _ai_resume_skills(texts: List[str]) -> List[Optional[List[str]]]:
+    from src.backend.services.ai_service import ai_service
+
+    async def extract():
+        return await asyncio.gather(*(ai_service.extract_resume_data(text) for text in texts))
+
+    results = _worker["loop"].run_until_complete(extract())
+    return [data.skills if data else None for data in results]
+
+
+def score_chunk(chunk: List[Record]) -> List[Dict[str, Any]]:
+    """Read, parse (one nlp.pipe batch) and score a chunk of resumes in a worker."""
+    from src.backend.services.scoring import build_document_profiles, score_resumes
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(chunk)
+    texts, positions = [], []
+    for pos, (record_id, path, text) in enumerate(chunk):
+        error = None
+        try:
+            if path is not None:
+                text = _read_document(path)
+        except OSError as e:
+            error = str(e)
+        if text is None and error is None:
+            error = "invalid NDJSON record"
+        elif error is None and not text.strip():
+            error = "no text extracted"
+        if error is not None:
+            results[pos] = {"id": record_id, "error": error}
+            continue
+        texts.append(text)
+        positions.append(pos)
+
+    if texts:
+        ai_skills = _ai_resume_skills(texts) if _worker["use_ai"] else None
+        scores = score_resumes(build_document_profiles(texts), _worker["job"], ai_skills,
+                               _worker["ai_jd_required"], _worker["ai_jd_nice"])
+        for pos, (score, keyword_score, _sections, section_scores, density, matched, missing, semantic) in zip(positions, scores):
+            results[pos] = {
+                "id": chunk[pos][0],
+                "score": score,
+                "keyword_score": keyword_score,
+                "semantic_score": semantic,
+                "density": density,
+                "section_scores": section_scores,
+                "matched_keywords": matched,
+                "missing_keywords": missing,
+            }
+    return results
+
+
+def _job_ai(job_text: str) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+    from src.backend.services.ai_service import ai_service
+
+    async def extract():
+        try:
+            return await ai_service.extract_job_description(job_text)
+        finally:
+            await ai_service.aclose()
+
+    jd_data = asyncio.run(extract())
+    if jd_data is None:
+        print("AI extraction of the job description failed, scoring without AI.", file=sys.stderr)
+        return None, None
+    return jd_data.required_skills, jd_data.nice_to_have_skills
+
+
+class Checkpoint:
+    """
+    Sidecar file recording how many input records are done and the size of the
+    output at that point; resuming truncates any partially written tail.
+    """
+
+    def __init__(self, path: str, run_id: str):
+        self.path = path
+        self.run_id = run_id
+
+    def load(self) -> Tuple[int, int]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0, 0
+        if state.get("run") != self.run_id:
+            raise SystemExit(f"Checkpoint '{self.path}' belongs to a different job/category/input; remove it or drop --resume.")
+        return state["done"], state["offset"]
+
+    def save(self, done: int, offset: int) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"run": self.run_id, "done": done, "offset": offset}, f)
+        os.replace(tmp, self.path)
+
+
+def run(job_text: str, category: str, inputs: List[str], out_path: str,
+        workers: int = 0, chunk_size: int = 32, use_ai: bool = True, resume: bool = False) -> int:
+    """Score every input record and append NDJSON results to out_path. Returns the number of records written."""
+    run_id = hashlib.sha256(json.dumps([job_text, category, [os.path.abspath(i) for i in inputs], use_ai]).encode()).hexdigest()
+    checkpoint = Checkpoint(out_path + ".checkpoint", run_id)
+    done, offset = checkpoint.load() if resume and os.path.exists(out_path) else (0, 0)
+
+    ai_jd_required, ai_jd_nice = _job_ai(job_text) if use_ai else (None, None)
+    init_args = (job_text, category, use_ai, ai_jd_required, ai_jd_nice)
+
+    records = iter_records(inputs)
+    for _ in range(done): # inputs are read in a deterministic order, so skipping by count is enough
+        next(records, None)
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_forked_bulk_worker, initargs=init_args) if workers > 0 else None
+    if pool is None:
+        _init_bulk_worker(*init_args)
+
+    written, started = done, time.perf_counter()
+    with open(out_path, "r+b" if done else "wb") as out:
+        out.seek(offset)
+        out.truncate()
+        pending: "deque[Future]" = deque()
+
+        def flush(results: List[Dict[str, Any]]) -> None:
+            nonlocal written
+            out.writelines((json.dumps(result) + "\n").encode("utf-8") for result in results)
+            out.flush()
+            written += len(results)
+            checkpoint.save(written, out.tell())
+            rate = (written - done) / max(time.perf_counter() - started, 1e-9)
+            print(f"{written} resumes scored ({rate:.1f}/s)", file=sys.stderr)
+
+        try:
+            for chunk in _chunks(records, chunk_size):
+                if pool is None:
+                    flush(score_chunk(chunk))
+                    continue
+                pending.append(pool.submit(score_chunk, chunk))
+                # bounded look-ahead keeps memory constant; results are written in input order
+                while len(pending) > 2 * workers:
+                    flush(pending.popleft().result())
+            while pending:
+                flush(pending.popleft().result())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score a pool of resumes against one job description, streaming NDJSON")
+    parser.add_argument("--jd", required=True, help="job description (.pdf or text file)")
+    parser.add_argument("--category", required=True, help="keyword category, e.g. engineering")
+    parser.add_argument("--input", nargs="+", required=True,
+                        help="directories of PDF/text resumes, single files, or NDJSON files of {id, text} ('-' = stdin)")
+    parser.add_argument("--out", required=True, help="NDJSON output file")
+    parser.add_argument("--workers", type=int, default=settings.CPU_WORKERS, help="worker processes (0 = score in this process)")
+    parser.add_argument("--chunk-size", type=int, default=settings.NLP_BATCH_SIZE, help="resumes per worker task / nlp.pipe batch")
+    parser.add_argument("--no-ai", action="store_true", help="skip Groq extraction and score fully offline")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint of the same run")
+    args = parser.parse_args(argv)
+
+    job_text = _read_document(args.jd)
+    if not job_text.strip():
+        print(f"No text extracted from '{args.jd}'.", file=sys.stderr)
+        return 1
+    written = run(job_text, args.category, args.input, args.out, workers=args.workers,
+                  chunk_size=max(args.chunk_size, 1), use_ai=not args.no_ai, resume=args.resume)
+    print(f"Wrote {written} results to '{args.out}'.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
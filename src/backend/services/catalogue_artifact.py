@@ -0,0 +1,442 @@
+"""
+Compiled keyword catalogue: every keywords_<category>.json in one binary file.
+
+The file holds, as flat little arrays behind a small JSON table of contents:
+
+    keywords      interned, lowercased and sorted (ids are positions in this list)
+    tokens        interned tokenize() output, and each keyword's token ids
+    categories    each category's keyword ids in file order, and a bitset of them
+    automaton     the Aho-Corasick automaton over all keywords (transitions,
+                  failure links, outputs), built once by `build`
+
+It is mmapped, so opening it parses nothing, the pages are shared by every
+worker process and the automaton is never rebuilt. A category's keywords,
+keyword set and tokens are views over the file rather than copies. FlatMatcher walks the
+arrays directly and decodes a state's transitions the first time a text
+reaches it, so memory follows the states visited rather than catalogue size.
+
+    python -m src.backend.services.catalogue_artifact build
+    python -m src.backend.services.catalogue_artifact info
+
+The catalogue falls back to the JSON file of any category whose file changed
+after the build, so a stale artifact is never wrong, only slower.
+"""
+import argparse
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence, Set as AbstractSet
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.backend.core.config import settings
+from src.backend.services.keyword_matcher import KeywordMatcher, _is_word_char, tokenize
+
+MAGIC = b"RAKWCAT\0"
+VERSION = 1
+_PREAMBLE = struct.Struct("<8sII") # magic, version, table of contents length
+
+# keyword flags: whether its first / last character is a word character (for the boundary check)
+_FIRST_WORD, _LAST_WORD = 1, 2
+
+
+class StringTable(Sequence):
+    """Read-only sequence of the UTF-8 strings in a blob, decoded on access."""
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def find(self, value: str) -> int:
+        """Position of value (the table is sorted), or -1."""
+        i = bisect_left(self, value)
+        return i if i < len(self) and self[i] == value else -1
+
+
+class FlatMatcher:
+    """
+    KeywordMatcher over the artifact's automaton, reporting only the keywords
+    set in `mask` (a bitset over keyword ids; None reports every keyword).
+    `keywords` is the artifact's keyword table, so match indexes are keyword ids.
+    """
+
+    word_boundaries = True
+
+    def __init__(self, artifact: "CatalogueArtifact", mask: Optional[bytes] = None):
+        self.artifact = artifact
+        self.keywords = artifact.keywords
+        self.mask = mask
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, keyword id) for every bounded match in already lowercased text."""
+        artifact = self.artifact
+        rows, row_of = artifact._rows, artifact._row
+        fail, out_start, out_ids = artifact._fail, artifact._out_start, artifact._out_ids
+        lengths, flags, mask = artifact._lengths, artifact._flags, self.mask
+        text_len = len(text)
+        state = 0
+        row = row_of(0)
+        for pos, char in enumerate(text):
+            nxt = row.get(char)
+            while nxt is None and state:
+                state = fail[state]
+                row = rows.get(state) or row_of(state)
+                nxt = row.get(char)
+            if nxt is None:
+                continue # back at the root
+            state = nxt
+            row = rows.get(state)
+            if row is None:
+                row = row_of(state)
+            lo, hi = out_start[state], out_start[state + 1]
+            if lo == hi:
+                continue
+            end = pos + 1
+            for k in range(lo, hi):
+                idx = out_ids[k]
+                if mask is not None and not mask[idx >> 3] >> (idx & 7) & 1:
+                    continue
+                start = end - lengths[idx]
+                before = start > 0 and _is_word_char(text[start - 1])
+                after = end < text_len and _is_word_char(text[end])
+                if before == bool(flags[idx] & _FIRST_WORD) or after == bool(flags[idx] & _LAST_WORD):
+                    continue
+                yield start, end, idx
+
+    def find_all(self, text: str) -> set:
+        """Return the set of keywords found in lowercased text."""
+        return {self.keywords[idx] for _, _, idx in self.iter_matches(text)}
+
+
+class KeywordList(Sequence):
+    """A category's keywords in file order, decoded from the artifact the first time they are read."""
+
+    def __init__(self, artifact: "CatalogueArtifact", ids: memoryview):
+        self._artifact = artifact
+        self._ids = ids
+        self._keywords: Optional[Tuple[str, ...]] = None
+
+    def _decoded(self) -> Tuple[str, ...]:
+        if self._keywords is None:
+            self._keywords = tuple(self._artifact.keywords[idx] for idx in self._ids)
+        return self._keywords
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        return self._decoded()[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decoded())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (tuple, KeywordList)):
+            return self._decoded() == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._decoded())
+
+
+class KeywordSet(AbstractSet):
+    """Membership in a category, answered from its bitset without decoding its keywords."""
+
+    def __init__(self, artifact: "CatalogueArtifact", keywords: KeywordList, mask: bytes):
+        self._artifact = artifact
+        self._keywords = keywords
+        self._mask = mask
+
+    @classmethod
+    def _from_iterable(cls, it) -> frozenset:
+        return frozenset(it)
+
+    def __contains__(self, keyword) -> bool:
+        idx = self._artifact.keywords.find(keyword) if isinstance(keyword, str) else -1
+        return idx >= 0 and bool(self._mask[idx >> 3] >> (idx & 7) & 1)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys(self._keywords))
+
+    def __len__(self) -> int:
+        return len(dict.fromkeys(self._keywords))
+
+    __hash__ = AbstractSet._hash
+
+
+class KeywordTokens(Mapping):
+    """keyword -> tokenize(keyword) for a category, each read from the artifact's token table on lookup."""
+
+    def __init__(self, artifact: "CatalogueArtifact", keyword_set: KeywordSet):
+        self._artifact = artifact
+        self._keyword_set = keyword_set
+
+    def __getitem__(self, keyword: str) -> Tuple[str, ...]:
+        if keyword not in self._keyword_set:
+            raise KeyError(keyword)
+        return self._artifact.keyword_tokens(self._artifact.keywords.find(keyword))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keyword_set)
+
+    def __len__(self) -> int:
+        return len(self._keyword_set)
+
+
+class CategoryTags(Mapping):
+    """keyword -> names of the categories (of a union) that list it, read from the category bitsets."""
+
+    def __init__(self, artifact: "CatalogueArtifact", names: Tuple[str, ...], mask: bytes):
+        self._artifact = artifact
+        self._names = names
+        self._mask = mask
+
+    def __getitem__(self, keyword: str) -> frozenset:
+        idx = self._artifact.keywords.find(keyword)
+        if idx < 0 or not self._mask[idx >> 3] >> (idx & 7) & 1:
+            raise KeyError(keyword)
+        return frozenset(name for name in self._names if self._artifact.has(name, idx))
+
+    def _ids(self) -> Iterator[int]:
+        return (idx for idx in range(len(self._artifact.keywords)) if self._mask[idx >> 3] >> (idx & 7) & 1)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._artifact.keywords[idx] for idx in self._ids())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._ids())
+
+
+class CatalogueArtifact:
+    """A built catalogue file, mmapped read-only. Raises ValueError for a file of another format or version."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, toc_len = _PREAMBLE.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' is not a version {VERSION} keyword catalogue")
+        toc = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + toc_len])
+        if toc["byteorder"] != sys.byteorder:
+            raise ValueError(f"'{path}' was built on a {toc['byteorder']}-endian machine")
+
+        self.categories: Tuple[str, ...] = tuple(toc["categories"])
+        self.sources: Dict[str, float] = toc["sources"] # category -> mtime of the JSON file it was built from
+        view = memoryview(self._mmap)
+        s = {name: view[offset:offset + length].cast(code) for name, (offset, length, code) in toc["sections"].items()}
+        self.keywords = StringTable(s["keyword_blob"], s["keyword_offsets"])
+        self.tokens = StringTable(s["token_blob"], s["token_offsets"])
+        self._lengths, self._flags = s["keyword_lengths"], s["keyword_flags"]
+        self._token_start, self._token_ids = s["keyword_token_start"], s["keyword_token_ids"]
+        self._order_start, self._order_ids = s["category_order_start"], s["category_order_ids"]
+        self._bits, self._bitset_size = s["category_bits"], (len(self.keywords) + 7) // 8
+        self._trans_start, self._trans_chars, self._trans_next = s["trans_start"], s["trans_chars"], s["trans_next"]
+        self._fail, self._out_start, self._out_ids = s["fail"], s["out_start"], s["out_ids"]
+        self._rows: Dict[int, Dict[str, int]] = {} # state -> {char: next state}, decoded on first visit
+
+    def _row(self, state: int) -> Dict[str, int]:
+        lo, hi = self._trans_start[state], self._trans_start[state + 1]
+        chars, targets = self._trans_chars, self._trans_next
+        row = self._rows[state] = {chr(chars[i]): targets[i] for i in range(lo, hi)}
+        return row
+
+    def mask(self, category: str) -> bytes:
+        c = self.categories.index(category)
+        return bytes(self._bits[c * self._bitset_size:(c + 1) * self._bitset_size])
+
+    def has(self, category: str, idx: int) -> bool:
+        c = self.categories.index(category)
+        return bool(self._bits[c * self._bitset_size + (idx >> 3)] >> (idx & 7) & 1)
+
+    def keyword_tokens(self, idx: int) -> Tuple[str, ...]:
+        return tuple(self.tokens[t] for t in self._token_ids[self._token_start[idx]:self._token_start[idx + 1]])
+
+    def category(self, name: str):
+        """
+        CategoryKeywords for a category, sharing this file's automaton instead of building one.
+        Its keywords, keyword set and tokens are views over the file, so opening a category
+        decodes nothing; the keyword list is decoded once, when it is first iterated.
+        """
+        from src.backend.services.keyword_catalogue import CategoryKeywords
+
+        c = self.categories.index(name)
+        mask = self.mask(name)
+        keywords = KeywordList(self, self._order_ids[self._order_start[c]:self._order_start[c + 1]])
+        keyword_set = KeywordSet(self, keywords, mask)
+        return CategoryKeywords(
+            name=name,
+            keywords=keywords,
+            keyword_set=keyword_set,
+            tokens=KeywordTokens(self, keyword_set),
+            matcher=FlatMatcher(self, mask),
+            mtime=self.sources[name],
+        )
+
+    def union(self, entries):
+        """KeywordUnion of categories loaded from this file: one mask, no new automaton."""
+        from src.backend.services.keyword_catalogue import KeywordUnion
+
+        names = tuple(entry.name for entry in entries)
+        mask = bytearray(self._bitset_size)
+        for name in names:
+            for i, byte in enumerate(self.mask(name)):
+                mask[i] |= byte
+        mask = bytes(mask)
+        return KeywordUnion(entries=tuple(entries), tags=CategoryTags(self, names, mask), matcher=FlatMatcher(self, mask))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "path": self.path,
+            "bytes": len(self._mmap),
+            "categories": len(self.categories),
+            "keywords": len(self.keywords),
+            "tokens": len(self.tokens),
+            "states": len(self._fail),
+            "states_decoded": len(self._rows),
+        }
+
+
+def _string_table(strings: List[str]) -> Tuple[bytes, array.array]:
+    offsets, blob = array.array("i", [0]), bytearray()
+    for s in strings:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+    return bytes(blob), offsets
+
+
+def build(data_dir: str, out_path: str) -> Dict[str, object]:
+    """Compile every keywords_<category>.json in data_dir into one artifact at out_path."""
+    from src.backend.services.keyword_catalogue import FILE_PREFIX, FILE_SUFFIX
+
+    lists, sources = {}, {}
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.startswith(FILE_PREFIX) and filename.endswith(FILE_SUFFIX):
+            category = filename[len(FILE_PREFIX):-len(FILE_SUFFIX)]
+            path = os.path.join(data_dir, filename)
+            sources[category] = os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                lists[category] = [kw.lower() for kw in json.load(f)]
+    categories = sorted(lists)
+
+    keywords = sorted({kw for kws in lists.values() for kw in kws})
+    ids = {kw: i for i, kw in enumerate(keywords)}
+    keyword_tokens = [tokenize(kw) for kw in keywords]
+    tokens = sorted({t for ts in keyword_tokens for t in ts})
+    token_ids = {t: i for i, t in enumerate(tokens)}
+
+    sections = {}
+    sections["keyword_blob"], sections["keyword_offsets"] = _string_table(keywords)
+    sections["token_blob"], sections["token_offsets"] = _string_table(tokens)
+    sections["keyword_lengths"] = array.array("i", (len(kw) for kw in keywords))
+    sections["keyword_flags"] = bytes((_FIRST_WORD if kw and _is_word_char(kw[0]) else 0)
+                                      | (_LAST_WORD if kw and _is_word_char(kw[-1]) else 0) for kw in keywords)
+    start, flat = array.array("i", [0]), array.array("i")
+    for ts in keyword_tokens:
+        flat.extend(token_ids[t] for t in ts)
+        start.append(len(flat))
+    sections["keyword_token_start"], sections["keyword_token_ids"] = start, flat
+
+    bitset_size = (len(keywords) + 7) // 8
+    start, flat, bits = array.array("i", [0]), array.array("i"), bytearray(bitset_size * len(categories))
+    for c, category in enumerate(categories):
+        for kw in lists[category]:
+            flat.append(ids[kw])
+            bits[c * bitset_size + (ids[kw] >> 3)] |= 1 << (ids[kw] & 7)
+        start.append(len(flat))
+    sections["category_order_start"], sections["category_order_ids"] = start, flat
+    sections["category_bits"] = bytes(bits)
+
+    # the automaton is built by KeywordMatcher and flattened, so matching rules cannot drift apart
+    matcher = KeywordMatcher(keywords)
+    trans_start, trans_chars, trans_next = array.array("i", [0]), array.array("i"), array.array("i")
+    for goto in matcher._goto:
+        for char, nxt in sorted(goto.items()):
+            trans_chars.append(ord(char))
+            trans_next.append(nxt)
+        trans_start.append(len(trans_chars))
+    out_start, out_ids = array.array("i", [0]), array.array("i")
+    for out in matcher._out:
+        out_ids.extend(out)
+        out_start.append(len(out_ids))
+    sections.update(trans_start=trans_start, trans_chars=trans_chars, trans_next=trans_next,
+                    fail=array.array("i", matcher._fail), out_start=out_start, out_ids=out_ids)
+
+    # table of contents: section offsets are relative to the file start and 8-byte aligned
+    def toc_for(base: int) -> Tuple[bytes, List[Tuple[bytes, int]]]:
+        layout, offset, placed = {}, base, []
+        for name, data in sections.items():
+            raw = data.tobytes() if isinstance(data, array.array) else data
+            offset += -offset % 8
+            layout[name] = [offset, len(raw), "i" if isinstance(data, array.array) else "B"]
+            placed.append((raw, offset))
+            offset += len(raw)
+        toc = {"byteorder": sys.byteorder, "categories": categories, "sources": sources, "sections": layout}
+        return json.dumps(toc).encode("utf-8"), placed
+
+    toc, _ = toc_for(0)
+    while True: # the offsets depend on the table's own length, so settle it first
+        base = _PREAMBLE.size + len(toc)
+        new_toc, placed = toc_for(base)
+        if len(new_toc) == len(toc):
+            toc = new_toc
+            break
+        toc = new_toc
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(toc)) + toc)
+        for raw, offset in placed:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(raw)
+    os.replace(tmp_path, out_path) # running processes keep their mapping of the old file
+    return {"categories": len(categories), "keywords": len(keywords), "tokens": len(tokens),
+            "states": len(matcher._fail), "bytes": os.path.getsize(out_path)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build or inspect the compiled keyword catalogue")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="compile the keywords_<category>.json files")
+    build_cmd.add_argument("--data-dir", default=settings.KEYWORD_DATA_DIR)
+    build_cmd.add_argument("--out", default=settings.KEYWORD_ARTIFACT)
+    info = sub.add_parser("info", help="print an artifact's contents and which categories are stale")
+    info.add_argument("path", nargs="?", default=settings.KEYWORD_ARTIFACT)
+    info.add_argument("--data-dir", default=settings.KEYWORD_DATA_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(json.dumps(build(args.data_dir, args.out)))
+        print(f"Wrote '{args.out}'.", file=sys.stderr)
+        return 0
+
+    from src.backend.services.keyword_catalogue import FILE_PREFIX, FILE_SUFFIX
+
+    try:
+        artifact = CatalogueArtifact(args.path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot open '{args.path}': {e}", file=sys.stderr)
+        return 1
+    stale = []
+    for category in artifact.categories:
+        path = os.path.join(args.data_dir, f"{FILE_PREFIX}{category}{FILE_SUFFIX}")
+        if not os.path.exists(path) or os.path.getmtime(path) != artifact.sources[category]:
+            stale.append(category)
+    print(json.dumps({**artifact.stats(), "stale": stale}))
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
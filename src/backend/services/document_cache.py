@@ -0,0 +1,102 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.backend.core.config import settings
+from src.backend.services.sections import ResumeSections
+
+
+@dataclass
+class DocumentProfile:
+    """
+    Everything the scorer derives from a document on its own, independent of
+    the job category or the other document. Plain data, so it pickles cheaply
+    to and from worker processes and can be cached.
+    """
+    text: str
+    sections: ResumeSections # segment_sections output (line offsets into text)
+    tokens: List[str] # tokenize(text)
+    noun_chunks: List[str] = field(default_factory=list) # empty for the vectors engine
+    vector: Optional[np.ndarray] = None # noun chunk vector (spacy) or text vector (vectors)
+    engine: str = "spacy"
+
+    def size_bytes(self) -> int:
+        """Approximate memory footprint, used for the cache's byte budget."""
+        size = len(self.text) + sum(64 * len(spans) for spans in self.sections.spans.values())
+        size += sum(len(t) + 56 for t in self.tokens) + sum(len(c) + 56 for c in self.noun_chunks)
+        if self.vector is not None:
+            size += self.vector.nbytes
+        return size + 512
+
+
+class DocumentCache:
+    """
+    LRU cache of DocumentProfile keyed by the SHA-256 of the uploaded bytes or text,
+    bounded both by item count and by approximate size in bytes.
+    """
+
+    def __init__(self, max_items: int = 2048, max_bytes: int = 256 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, DocumentProfile]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(kind: str, content: bytes, engine: str) -> str:
+        """kind distinguishes raw PDF bytes from plain text with the same bytes."""
+        return f"{kind}:{engine}:{hashlib.sha256(content).hexdigest()}"
+
+    def get(self, key: str) -> Optional[DocumentProfile]:
+        with self._lock:
+            document = self._entries.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def put(self, key: str, document: DocumentProfile) -> None:
+        size = document.size_bytes()
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._sizes[key]
+            self._entries[key] = document
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self.bytes += size
+            while len(self._entries) > self.max_items or self.bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self.bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+document_cache = DocumentCache(settings.DOCUMENT_CACHE_ITEMS, settings.DOCUMENT_CACHE_BYTES)
@@ -0,0 +1,412 @@
+"""
+Persistent index of job postings for reverse search: the best postings for a resume.
+
+Each posting keeps what scoring derives from the job description alone: the
+hits of its category's keywords, its extra keywords and its document vector.
+Keywords go into an inverted index (keyword -> posting rows) and vectors into
+a float32 matrix memory-mapped from disk. A resume is matched once against the
+index vocabulary; keyword scores for every posting then come from the sparse
+keyword overlaps and semantic scores from one matrix-vector product. Scores
+are the same as score_documents without AI data.
+
+On disk (settings.JOB_INDEX_DIR):
+    postings.jsonl  append-only log of add/remove records
+    vectors.f32     unit-length posting vectors, one row per add, appended in place
+Removed or replaced postings leave a dead row behind until `compact`.
+
+    python -m src.backend.services.job_index add --category engineering postings/
+    python -m src.backend.services.job_index search resume.pdf --top-k 10
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.backend.core.config import settings
+from src.backend.core.metrics import span
+from src.backend.services.document_cache import DocumentProfile
+from src.backend.services.keyword_matcher import KeywordMatcher
+from src.backend.services.sections import INFO_CATEGORIES, SECTION_ORDER
+
+LOG_FILE = "postings.jsonl"
+VECTORS_FILE = "vectors.f32"
+
+
+@dataclass(frozen=True)
+class Posting:
+    id: str
+    row: int
+    category: str
+    title: str
+    keywords: Tuple[str, ...] # the category's keywords found in the JD
+    extras: Tuple[str, ...] # extra keywords that are not among `keywords`
+    text: str
+
+
+class JobIndex:
+    """Inverted keyword index plus vector matrix over job postings, persisted in index_dir."""
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self) -> None:
+        self.engine: Optional[str] = None
+        self.dim = 0
+        self.postings: Dict[str, Posting] = {}
+        self._by_row: List[Optional[Posting]] = [] # None for dead rows
+        self._keyword_rows: Dict[str, List[int]] = {} # database keyword -> rows
+        self._extra_rows: Dict[str, List[int]] = {} # extra keyword -> rows
+        self._jd_weight: List[float] = [] # per row: weight of all JD keywords before matching
+        self._vectors: Optional[np.ndarray] = None
+        self._matcher: Optional[KeywordMatcher] = None
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    # -- persistence
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _load(self) -> None:
+        if not os.path.exists(self._path(LOG_FILE)):
+            return
+        with open(self._path(LOG_FILE), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self._apply(json.loads(line))
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        op = record["op"]
+        if op == "meta":
+            self.engine, self.dim = record["engine"], record["dim"]
+        elif op == "add":
+            self._drop(record["id"])
+            posting = Posting(record["id"], record["row"], record["category"], record.get("title", ""),
+                              tuple(record["keywords"]), tuple(record["extras"]), record.get("text", ""))
+            while len(self._by_row) <= posting.row:
+                self._by_row.append(None)
+                self._jd_weight.append(0.0)
+            self._by_row[posting.row] = posting
+            self.postings[posting.id] = posting
+            for kw in posting.keywords:
+                self._keyword_rows.setdefault(kw, []).append(posting.row)
+            for kw in posting.extras:
+                self._extra_rows.setdefault(kw, []).append(posting.row)
+            skills_wgt = INFO_CATEGORIES.get("SKILLS", {"weight": 4})["weight"]
+            self._jd_weight[posting.row] = skills_wgt * (len(posting.keywords) + len(posting.extras))
+            self._matcher = None
+        elif op == "remove":
+            self._drop(record["id"])
+        self._arrays = None
+
+    def _drop(self, posting_id: str) -> None:
+        # rows stay in the inverted lists; dead rows are masked out at search time
+        posting = self.postings.pop(posting_id, None)
+        if posting is not None:
+            self._by_row[posting.row] = None
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self._path(LOG_FILE), "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        for record in records:
+            self._apply(record)
+
+    def _vector_rows(self, dim: Optional[int] = None) -> int:
+        dim = self.dim if dim is None else dim
+        path = self._path(VECTORS_FILE)
+        return os.path.getsize(path) // (4 * dim) if dim and os.path.exists(path) else 0
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Posting vectors, memory-mapped; reopened after every add."""
+        if self._vectors is None:
+            rows = self._vector_rows()
+            if rows == 0:
+                return np.zeros((0, self.dim), dtype=np.float32)
+            self._vectors = np.memmap(self._path(VECTORS_FILE), dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._vectors
+
+    # -- updates
+
+    def _check_engine(self, engine: str, dim: int) -> None:
+        # the engine that analysed the document: SEMANTIC_ENGINE=vectors without a table falls back to spaCy
+        if self.engine is not None and (self.engine != engine or self.dim != dim):
+            raise ValueError(f"Job index in '{self.index_dir}' was built with the {self.engine} engine "
+                             f"({self.dim} dimensions), the document was analysed with the {engine} engine "
+                             f"({dim} dimensions); rebuild the index or set SEMANTIC_ENGINE={self.engine}.")
+
+    def add_many(self, items: Iterable[Tuple[str, str, str, DocumentProfile]]) -> int:
+        """
+        Add or replace postings given as (id, category, title, analysed JD).
+        Returns the number added.
+        """
+        from src.backend.services.scoring import prepare_job
+
+        items = list(items)
+        if not items:
+            return 0
+        # keyword analysis needs no index state, so searches are not held up by it
+        jobs = [prepare_job(document.text, category, document) for _, category, _, document in items]
+        with self._lock:
+            records = []
+            vectors = []
+            engine = items[0][3].engine
+            dim = len(items[0][3].vector) if items[0][3].vector is not None else 0
+            self._check_engine(engine, dim)
+            if self.engine is None:
+                records.append({"op": "meta", "engine": engine, "dim": dim})
+            # past any vectors left unlogged by an interrupted add, so rows and vectors stay aligned
+            row = max(len(self._by_row), self._vector_rows(dim))
+            for (posting_id, category, title, document), job in zip(items, jobs):
+                if document.engine != engine:
+                    raise ValueError(f"Posting '{posting_id}' was analysed with the {document.engine} engine, "
+                                     f"the index uses {engine}.")
+                vector = np.zeros(dim, dtype=np.float32) if document.vector is None else np.asarray(document.vector, dtype=np.float32)
+                if vector.shape != (dim,):
+                    raise ValueError(f"Posting '{posting_id}' has a {vector.shape} vector, the index uses {dim} dimensions.")
+                norm = float(np.linalg.norm(vector))
+                vectors.append(vector / norm if norm else vector)
+                records.append({
+                    "op": "add", "id": posting_id, "row": row, "category": category, "title": title,
+                    "keywords": sorted(job.jd_hits),
+                    "extras": [kw for kw in job.extra_keywords if kw not in job.jd_hits],
+                    "text": document.text,
+                })
+                row += 1
+            # vectors first: a crash before the log write only leaves unused rows at the end of the file
+            os.makedirs(self.index_dir, exist_ok=True)
+            with open(self._path(VECTORS_FILE), "ab") as f:
+                f.write(np.stack(vectors).astype(np.float32).tobytes())
+            self._vectors = None
+            self._append(records)
+        return len(items)
+
+    def add(self, posting_id: str, category: str, title: str, document: DocumentProfile) -> None:
+        self.add_many([(posting_id, category, title, document)])
+
+    def remove(self, posting_id: str) -> bool:
+        with self._lock:
+            if posting_id not in self.postings:
+                return False
+            self._append([{"op": "remove", "id": posting_id}])
+        return True
+
+    def compact(self) -> int:
+        """Rewrite both files without dead rows. Returns the number of rows reclaimed."""
+        with self._lock:
+            live = sorted(self.postings.values(), key=lambda p: p.row)
+            dead = len(self._by_row) - len(live)
+            vectors = np.array(self.vectors[[p.row for p in live]]) if live else np.zeros((0, self.dim), dtype=np.float32)
+            records = [{"op": "meta", "engine": self.engine, "dim": self.dim}] if self.engine else []
+            records += [{"op": "add", "id": p.id, "row": row, "category": p.category, "title": p.title,
+                         "keywords": list(p.keywords), "extras": list(p.extras), "text": p.text}
+                        for row, p in enumerate(live)]
+            os.makedirs(self.index_dir, exist_ok=True)
+            with open(self._path(VECTORS_FILE + ".tmp"), "wb") as f:
+                f.write(vectors.astype(np.float32).tobytes())
+            with open(self._path(LOG_FILE + ".tmp"), "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._vectors = None
+            os.replace(self._path(VECTORS_FILE + ".tmp"), self._path(VECTORS_FILE))
+            os.replace(self._path(LOG_FILE + ".tmp"), self._path(LOG_FILE))
+            self._reset()
+            self._load()
+        return dead
+
+    # -- search
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        """Automaton over every keyword in the index, rebuilt after adds."""
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(sorted(self._keyword_rows.keys() | self._extra_rows.keys()))
+        return self._matcher
+
+    def _row_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(JD keyword weight, live mask, category) per row, rebuilt after updates."""
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self._jd_weight, dtype=np.float64),
+                np.array([p is not None for p in self._by_row], dtype=bool),
+                np.array([p.category if p is not None else "" for p in self._by_row], dtype=object),
+            )
+        return self._arrays
+
+    def search(self, resume: DocumentProfile, top_k: int = 10, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The top_k postings for an analysed resume, best first (optionally only one category)."""
+        # adds, removes and compaction mutate the rows and inverted lists (on the I/O threads)
+        with self._lock:
+            return self._search(resume, top_k, category)
+
+    def _search(self, resume: DocumentProfile, top_k: int, category: Optional[str]) -> List[Dict[str, Any]]:
+        if not self.postings:
+            return []
+        if resume.vector is not None:
+            self._check_engine(resume.engine, len(resume.vector))
+        skills_wgt = INFO_CATEGORIES.get("SKILLS", {"weight": 4})["weight"]
+
+        # resume side, once: each index keyword with the weight of the first section it appears in
+        with span("keyword_matching"):
+            section_hits = resume.sections.find_all(self.matcher)
+        weights: Dict[str, int] = {}
+        for section in SECTION_ORDER:
+            weight = INFO_CATEGORIES.get(section, {"weight": 1})["weight"]
+            for kw in section_hits[section]:
+                weights.setdefault(kw, weight)
+
+        with span("job_search"):
+            rows = len(self._by_row)
+            jd_weight, live, categories = self._row_arrays()
+            keyword_rows, keyword_weights, extra_rows = [], [], []
+            for kw, weight in weights.items():
+                hit_rows = self._keyword_rows.get(kw)
+                if hit_rows:
+                    keyword_rows.extend(hit_rows)
+                    keyword_weights.extend([weight] * len(hit_rows))
+                extra_rows.extend(self._extra_rows.get(kw, ()))
+            keyword_rows = np.asarray(keyword_rows, dtype=np.int64)
+            keyword_weights = np.asarray(keyword_weights, dtype=np.float64)
+
+            # same arithmetic as score_sections: a matched database keyword weighs its resume
+            # section on both sides, a matched extra keyword weighs SKILLS on both sides
+            matched = np.bincount(keyword_rows, weights=keyword_weights, minlength=rows)
+            matched += skills_wgt * np.bincount(np.asarray(extra_rows, dtype=np.int64), minlength=rows)
+            jd_weight = jd_weight - np.bincount(keyword_rows, weights=skills_wgt - keyword_weights, minlength=rows)
+            keyword_score = matched / np.maximum(jd_weight, 1)
+
+            semantic = np.zeros(rows, dtype=np.float64)
+            norm = float(np.linalg.norm(resume.vector)) if resume.vector is not None else 0.0
+            vectors = self.vectors[:rows]
+            if norm and len(vectors):
+                semantic[:len(vectors)] = vectors @ (np.asarray(resume.vector, dtype=np.float32) / norm)
+            scores = keyword_score * (0.6 + 0.4 * semantic) * 100
+
+            if category is not None:
+                live = live & (categories == category)
+            scores[~live] = -np.inf
+            k = min(top_k, int(live.sum()))
+            if k <= 0:
+                return []
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+
+        results = []
+        for row in best:
+            posting = self._by_row[row]
+            results.append({
+                "id": posting.id,
+                "title": posting.title,
+                "category": posting.category,
+                "score": round(float(scores[row]), 2),
+                "keyword_score": round(float(keyword_score[row]) * 100, 2),
+                "semantic_score": round(float(semantic[row]) * 100, 2),
+                "matched_keywords": sorted(kw for kw in weights if kw in posting.keywords or kw in posting.extras),
+            })
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "postings": len(self.postings),
+                "rows": len(self._by_row),
+                "dead_rows": len(self._by_row) - len(self.postings),
+                "keywords": len(self._keyword_rows.keys() | self._extra_rows.keys()),
+                "engine": self.engine,
+                "dim": self.dim,
+                "vector_bytes": self._vector_rows() * 4 * self.dim,
+            }
+
+
+_index: Optional[JobIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_job_index() -> JobIndex:
+    """Shared JobIndex over settings.JOB_INDEX_DIR, loaded on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = JobIndex(settings.JOB_INDEX_DIR)
+    return _index
+
+
+def main(argv=None) -> int:
+    from src.backend.services.bulk import _read_document, iter_records
+    from src.backend.services.keyword_catalogue import keyword_catalogue
+    from src.backend.services.scoring import build_document_profile
+
+    parser = argparse.ArgumentParser(description="Job posting index for reverse search")
+    parser.add_argument("--index", default=settings.JOB_INDEX_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="add or replace postings (directories, PDF/text files or NDJSON)")
+    add.add_argument("inputs", nargs="+")
+    add.add_argument("--category", required=True, choices=keyword_catalogue.categories())
+    add.add_argument("--batch-size", type=int, default=64)
+
+    remove = sub.add_parser("remove", help="remove postings by id")
+    remove.add_argument("ids", nargs="+")
+
+    search = sub.add_parser("search", help="best postings for a resume")
+    search.add_argument("resume")
+    search.add_argument("--top-k", type=int, default=10)
+    search.add_argument("--category", default=None)
+
+    sub.add_parser("compact", help="rewrite the index without removed postings")
+    sub.add_parser("stats", help="print index statistics")
+
+    args = parser.parse_args(argv)
+    index = JobIndex(args.index)
+
+    if args.command == "add":
+        added = 0
+        batch: List[Tuple[str, str]] = []
+        for posting_id, path, text in iter_records(args.inputs):
+            if text is None and path is None:
+                continue
+            batch.append((posting_id, text if text is not None else _read_document(path)))
+            if len(batch) == args.batch_size:
+                added += _add_batch(index, batch, args.category)
+                batch = []
+        added += _add_batch(index, batch, args.category)
+        print(f"Added {added} postings, {len(index.postings)} in the index.")
+    elif args.command == "remove":
+        removed = sum(index.remove(posting_id) for posting_id in args.ids)
+        print(f"Removed {removed} postings, {len(index.postings)} in the index.")
+    elif args.command == "search":
+        resume = build_document_profile(_read_document(args.resume))
+        for result in index.search(resume, args.top_k, args.category):
+            print(json.dumps(result, ensure_ascii=False))
+    elif args.command == "compact":
+        print(f"Reclaimed {index.compact()} rows.")
+    else:
+        print(json.dumps(index.stats(), indent=2))
+    return 0
+
+
+def _add_batch(index: JobIndex, batch: List[Tuple[str, str]], category: str) -> int:
+    from src.backend.services.scoring import build_document_profiles
+
+    batch = [(posting_id, text) for posting_id, text in batch if text.strip()]
+    if not batch:
+        return 0
+    documents = build_document_profiles([text for _, text in batch])
+    return index.add_many((posting_id, category, posting_id, document)
+                          for (posting_id, _), document in zip(batch, documents))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
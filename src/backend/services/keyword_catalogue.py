@@ -0,0 +1,214 @@
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple
+
+from src.backend.core.config import settings
+from src.backend.services.catalogue_artifact import CatalogueArtifact
+from src.backend.services.keyword_matcher import KeywordMatcher, tokenize
+
+logger = logging.getLogger(__name__)
+
+FILE_PREFIX = "keywords_"
+FILE_SUFFIX = ".json"
+
+
+@dataclass(frozen=True)
+class CategoryKeywords:
+    """Immutable, preprocessed keyword list for one job category."""
+    name: str
+    keywords: Sequence[str]  # lowercased, in file order (a tuple, or a view over the artifact)
+    keyword_set: AbstractSet[str]
+    tokens: Mapping[str, Tuple[str, ...]]  # keyword -> tokenize(keyword)
+    matcher: KeywordMatcher
+    mtime: float
+
+
+EMPTY_CATEGORY = CategoryKeywords(
+    name="",
+    keywords=(),
+    keyword_set=frozenset(),
+    tokens=MappingProxyType({}),
+    matcher=KeywordMatcher(()),
+    mtime=0.0,
+)
+
+
+def build_category(name: str, keywords, mtime: float = 0.0) -> CategoryKeywords:
+    """Preprocess a raw keyword list into a CategoryKeywords entry."""
+    lowered = tuple(kw.lower() for kw in keywords)
+    return CategoryKeywords(
+        name=name,
+        keywords=lowered,
+        keyword_set=frozenset(lowered),
+        tokens=MappingProxyType({kw: tuple(tokenize(kw)) for kw in lowered}),
+        matcher=KeywordMatcher(lowered),
+        mtime=mtime,
+    )
+
+
+@dataclass(frozen=True)
+class KeywordUnion:
+    """Keywords of several categories behind one matcher, each tagged with the categories that list it."""
+    entries: Tuple[CategoryKeywords, ...]
+    tags: Mapping[str, FrozenSet[str]]  # keyword -> names of the categories that list it
+    matcher: KeywordMatcher
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return tuple(entry.name for entry in self.entries)
+
+
+def build_union(entries: Iterable[CategoryKeywords]) -> KeywordUnion:
+    """Merge category entries into one tagged keyword index."""
+    entries = tuple(entries)
+    tags: Dict[str, set] = {}
+    for entry in entries:
+        for kw in entry.keywords:
+            tags.setdefault(kw, set()).add(entry.name)
+    return KeywordUnion(
+        entries=entries,
+        tags=MappingProxyType({kw: frozenset(names) for kw, names in tags.items()}),
+        matcher=KeywordMatcher(tags),
+    )
+
+
+class KeywordCatalogue:
+    """
+    Process-wide cache of the keywords_<category>.json files.
+
+    Every category is loaded once, and a category is only re-read when its
+    file's mtime changes. The mtime itself is checked at most once every
+    `check_interval` seconds, so steady-state lookups never touch the disk.
+
+    Categories whose file is unchanged since the compiled artifact was built
+    are taken from the mmapped artifact instead of being parsed and compiled.
+    """
+
+    def __init__(self, data_dir: str, check_interval: float = 5.0, artifact_path: Optional[str] = None):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self.artifact_path = artifact_path
+        self._artifact: Optional[CatalogueArtifact] = None
+        self._entries: Dict[str, CategoryKeywords] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._unions: Dict[Tuple[str, ...], KeywordUnion] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.disk_reads = 0
+        self.artifact_reads = 0
+
+    def _path(self, category: str) -> str:
+        return os.path.join(self.data_dir, f"{FILE_PREFIX}{category}{FILE_SUFFIX}")
+
+    def _read(self, category: str, mtime: float) -> CategoryKeywords:
+        artifact = self._artifact
+        if artifact is not None and artifact.sources.get(category) == mtime:
+            self.artifact_reads += 1
+            return artifact.category(category)
+        self.disk_reads += 1
+        with open(self._path(category), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return build_category(category, data, mtime)
+
+    def load_all(self) -> None:
+        """Discover and load every category file in the data directory."""
+        with self._lock:
+            self._artifact = None
+            if self.artifact_path and os.path.exists(self.artifact_path):
+                try:
+                    self._artifact = CatalogueArtifact(self.artifact_path)
+                except Exception as e:
+                    logger.error("Error loading keyword artifact '%s': %s", self.artifact_path, e)
+            for filename in sorted(os.listdir(self.data_dir)):
+                if filename.startswith(FILE_PREFIX) and filename.endswith(FILE_SUFFIX):
+                    category = filename[len(FILE_PREFIX):-len(FILE_SUFFIX)]
+                    try:
+                        mtime = os.path.getmtime(self._path(category))
+                        self._entries[category] = self._read(category, mtime)
+                        self._checked_at[category] = time.monotonic()
+                    except Exception as e:
+                        logger.error("Error loading keywords for '%s': %s", category, e)
+            self._loaded = True
+
+    @property
+    def loaded(self) -> bool:
+        """Whether load_all has run (in this process or, for forked workers, the parent)."""
+        return self._loaded
+
+    def categories(self) -> Tuple[str, ...]:
+        if not self._loaded:
+            self.load_all()
+        return tuple(sorted(self._entries))
+
+    def get(self, category: str) -> CategoryKeywords:
+        """Return the cached keywords for a category, reloading if its file changed."""
+        if not self._loaded:
+            self.load_all()
+        entry = self._entries.get(category)
+        if entry is None:
+            # unknown categories are never looked up on disk, only load_all() discovers files
+            self.misses += 1
+            return EMPTY_CATEGORY
+
+        now = time.monotonic()
+        if now - self._checked_at.get(category, 0.0) < self.check_interval:
+            self.hits += 1
+            return entry
+
+        with self._lock:
+            entry = self._entries[category]
+            self._checked_at[category] = now
+            try:
+                mtime = os.path.getmtime(self._path(category))
+                if mtime != entry.mtime:
+                    entry = self._read(category, mtime)
+                    self._entries[category] = entry
+                    self.reloads += 1
+                    return entry
+            except Exception as e:
+                logger.error("Error reloading keywords for '%s': %s", category, e)
+        self.hits += 1
+        return entry
+
+    def union(self, categories: Optional[Iterable[str]] = None) -> KeywordUnion:
+        """
+        Tagged keyword index over `categories` (default: every category; unknown
+        names are ignored). Cached, and rebuilt when one of the categories is reloaded.
+        """
+        names = tuple(sorted(set(categories))) if categories is not None else self.categories()
+        if not self._loaded:
+            self.load_all()
+        entries = tuple(self.get(name) for name in names if name in self._entries)
+        union = self._unions.get(names)
+        if union is None or union.entries != entries:
+            artifact = self._artifact
+            if artifact is not None and all(getattr(entry.matcher, "artifact", None) is artifact for entry in entries):
+                union = artifact.union(entries)
+            else:
+                union = build_union(entries)
+            with self._lock:
+                self._unions[names] = union
+        return union
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "categories": len(self._entries),
+            "unions": len(self._unions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "disk_reads": self.disk_reads,
+            "artifact_reads": self.artifact_reads,
+            "artifact": self._artifact.stats() if self._artifact is not None else None,
+        }
+
+
+keyword_catalogue = KeywordCatalogue(settings.KEYWORD_DATA_DIR, settings.KEYWORD_CHECK_INTERVAL, settings.KEYWORD_ARTIFACT)
@@ -0,0 +1,146 @@
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, whitespace tokenization with punctuation stripped."""
+    return [
+        re.sub(r"[^a-zA-Z0-9]", "", t)
+        for t in text.lower().split()
+        if re.sub(r"[^a-zA-Z0-9]", "", t)
+    ]
+
+
+# whitespace-delimited words with two ASCII capitals, or any non-ASCII character
+# (those are re-checked with str.isupper, so É, Ä, ... count like the legacy loop)
+_EXTRA_CANDIDATE = re.compile(r"(?<!\S)(?=\S*?[A-Z]\S*?[A-Z]|\S*?[^\s\x00-\x7f])\S+")
+
+
+def find_extra_keywords(text: str) -> List[str]:
+    """
+    Words with at least two uppercase letters (acronyms, product names) found in
+    one regex pass, lowercased and deduplicated in order of first appearance.
+    """
+    words = (w for w in _EXTRA_CANDIDATE.findall(text) if w.isascii() or sum(map(str.isupper, w)) >= 2)
+    return list(dict.fromkeys(w.lower() for w in words))
+
+
+class TokenIndex:
+    """
+    Positional inverted index over a token list (token -> sorted positions).
+    Multi-token keywords are found by anchoring on their rarest token.
+    """
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.positions: Dict[str, List[int]] = {}
+        for pos, token in enumerate(tokens):
+            self.positions.setdefault(token, []).append(pos)
+
+    def occurrences(self, keyword_tokens: List[str]) -> List[int]:
+        """Every start index where keyword_tokens appear in tokens, in order."""
+        k = len(keyword_tokens)
+        if k == 0:
+            return list(range(len(self.tokens) + 1)) # an empty keyword matches everywhere
+        anchor = min(range(k), key=lambda j: len(self.positions.get(keyword_tokens[j], ())))
+        tokens = self.tokens
+        starts = []
+        for pos in self.positions.get(keyword_tokens[anchor], ()):
+            start = pos - anchor
+            if start >= 0 and start + k <= len(tokens) and all(
+                    tokens[start + j] == keyword_tokens[j] for j in range(k) if j != anchor):
+                starts.append(start)
+        return starts
+
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as `\\w` in Python's `re`."""
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a keyword list.
+
+    Finds every keyword occurrence in a single linear pass over the text and
+    applies the same word boundary rules as the `\\bkeyword\\b` regex it replaces.
+    With word_boundaries=False it reports plain substring matches instead.
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = True):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self.word_boundaries = word_boundaries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._patterns: List[str] = []
+
+        for idx, kw in enumerate(self.keywords):
+            pattern = kw.lower()
+            self._patterns.append(pattern)
+            if pattern:
+                self._add(pattern, idx)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, idx: int) -> None:
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(idx)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                # inherit matches that end at the failure state (suffix keywords)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, keyword index) for every bounded match in already lowercased text."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        bounded = self.word_boundaries
+        text_len = len(text)
+        state = 0
+        for pos, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = pos + 1
+            for idx in out[state]:
+                pattern = patterns[idx]
+                start = end - len(pattern)
+                if not bounded:
+                    yield start, end, idx
+                    continue
+                before = start > 0 and _is_word_char(text[start - 1])
+                after = end < text_len and _is_word_char(text[end])
+                if before == _is_word_char(pattern[0]) or after == _is_word_char(pattern[-1]):
+                    continue
+                yield start, end, idx
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the set of keywords found in lowercased text."""
+        return {self.keywords[idx] for _, _, idx in self.iter_matches(text)}
+
+
+@lru_cache(maxsize=32)
+def compile_keywords(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Build (or reuse) the matcher for a keyword tuple."""
+    return KeywordMatcher(keywords)
@@ -0,0 +1,115 @@
+import logging
+import threading
+import numpy as np
+from functools import cached_property
+from typing import Dict, List
+
+from src.backend.core.config import settings
+from src.backend.core.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Only the components noun chunks depend on (tagger + attribute ruler for POS, parser for DEP)
+DISABLED_COMPONENTS = ["ner", "lemmatizer"]
+
+# Loaded on first use (or by warm-up), not at import
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def _load_model():
+    import spacy
+
+    try:
+        return spacy.load(settings.SPACY_MODEL, exclude=DISABLED_COMPONENTS)
+    except OSError:
+        if not settings.SPACY_AUTO_DOWNLOAD:
+            raise
+        logger.warning("Spacy model '%s' not found. Downloading...", settings.SPACY_MODEL)
+        from spacy.cli import download
+        download(settings.SPACY_MODEL)
+        return spacy.load(settings.SPACY_MODEL, exclude=DISABLED_COMPONENTS)
+
+
+def get_nlp():
+    """The shared spaCy pipeline, loaded once on first use; safe to call from several threads."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = _load_model()
+    return _nlp
+
+
+def is_loaded() -> bool:
+    return _nlp is not None
+
+
+class DocumentAnalysis:
+    """
+    Everything the scorer needs from one spaCy parse of a document:
+    noun chunks, tokens and vectors are all derived from the same Doc.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    @cached_property
+    def _chunk_spans(self) -> Dict[str, object]:
+        # first span for every distinct lowercased noun chunk
+        spans = {}
+        for chunk in self.doc.noun_chunks:
+            text = chunk.text.strip().lower()
+            if len(text) > 1 and text not in spans:
+                spans[text] = chunk
+        return spans
+
+    @cached_property
+    def noun_chunks(self) -> List[str]:
+        """Meaningful noun chunks, lowercased and deduplicated."""
+        return list(self._chunk_spans)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercased token texts, whitespace tokens dropped."""
+        return [t.lower_ for t in self.doc if not t.is_space]
+
+    @property
+    def vector(self) -> np.ndarray:
+        """Average word vector of the whole document."""
+        return self.doc.vector
+
+    @cached_property
+    def chunk_vector(self) -> np.ndarray:
+        """
+        Average word vector over the tokens of the distinct noun chunks.
+        Equal to the vector of nlp(" ".join(noun_chunks)) without parsing that string.
+        """
+        vectors = self.doc.vocab.vectors
+        keys = [t.lower for span in self._chunk_spans.values() for t in span]
+        if not keys or vectors.size == 0:
+            return np.zeros((vectors.shape[1],), dtype="f")
+        rows = np.asarray(vectors.find(keys=keys))
+        found = rows[rows >= 0]
+        total = np.asarray(vectors.data[found]).sum(axis=0) if len(found) else np.zeros((vectors.shape[1],), dtype="f")
+        return total / len(keys)
+
+
+@timed("spacy_parse")
+def analyse_document(text: str) -> DocumentAnalysis:
+    """Parse text once and wrap the result."""
+    return DocumentAnalysis(get_nlp()(text))
+
+
+@timed("spacy_parse")
+def analyse_documents(texts: List[str], batch_size: int = 32) -> List[DocumentAnalysis]:
+    """Parse many texts with nlp.pipe batching."""
+    return [DocumentAnalysis(doc) for doc in get_nlp().pipe(texts, batch_size=batch_size)]
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity, 0.0 when either vector is empty (matches Doc.similarity)."""
+    norm = float(np.linalg.norm(a)) * float(np.linalg.norm(b))
+    if norm == 0:
+        return 0.0
+    return float(np.dot(a, b) / norm)
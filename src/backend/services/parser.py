@@ -1,14 +1,150 @@
-from pdfminer.high_level import extract_text
-import re
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from dataclasses import dataclass, field
+from contextlib import nullcontext
+from typing import BinaryIO, Dict, List, Tuple, Union
+from src.backend.core.config import settings
+from src.backend.core.metrics import timed
+import io
+import logging
+import threading
+import time
+import zipfile
 
-def extract_pdf_text(file_path: str) -> str:
-    """Extract text from a PDF file."""
+try:
+    import resource # not available on Windows
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PageStats:
+    page: int
+    ms: float
+    chars: int
+    rss_growth_kb: int # growth of the process' peak RSS while this page was processed
+
+@dataclass
+class PdfExtraction:
+    text: str
+    pages: List[PageStats] = field(default_factory=list)
+    truncated: bool = False # stopped early because of max_pages / max_chars
+
+def _peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+@timed("pdf_extraction")
+def extract_pdf(pdf_file: Union[str, BinaryIO, bytes], max_pages: int = 0, max_chars: int = 0) -> PdfExtraction:
+    """
+    Extract text from a PDF path, binary file object or raw bytes, page by page.
+    Pages are parsed lazily and extraction stops once max_pages or max_chars is reached (0 = no limit).
+    """
+    if isinstance(pdf_file, (bytes, bytearray)):
+        pdf_file = io.BytesIO(pdf_file)
+    result = PdfExtraction(text="")
     try:
-        return extract_text(file_path)
+        # only close the file if we opened it
+        with (open(pdf_file, "rb") if isinstance(pdf_file, str) else nullcontext(pdf_file)) as fp, io.StringIO() as output:
+            rsrcmgr = PDFResourceManager(caching=True)
+            device = TextConverter(rsrcmgr, output, laparams=LAParams())
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+            for page_no, page in enumerate(PDFPage.get_pages(fp, caching=True), start=1):
+                if max_pages and page_no > max_pages:
+                    result.truncated = True
+                    break
+                start, chars_before, rss_before = time.perf_counter(), output.tell(), _peak_rss_kb()
+                interpreter.process_page(page)
+                result.pages.append(PageStats(
+                    page=page_no,
+                    ms=(time.perf_counter() - start) * 1000,
+                    chars=output.tell() - chars_before,
+                    rss_growth_kb=_peak_rss_kb() - rss_before,
+                ))
+                if max_chars and output.tell() >= max_chars:
+                    result.truncated = True
+                    break
+
+            text = output.getvalue()
+            result.text = text[:max_chars] if max_chars else text
     except Exception as e:
-        print(f"Error extracting PDF: {e}")
-        return ""
+        logger.error("Error extracting PDF: %s", e)
+    return result
+
+def extract_pdf_text(file_path) -> str:
+    """Extract text from a PDF file path, binary file object or bytes."""
+    return extract_pdf(file_path).text
+
+def extract_upload_pdf(content: bytes) -> PdfExtraction:
+    """Extract an uploaded PDF from memory with the configured page/character limits."""
+    return extract_pdf(content, max_pages=settings.PDF_MAX_PAGES, max_chars=settings.PDF_MAX_CHARS)
+
+class PdfStats:
+    """Running per-page extraction totals for the extractions this process has seen."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.truncated = 0
+        self.pages = 0
+        self.total_ms = 0.0
+        self.max_page_ms = 0.0
+        self.max_page_rss_growth_kb = 0
+
+    def record(self, extraction: PdfExtraction) -> None:
+        with self._lock:
+            self.documents += 1
+            self.truncated += int(extraction.truncated)
+            for page in extraction.pages:
+                self.pages += 1
+                self.total_ms += page.ms
+                self.max_page_ms = max(self.max_page_ms, page.ms)
+                self.max_page_rss_growth_kb = max(self.max_page_rss_growth_kb, page.rss_growth_kb)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "documents": self.documents,
+            "truncated": self.truncated,
+            "pages": self.pages,
+            "avg_page_ms": round(self.total_ms / self.pages, 3) if self.pages else 0.0,
+            "max_page_ms": round(self.max_page_ms, 3),
+            "max_page_rss_growth_kb": self.max_page_rss_growth_kb,
+        }
+
+pdf_stats = PdfStats()
 
 def preprocess_text(text: str) -> str:
     """Basic text preprocessing."""
     return text.lower()
+
+def document_text(filename: str, content: bytes) -> str:
+    """Text of an uploaded document: PDFs are extracted, anything else is read as UTF-8 text."""
+    if filename.lower().endswith(".pdf"):
+        return extract_upload_pdf(content).text
+    return content.decode("utf-8", errors="ignore")
+
+def document_texts(files: List[Tuple[str, bytes]]) -> List[str]:
+    """document_text for several (filename, content) pairs, e.g. one chunk of a batch."""
+    return [document_text(name, content) for name, content in files]
+
+def zip_members(content: bytes) -> List[Tuple[str, bytes]]:
+    """(filename, content) for every PDF/text file in a zip archive, not yet extracted."""
+    members = []
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or not name.lower().endswith((".pdf", ".txt")):
+                continue
+            if info.file_size > settings.UPLOAD_MAX_BYTES:
+                logger.warning("Skipping '%s' in archive: larger than %d bytes", name, settings.UPLOAD_MAX_BYTES)
+                continue
+            members.append((name, archive.read(info)))
+    return members
+
+def zip_documents(content: bytes) -> List[Tuple[str, str]]:
+    """(filename, text) for every PDF/text file in a zip archive."""
+    members = zip_members(content)
+    return list(zip((name for name, _ in members), document_texts(members)))
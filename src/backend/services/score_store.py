@@ -0,0 +1,320 @@
+"""
+Stored scoring results that are brought up to date incrementally.
+
+Every stored result is derived from intermediates that are stored too, each
+with its own dependency:
+
+    document profile (sections, tokens, vector)  <- document text, semantic engine
+    keyword hits (keyword -> found in text, sections)  <- document text, that one keyword
+    result  <- resume key, JD key, category keyword list (fingerprinted), semantic engine
+
+When a keywords_<category>.json file changes, `sync` finds the results whose
+fingerprint no longer matches and recomputes them from the stored profiles.
+Only keywords a document has never been matched against are matched: the
+catalogue diff for an edited category, the new JD's keywords for an edited
+posting. Nothing is re-extracted or re-parsed, and because a keyword's hits do
+not depend on the other keywords, the results equal a full recompute.
+Results are keyword and semantic scores, without the AI blend.
+
+Document profiles and hits are stored as pickles tagged with FORMAT_VERSION,
+next to the document text. A row written by another format version (or one
+that no longer unpickles) is rebuilt from its text on first use.
+
+    python -m src.backend.services.score_store job backend-dev --category engineering --jd jd.pdf
+    python -m src.backend.services.score_store resumes backend-dev resumes/
+    python -m src.backend.services.score_store sync   # after editing a keyword file
+    python -m src.backend.services.score_store results backend-dev --top-k 10
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.backend.core.config import settings
+from src.backend.services.document_cache import DocumentProfile, document_cache
+from src.backend.services.keyword_catalogue import keyword_catalogue
+from src.backend.services.keyword_matcher import KeywordMatcher, find_extra_keywords
+from src.backend.services.sections import SECTION_ORDER
+
+Hits = Dict[str, Tuple[bool, Tuple[str, ...]]] # keyword -> (in the full text, sections containing it)
+
+# Bump when DocumentProfile (or anything it pickles) or the Hits layout changes
+FORMAT_VERSION = 1
+
+
+def catalogue_fingerprint(category: str) -> str:
+    """Changes whenever the category's keyword list (or its order) changes."""
+    keywords = keyword_catalogue.get(category).keywords
+    return hashlib.sha256("\n".join(keywords).encode("utf-8")).hexdigest()[:16]
+
+
+class ScoreStore:
+    """SQLite-backed results, document profiles and keyword hits, with staleness tracking."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS documents (key TEXT PRIMARY KEY, version INTEGER NOT NULL, "
+                         "text TEXT NOT NULL, profile BLOB NOT NULL, hits BLOB NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, category TEXT NOT NULL, doc_key TEXT NOT NULL)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results (job_id TEXT NOT NULL, resume_id TEXT NOT NULL, doc_key TEXT NOT NULL, "
+            "fingerprint TEXT NOT NULL, result TEXT NOT NULL, PRIMARY KEY (job_id, resume_id))"
+        )
+        self._documents: Dict[str, Tuple[DocumentProfile, Hits]] = {}
+        self._dirty: set = set()
+        self.documents_parsed = 0
+        self.documents_rebuilt = 0 # stored in another format version
+        self.keywords_matched = 0 # keyword x document matches actually run
+        self.results_computed = 0
+        self.results_current = 0 # stale checks that needed no work
+
+    # -- documents and keyword hits
+
+    @staticmethod
+    def document_key(text: str) -> str:
+        return document_cache.key("text", text.encode("utf-8"), settings.SEMANTIC_ENGINE)
+
+    def _current_keys(self, keys: List[str]) -> List[str]:
+        """Keys of the same documents under the current semantic engine, parsing those stored under another."""
+        prefix = self.document_key("").rsplit(":", 1)[0] + ":"
+        stale = [key for key in dict.fromkeys(keys) if not key.startswith(prefix)]
+        if not stale:
+            return keys
+        texts = [self._db.execute("SELECT text FROM documents WHERE key = ?", (key,)).fetchone()[0] for key in stale]
+        rekeyed = dict(zip(stale, self.documents(texts)))
+        return [rekeyed.get(key, key) for key in keys]
+
+    def _load(self, key: str) -> Optional[Tuple[DocumentProfile, Hits]]:
+        entry = self._documents.get(key)
+        if entry is None:
+            row = self._db.execute("SELECT version, text, profile, hits FROM documents WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = self._documents[key] = self._unpickle(key, *row)
+        return entry
+
+    def _unpickle(self, key: str, version: int, text: str, profile: bytes, hits: bytes) -> Tuple[DocumentProfile, Hits]:
+        if version == FORMAT_VERSION:
+            try:
+                return pickle.loads(profile), pickle.loads(hits)
+            except Exception: # classes moved or changed without a version bump
+                pass
+        from src.backend.services.scoring import build_document_profile
+
+        self.documents_rebuilt += 1
+        self._dirty.add(key)
+        return build_document_profile(text), {}
+
+    def documents(self, texts: List[str]) -> List[str]:
+        """Keys of the stored documents for texts, parsing (in one batch) only the ones never seen."""
+        from src.backend.services.scoring import build_document_profiles
+
+        keys = [self.document_key(text) for text in texts]
+        missing = {key: text for key, text in zip(keys, texts) if self._load(key) is None}
+        if missing:
+            for key, profile in zip(missing, build_document_profiles(list(missing.values()))):
+                self._documents[key] = (profile, {})
+                self._dirty.add(key)
+            self.documents_parsed += len(missing)
+        return keys
+
+    def hits(self, key: str, keywords: Iterable[str]) -> Hits:
+        """Keyword hits of a stored document, matching only the keywords it was never matched against."""
+        profile, hits = self._load(key)
+        missing = sorted({kw for kw in keywords if kw not in hits})
+        if missing:
+            matcher = KeywordMatcher(missing)
+            in_text = matcher.find_all(profile.text.lower())
+            sections = profile.sections.find_all(matcher)
+            for kw in missing:
+                hits[kw] = (kw in in_text, tuple(s for s in SECTION_ORDER if kw in sections[s]))
+            self.keywords_matched += len(missing)
+            self._dirty.add(key)
+        return hits
+
+    def _flush(self) -> None:
+        for key in self._dirty:
+            profile, hits = self._documents[key]
+            self._db.execute("INSERT OR REPLACE INTO documents (key, version, text, profile, hits) VALUES (?, ?, ?, ?, ?)",
+                             (key, FORMAT_VERSION, profile.text, pickle.dumps(profile), pickle.dumps(hits)))
+        self._dirty.clear()
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN ... COMMIT, rolled back if anything in between raises so the connection stays usable."""
+        self._db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            self._dirty.update(self._documents) # their rows may have been part of the rolled back writes
+            raise
+        self._db.execute("COMMIT")
+
+    # -- scoring
+
+    @staticmethod
+    def _fingerprint_tail(job_key: str, category: str) -> str:
+        return f"{job_key}|{catalogue_fingerprint(category)}|{settings.SEMANTIC_ENGINE}"
+
+    def _job(self, job_key: str, category: str):
+        """JobProfile rebuilt from the stored JD profile and its keyword hits."""
+        from src.backend.services.scoring import JobProfile
+
+        catalogue = keyword_catalogue.get(category)
+        profile, _ = self._load(job_key)
+        hits = self.hits(job_key, catalogue.keywords)
+        jd_hits = {kw for kw in catalogue.keywords if hits[kw][0]}
+        return JobProfile(profile.text, catalogue.keywords, catalogue.matcher, profile,
+                          jd_hits=jd_hits, extra_keywords=find_extra_keywords(profile.text))
+
+    def _score(self, job, resume_key: str) -> Dict[str, Any]:
+        from src.backend.services.scoring import score_profile
+
+        profile, _ = self._load(resume_key)
+        hits = self.hits(resume_key, job.resume_keywords)
+        section_hits = {section: set() for section in SECTION_ORDER}
+        for kw in job.resume_keywords:
+            for section in hits[kw][1]:
+                section_hits[section].add(kw)
+        score, keyword_score, _, section_scores, density, matched, missing, semantic = score_profile(
+            profile, job, section_hits=section_hits)
+        self.results_computed += 1
+        return {
+            "score": score,
+            "keyword_score": keyword_score,
+            "semantic_score": semantic,
+            "density": density,
+            "section_scores": section_scores,
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+        }
+
+    def put_job(self, job_id: str, text: str, category: str) -> int:
+        """Add or edit a posting; its stored results are brought up to date. Returns the number recomputed."""
+        job_key, = self.documents([text])
+        self._db.execute("INSERT OR REPLACE INTO jobs (id, category, doc_key) VALUES (?, ?, ?)", (job_id, category, job_key))
+        return self.sync(job_id)
+
+    def put_resumes(self, job_id: str, resumes: List[Tuple[str, str]]) -> int:
+        """Score (resume id, text) pairs against a stored posting and store the results."""
+        row = self._db.execute("SELECT category, doc_key FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        category, job_key = row
+        with self._transaction():
+            job_key, = self._current_keys([job_key])
+            self._db.execute("UPDATE jobs SET doc_key = ? WHERE id = ?", (job_key, job_id))
+            job = self._job(job_key, category)
+            fingerprint_tail = self._fingerprint_tail(job_key, category)
+            keys = self.documents([text for _, text in resumes])
+            for (resume_id, _), key in zip(resumes, keys):
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (job_id, resume_id, doc_key, fingerprint, result) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, resume_id, key, f"{key}|{fingerprint_tail}", json.dumps(self._score(job, key))))
+            self._flush()
+        return len(resumes)
+
+    def sync(self, job_id: Optional[str] = None) -> int:
+        """Recompute the results (of one posting, or all) whose inputs changed. Returns the number recomputed."""
+        query = "SELECT id, category, doc_key FROM jobs" + (" WHERE id = ?" if job_id is not None else "")
+        recomputed = 0
+        with self._transaction():
+            for job_id, category, job_key in self._db.execute(query, (job_id,) if job_id is not None else ()).fetchall():
+                # documents stored under another semantic engine are re-parsed (once) under the current one
+                current_job_key, = self._current_keys([job_key])
+                if current_job_key != job_key:
+                    self._db.execute("UPDATE jobs SET doc_key = ? WHERE id = ?", (current_job_key, job_id))
+                fingerprint_tail = self._fingerprint_tail(current_job_key, category)
+                job = None
+                rows = self._db.execute("SELECT resume_id, doc_key, fingerprint FROM results WHERE job_id = ?", (job_id,)).fetchall()
+                keys = self._current_keys([key for _, key, _ in rows])
+                for (resume_id, _, fingerprint), key in zip(rows, keys):
+                    if fingerprint == f"{key}|{fingerprint_tail}":
+                        self.results_current += 1
+                        continue
+                    job = job or self._job(current_job_key, category)
+                    self._db.execute("UPDATE results SET doc_key = ?, fingerprint = ?, result = ? WHERE job_id = ? AND resume_id = ?",
+                                     (key, f"{key}|{fingerprint_tail}", json.dumps(self._score(job, key)), job_id, resume_id))
+                    recomputed += 1
+            self._flush()
+        return recomputed
+
+    def results(self, job_id: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored results of a posting, best first."""
+        rows = self._db.execute("SELECT resume_id, result FROM results WHERE job_id = ?", (job_id,)).fetchall()
+        results = sorted(({"id": resume_id, **json.loads(result)} for resume_id, result in rows),
+                         key=lambda result: result["score"], reverse=True)
+        return results[:top_k] if top_k else results
+
+    def stats(self) -> Dict[str, Any]:
+        count = lambda table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return {
+            "jobs": count("jobs"),
+            "results": count("results"),
+            "documents": count("documents"),
+            "documents_parsed": self.documents_parsed,
+            "documents_rebuilt": self.documents_rebuilt,
+            "keywords_matched": self.keywords_matched,
+            "results_computed": self.results_computed,
+            "results_current": self.results_current,
+        }
+
+
+def main(argv=None) -> int:
+    from src.backend.services.bulk import _read_document, iter_records
+
+    parser = argparse.ArgumentParser(description="Stored results with incremental re-scoring")
+    parser.add_argument("--db", default=settings.SCORE_STORE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    job = sub.add_parser("job", help="add or edit a posting (its stored results are updated)")
+    job.add_argument("job_id")
+    job.add_argument("--jd", required=True, help="job description (PDF or text file)")
+    job.add_argument("--category", required=True, choices=keyword_catalogue.categories())
+
+    resumes = sub.add_parser("resumes", help="score resumes against a posting and store the results")
+    resumes.add_argument("job_id")
+    resumes.add_argument("inputs", nargs="+", help="directories, PDF/text files or NDJSON")
+
+    sub.add_parser("sync", help="recompute results made stale by keyword file changes")
+
+    results = sub.add_parser("results", help="print a posting's stored results as NDJSON")
+    results.add_argument("job_id")
+    results.add_argument("--top-k", type=int, default=None)
+
+    sub.add_parser("stats", help="print store statistics")
+
+    args = parser.parse_args(argv)
+    store = ScoreStore(args.db)
+
+    if args.command == "job":
+        recomputed = store.put_job(args.job_id, _read_document(args.jd), args.category)
+        print(f"Stored '{args.job_id}', {recomputed} results recomputed.")
+    elif args.command == "resumes":
+        items = [(record_id, text if text is not None else _read_document(path))
+                 for record_id, path, text in iter_records(args.inputs) if path is not None or text is not None]
+        try:
+            count = store.put_resumes(args.job_id, [(record_id, text) for record_id, text in items if text.strip()])
+        except KeyError:
+            print(f"Unknown job '{args.job_id}', add it with the `job` command first.", file=sys.stderr)
+            return 1
+        print(f"Stored {count} results.")
+    elif args.command == "sync":
+        print(f"{store.sync()} results recomputed.")
+    elif args.command == "results":
+        for result in store.results(args.job_id, args.top_k):
+            print(json.dumps(result, ensure_ascii=False))
+    if args.command != "results":
+        print(json.dumps(store.stats()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,93 +1,42 @@
-import spacy
-import json
-import numpy as np
-import re
-from pathlib import Path
-from collections import Counter
-from typing import List, Dict, Tuple, Any, Optional
-
-# Load spacy model
-try:
-    nlp = spacy.load("en_core_web_md")
-except OSError:
-    print("Spacy model 'en_core_web_md' not found. Downloading...")
-    from spacy.cli import download
-    download("en_core_web_md")
-    nlp = spacy.load("en_core_web_md")
-
-# Section definitions
-INFO_CATEGORIES = {
-    "SKILLS": {
-        "weight": 4,
-        "headers": ["skills", "technologies", "expertise", "proficiencies", "languages", "tools", "interest"]},
-    "EXPERIENCE": {
-        "weight": 3,
-        "headers": ["experience", "employment", "projects", "work history", "responsibilities"]},
-    "EDUCATION": {
-        "weight": 2,
-        "headers": ["education", "enrolled", "academic", "degree", "certification", "qualification", "post-secondary", "bachelor", "master", "doctorate", "phd"]},
-    "OTHER": {
-        "weight": 1,
-        "headers": []},
-}
+import logging
+from functools import cached_property
+from typing import List, Dict, Tuple, Optional
+from src.backend.services.keyword_matcher import KeywordMatcher, TokenIndex, compile_keywords, find_extra_keywords, tokenize
+from src.backend.services.keyword_catalogue import keyword_catalogue
+from src.backend.services.nlp import DocumentAnalysis, analyse_document, analyse_documents, cosine_similarity, get_nlp
+from src.backend.services.semantic import content_tokens, get_vector_table
+from src.backend.services.document_cache import DocumentProfile
+from src.backend.services.skill_matcher import match_skills
+from src.backend.services.sections import INFO_CATEGORIES, SECTION_ORDER, ResumeSections, segment_sections
+from src.backend.core.config import settings
+from src.backend.core.metrics import span, timed
+
+logger = logging.getLogger(__name__)
 
 def get_keywords_list(category: str) -> List[str]:
-    """Load curated skills JSON based on job category."""
-    try:
-        skills_path = Path(f"src/frontend/static/data/keywords_{category}.json") 
-        if not skills_path.exists():
-             skills_path = Path(f"app/assets/keywords_{category}.json")
-
-        if skills_path.exists():
-            with open(skills_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return [s.lower() for s in data]
-        return []
-    except Exception:
-        return []
-
-def segment_sections(text: str) -> Dict[str, str]:
-    """Roughly segment text into sections based on common resume/JD headers"""
-    sections = {"EXPERIENCE": "", "EDUCATION": "", "SKILLS": "", "OTHER": ""}
-    current_section = "OTHER" # by default
-    lines = text.splitlines()
-
-    for line in lines:
-        line = line.strip()
-        found = False
-        for section, info in INFO_CATEGORIES.items():
-            if (len(line.split()) < 5) and any(h in line.lower() for h in info["headers"]):
-                current_section = section
-                found = True
-                break
-        if not found:
-            if sections[current_section] == "": sections[current_section] = line
-            else: sections[current_section] += "%nl%" + line
-    return sections
+    """Curated skills for a job category, served from the keyword catalogue cache."""
+    return list(keyword_catalogue.get(category).keywords)
 
 def extract_keywords(text: str) -> List[str]:
     """Extract meaningful noun chunks and keywords, no stop words."""
-    doc = nlp(text)
-    chunks = [chunk.text.strip().lower() for chunk in doc.noun_chunks if len(chunk.text.strip()) > 1]
-    return list(set(chunks))
+    return analyse_document(text).noun_chunks
 
 def semantic_match_score(resume_tokens: List[str], jd_tokens: List[str]) -> float:
     """Compute semantic similarity between resume and JD tokens."""
     if not resume_tokens or not jd_tokens:
         return 0.0
 
+    nlp = get_nlp()
     resume_doc = nlp(" ".join(resume_tokens))
     jd_doc = nlp(" ".join(jd_tokens))
     similarity = resume_doc.similarity(jd_doc)
     return similarity
 
-def tokenize(text: str) -> List[str]:
-    """Lowercase, whitespace tokenization with punctuation stripped."""
-    return [
-        re.sub(r"[^a-zA-Z0-9]", "", t)
-        for t in text.lower().split()
-        if re.sub(r"[^a-zA-Z0-9]", "", t)
-    ]
+def semantic_document_score(resume_doc: DocumentAnalysis, jd_doc: DocumentAnalysis) -> float:
+    """semantic_match_score over already parsed documents, without re-parsing the noun chunks."""
+    if not resume_doc.noun_chunks or not jd_doc.noun_chunks:
+        return 0.0
+    return cosine_similarity(resume_doc.chunk_vector, jd_doc.chunk_vector)
 
 def find_keyword_occurrences(tokens, keyword_tokens):
     """Yield start indices where keyword_tokens appear in tokens."""
@@ -106,71 +55,113 @@ def extract_context(tokens, start_idx, kw_len, window=3):
 
     return before, after
 
-def section_weighted_score(resume_sections, job_text, keywords): 
+class JobProfile:
+    """
+    Resume-independent keyword analysis of a job description.
+    Built once per JD and reused for every resume scored against it.
+    """
+
+    @timed("jd_keywords")
+    def __init__(self, job_text: str, keywords, matcher: Optional[KeywordMatcher] = None,
+                 document: Optional[DocumentProfile] = None,
+                 jd_hits: Optional[set] = None, extra_keywords: Optional[List[str]] = None):
+        self.job_text = job_text
+        self.keywords = keywords
+        self.matcher = matcher if matcher is not None else compile_keywords(tuple(keywords))
+        self.document = document # semantic side of the JD, set by prepare_job
+        self.jd_keywords = {} # dictionary: keyword, weight (before resume matching)
+        self._contexts = {}
+
+        skills_wgt = INFO_CATEGORIES.get("SKILLS", {"weight": 4})["weight"]
+
+        # words with two or more capitals are extra keywords, whether or not they are in the database
+        # (jd_hits and extra_keywords are passed in by prepare_jobs, which scans the JD once for all categories)
+        self.extra_keywords = extra_keywords if extra_keywords is not None else find_extra_keywords(job_text)
+
+        # add all extra_keywords to jd_keywords
+        for kw in self.extra_keywords:
+            self.jd_keywords.update({kw: skills_wgt})
+
+        # one pass over the JD finds every database keyword it contains
+        self.jd_hits = jd_hits if jd_hits is not None else self.matcher.find_all(job_text.lower())
+
+        # add relevant keywords from database to jd_keywords
+        for kw in keywords:
+            if kw in self.jd_hits:
+                self.jd_keywords.update({kw: skills_wgt})
+
+        # only keywords in the JD can match a resume
+        self.resume_keywords = frozenset(self.jd_hits.union(self.extra_keywords))
+
+        self.jd_tokens = document.tokens if document is not None else tokenize(job_text)
+
+    @cached_property
+    def resume_matcher(self) -> KeywordMatcher:
+        """One small automaton over the JD's database and extra keywords, so a resume is scanned once."""
+        return KeywordMatcher(sorted(self.resume_keywords))
+
+    @cached_property
+    def token_index(self) -> TokenIndex:
+        """Positional index over the JD tokens, built on the first context lookup."""
+        return TokenIndex(self.jd_tokens)
+
+    def contexts(self, kw: str) -> List[Tuple[str, str]]:
+        """(before, after) words around every occurrence of kw in the JD, computed once per keyword."""
+        if kw not in self._contexts:
+            kw_tokens = tokenize(kw)
+            self._contexts[kw] = [
+                extract_context(self.jd_tokens, idx, len(kw_tokens))
+                for idx in self.token_index.occurrences(kw_tokens)
+            ]
+        return self._contexts[kw]
+
+    def context(self, kw: str) -> List[str]:
+        """Words around the first occurrence of kw in the JD (["", ""] if it only matched as a substring)."""
+        contexts = self.contexts(kw)
+        return list(contexts[0]) if contexts else ["", ""]
+
+def section_weighted_score(resume_sections: ResumeSections, job_text, keywords, matcher: Optional[KeywordMatcher] = None):
+    return score_sections(resume_sections, JobProfile(job_text, keywords, matcher))
+
+@timed("keyword_matching")
+def score_sections(resume_sections: ResumeSections, job: JobProfile,
+                   section_hits: Optional[Dict[str, set]] = None):
     resume_weight = 0
     jd_weight = 0
     section_scores = [0.0, 0.0, 0.0, 0.0] # others (1), education (2), experience (3), skills (4)
 
     matched_keywords = {} # dictionary: keyword, weight
-    jd_keywords = {} # dictionary: keyword, weight
+    jd_keywords = dict(job.jd_keywords) # dictionary: keyword, weight
     missing_keywords = {} # dictionary: keyword, context
 
     skills_wgt = INFO_CATEGORIES.get("SKILLS", {"weight": 4})["weight"]
-    extra_keywords = []
-
-    # parsing words - classify as extra keywords not found in keyword database
-    for line in job_text.splitlines():
-        for word in line.split():
-            if sum(1 for char in word if char.isupper()) >= 2 and word not in keywords: 
-                extra_keywords.append(word.lower())
-
-    # add all extra_keywords to jd_keywords
-    for kw in extra_keywords:
-        jd_keywords.update({kw: skills_wgt})
-
-    # add relevant keywords from database to jd_keywords
-    for kw in keywords:
-        pattern = r"\b" + re.escape(kw.lower()) + r"\b"
-        if re.search(pattern, job_text.lower()):
-            jd_keywords.update({kw: skills_wgt})
-
-    # build matched keywords dictionary
-    for section, res_text in resume_sections.items():
-        if not res_text.strip():
-            continue
+    jd_hits = job.jd_hits
+    resume_keywords = job.resume_keywords
 
-        weight = INFO_CATEGORIES.get(section, {"weight": 1})["weight"]
+    # one pass over the whole resume, hits are attributed to sections by offset
+    # (score_categories passes in the hits of one pass covering every category)
+    if section_hits is None:
+        section_hits = resume_sections.find_all(job.resume_matcher)
 
-        for kw in keywords:
-            pattern = r"\b" + re.escape(kw.lower()) + r"\b"
-            if re.search(pattern, res_text.lower()) and re.search(pattern, job_text.lower()) and kw not in matched_keywords:
+    # build matched keywords dictionary: database keywords take the weight of the first
+    # section they appear in, extra keywords always count as skills
+    for section in SECTION_ORDER:
+        weight = INFO_CATEGORIES.get(section, {"weight": 1})["weight"]
+        for kw in section_hits[section]:
+            if kw in matched_keywords or kw not in resume_keywords:
+                continue
+            if kw in jd_hits:
                 matched_keywords.update({kw: weight})
-                jd_keywords.update({kw: weight}) 
-        if extra_keywords:
-            for kw in extra_keywords:
-                pattern = r"\b" + re.escape(kw.lower()) + r"\b"
-                if re.search(pattern, res_text.lower()) and kw not in matched_keywords:
-                    matched_keywords.update({kw: skills_wgt})
+                jd_keywords.update({kw: weight})
+            else:
+                matched_keywords.update({kw: skills_wgt})
 
     # build missing keywords dictionary with context extraction
-    jd_tokens = tokenize(job_text)
-
     for kw, wgt in jd_keywords.items():
         if kw in matched_keywords:
             continue
+        missing_keywords[kw] = job.context(kw)
 
-        kw_tokens = tokenize(kw)
-        contexts = []
-
-        for idx in find_keyword_occurrences(jd_tokens, kw_tokens):
-            before, after = extract_context(jd_tokens, idx, len(kw_tokens))
-            contexts.append([before, after])
-
-        if contexts:
-            missing_keywords[kw] = contexts[0]
-        else:
-            missing_keywords[kw] = ["", ""]
-            
     section_scores_jd = [0.0, 0.0, 0.0, 0.0]
     section_scores_res = [0.0, 0.0, 0.0, 0.0]
 
@@ -194,23 +185,26 @@ def section_weighted_score(resume_sections, job_text, keywords):
 
 def calculate_ai_score(resume_skills: List[str], jd_required: List[str], jd_nice_to_have: List[str]) -> Tuple[float, List[str], List[str]]:
     """
-    Calculate score based on strict matching of AI-extracted skills.
+    Calculate score based on fuzzy matching of AI-extracted skills (aliases, then word vectors).
     Returns: (score (0-100), matched_skills, missing_skills)
     """
     if not jd_required:
         return 0.0, [], []
     
-    resume_skills_norm = {s.lower() for s in resume_skills}
-    required_norm = {s.lower() for s in jd_required}
-    nice_norm = {s.lower() for s in jd_nice_to_have}
+    resume_skills_norm = list(dict.fromkeys(s.lower() for s in resume_skills))
+    required_norm = list(dict.fromkeys(s.lower() for s in jd_required))
+    nice_norm = list(dict.fromkeys(s.lower() for s in jd_nice_to_have))
+    
+    # one batch for both lists, so the similarity matrix is computed once
+    hits = match_skills(resume_skills_norm, required_norm + nice_norm)
     
     matched = []
     missing = []
     
     # Check required
     required_hits = 0
-    for req in required_norm:
-        if req in resume_skills_norm:
+    for req, hit in zip(required_norm, hits):
+        if hit is not None:
             required_hits += 1
             matched.append(req)
         else:
@@ -218,8 +212,8 @@ def calculate_ai_score(resume_skills: List[str], jd_required: List[str], jd_nice
             
     # Check nice to have
     nice_hits = 0
-    for nice in nice_norm:
-        if nice in resume_skills_norm:
+    for nice, hit in zip(nice_norm, hits[len(required_norm):]):
+        if hit is not None:
             nice_hits += 1
             matched.append(nice)
             
@@ -237,20 +231,110 @@ def calculate_ai_score(resume_skills: List[str], jd_required: List[str], jd_nice
         
     return round(final_score, 2), matched, missing
 
-def get_weighted_score(resume_text: str, job_text: str, category: str, 
-                       ai_resume_skills: List[str] = None, 
-                       ai_jd_required: List[str] = None,
-                       ai_jd_nice: List[str] = None):
+def _profile(text: str, analysis: Optional[DocumentAnalysis], vector_table) -> DocumentProfile:
+    if vector_table is not None:
+        return DocumentProfile(
+            text=text,
+            sections=segment_sections(text),
+            tokens=tokenize(text),
+            vector=vector_table.text_vector(text),
+            engine="vectors",
+        )
+    with span("semantic_vectors"):
+        noun_chunks, vector = analysis.noun_chunks, analysis.chunk_vector
+    return DocumentProfile(
+        text=text,
+        sections=segment_sections(text),
+        tokens=tokenize(text),
+        noun_chunks=noun_chunks,
+        vector=vector,
+        engine="spacy",
+    )
+
+def _semantic_vector_table():
+    return get_vector_table() if settings.SEMANTIC_ENGINE == "vectors" else None
+
+def warm_up() -> str:
+    """Load everything scoring needs up front and return the semantic engine in use."""
+    if not keyword_catalogue.loaded: # already loaded at startup when the worker was forked
+        keyword_catalogue.load_all()
+    vector_table = _semantic_vector_table()
+    if vector_table is not None:
+        # the spaCy pipeline is never needed, but its stop word list and string hashing are
+        vector_table.rows_for(content_tokens("warm up"))
+        return "vectors"
+    get_nlp()
+    return "spacy"
+
+def build_document_profile(text: str) -> DocumentProfile:
+    """Segment, tokenize and parse (or vector-look-up) one document; the cacheable part of scoring."""
+    vector_table = _semantic_vector_table()
+    # one spaCy parse per document
+    analysis = analyse_document(text) if vector_table is None else None
+    return _profile(text, analysis, vector_table)
+
+def build_document_profiles(texts: List[str]) -> List[DocumentProfile]:
+    """build_document_profile for many documents, parsing them with nlp.pipe in batches."""
+    vector_table = _semantic_vector_table()
+    if vector_table is not None:
+        return [_profile(text, None, vector_table) for text in texts]
+    analyses = analyse_documents(texts, batch_size=settings.NLP_BATCH_SIZE)
+    return [_profile(text, analysis, None) for text, analysis in zip(texts, analyses)]
+
+def prepare_job(job_text: str, category: str, document: Optional[DocumentProfile] = None) -> JobProfile:
+    """Analyse a job description once: keyword hits, extra keywords and its semantic representation."""
+    catalogue = keyword_catalogue.get(category)
+    if document is None:
+        document = build_document_profile(job_text)
+    return JobProfile(job_text, catalogue.keywords, catalogue.matcher, document)
+
+def prepare_jobs(job_text: str, categories: Optional[List[str]] = None,
+                 document: Optional[DocumentProfile] = None) -> Dict[str, JobProfile]:
+    """
+    prepare_job for several categories (default: all of them). The JD is parsed
+    once, scanned once with the union keyword index and its hits are handed
+    to each category by the keyword's category tags.
+    """
+    union = keyword_catalogue.union(categories)
+    if document is None:
+        document = build_document_profile(job_text)
+    with span("jd_keywords"):
+        extra_keywords = find_extra_keywords(job_text)
+        category_hits = {category: set() for category in union.categories}
+        for kw in union.matcher.find_all(job_text.lower()):
+            for category in union.tags[kw]:
+                category_hits[category].add(kw)
+    return {
+        entry.name: JobProfile(job_text, entry.keywords, entry.matcher, document,
+                               jd_hits=category_hits[entry.name], extra_keywords=extra_keywords)
+        for entry in union.entries
+    }
+
+def best_category(jobs: Dict[str, JobProfile], results: Dict[str, tuple]) -> Optional[str]:
+    """
+    The category whose keywords the JD mentions most, then the highest score.
+    "fallback" (a short generic list) only wins when no other category has a hit.
+    """
+    def rank(category):
+        hits = len(jobs[category].jd_hits)
+        return (category != "fallback" and hits > 0, hits, results[category][0], category)
+    return max(results, key=rank, default=None)
+
+def score_profile(resume: DocumentProfile, job: JobProfile,
+                  ai_resume_skills: List[str] = None,
+                  ai_jd_required: List[str] = None,
+                  ai_jd_nice: List[str] = None,
+                  section_hits: Optional[Dict[str, set]] = None):
+    """Score an analysed resume against a prepared job; only the JD-specific matching runs here."""
 
     # Legacy Keyword Calculation
-    keywords = get_keywords_list(category)
-    resume_sections = segment_sections(resume_text)
+    resume_sections = resume.sections
 
-    keyword_score, section_scores, density, matched_keywords, missing_keywords = section_weighted_score(resume_sections, job_text, keywords)
+    keyword_score, section_scores, density, matched_keywords, missing_keywords = score_sections(resume_sections, job, section_hits)
 
-    resume_tokens = extract_keywords(resume_text)
-    jd_tokens = extract_keywords(job_text)
-    semantic_score = semantic_match_score(resume_tokens, jd_tokens)
+    # no noun chunks on either side gives a zero vector, and a zero similarity
+    with span("semantic_similarity"):
+        semantic_score = cosine_similarity(resume.vector, job.document.vector)
 
     # Legacy final score
     legacy_score = keyword_score * (0.6 + 0.4 * semantic_score) * 100
@@ -263,22 +347,77 @@ def get_weighted_score(resume_text: str, job_text: str, category: str,
         # Blend: 60% legacy, 40% AI (or any other ratio)
         # Assuming AI is more accurate for "Skills" but Legacy is better for "Experience" density
         final_score = (legacy_score * 0.6) + (ai_score * 0.4)
-        print("ai_score:", ai_score, "ai_matched:", ai_matched, "ai_missing:", ai_missing)
-        print("legacy score:", legacy_score, "ai_score:", ai_score, "final_score:", final_score)
+        logger.debug("ai_score: %s ai_matched: %s ai_missing: %s", ai_score, ai_matched, ai_missing)
+        logger.debug("legacy score: %s ai_score: %s final_score: %s", legacy_score, ai_score, final_score)
         
         # Merge matched keywords for display?
         # for now just return the blended score and let the legacy 'missing' keywords stand as they have context.
     
-    resume_sections = {
-        section: text.split("%nl%")
-        for section, text in resume_sections.items()
-        }
-
     return (round(final_score,2),
             round(keyword_score*100,2),
-            resume_sections,
+            resume_sections.as_lines(),
             section_scores,
             round(density*100,2),
             matched_keywords,
             missing_keywords,
             round(semantic_score * 100,2))
+
+def score_resume(resume_text: str, job: JobProfile,
+                 ai_resume_skills: List[str] = None,
+                 ai_jd_required: List[str] = None,
+                 ai_jd_nice: List[str] = None):
+    """Score one resume against a prepared job."""
+    return score_profile(build_document_profile(resume_text), job, ai_resume_skills, ai_jd_required, ai_jd_nice)
+
+def score_resumes(resumes: List[DocumentProfile], job: JobProfile,
+                  ai_resume_skills: Optional[List[List[str]]] = None,
+                  ai_jd_required: List[str] = None,
+                  ai_jd_nice: List[str] = None):
+    """Score many analysed resumes against one prepared job."""
+    ai_resume_skills = ai_resume_skills or [None] * len(resumes)
+    return [
+        score_profile(resume, job, skills, ai_jd_required, ai_jd_nice)
+        for resume, skills in zip(resumes, ai_resume_skills)
+    ]
+
+def score_documents(resume: DocumentProfile, job_document: DocumentProfile, category: str,
+                    ai_resume_skills: List[str] = None,
+                    ai_jd_required: List[str] = None,
+                    ai_jd_nice: List[str] = None):
+    """Score two analysed documents in one call, so it can run in a worker process."""
+    job = prepare_job(job_document.text, category, job_document)
+    return score_profile(resume, job, ai_resume_skills, ai_jd_required, ai_jd_nice)
+
+def score_batch(resumes: List[DocumentProfile], job_document: DocumentProfile, category: str,
+                ai_resume_skills: Optional[List[List[str]]] = None,
+                ai_jd_required: List[str] = None,
+                ai_jd_nice: List[str] = None):
+    """prepare_job + score_resumes in one call, so a whole batch can run in a worker process."""
+    job = prepare_job(job_document.text, category, job_document)
+    return score_resumes(resumes, job, ai_resume_skills, ai_jd_required, ai_jd_nice)
+
+def score_categories(resume: DocumentProfile, job_document: DocumentProfile, categories: Optional[List[str]] = None,
+                     ai_resume_skills: List[str] = None,
+                     ai_jd_required: List[str] = None,
+                     ai_jd_nice: List[str] = None):
+    """
+    Score two analysed documents against several categories (default: all) at once.
+    Returns (best category, {category: score_profile result}).
+    """
+    jobs = prepare_jobs(job_document.text, categories, job_document)
+    # one pass over the resume covers the keywords of every category
+    matcher = KeywordMatcher(sorted(frozenset().union(*(job.resume_keywords for job in jobs.values()))))
+    with span("keyword_matching"):
+        section_hits = resume.sections.find_all(matcher)
+    results = {
+        category: score_profile(resume, job, ai_resume_skills, ai_jd_required, ai_jd_nice, section_hits)
+        for category, job in jobs.items()
+    }
+    return best_category(jobs, results), results
+
+def get_weighted_score(resume_text: str, job_text: str, category: str, 
+                       ai_resume_skills: List[str] = None, 
+                       ai_jd_required: List[str] = None,
+                       ai_jd_nice: List[str] = None):
+    job = prepare_job(job_text, category)
+    return score_resume(resume_text, job, ai_resume_skills, ai_jd_required, ai_jd_nice)
@@ -0,0 +1,107 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+from src.backend.core.metrics import timed
+from src.backend.services.keyword_matcher import KeywordMatcher
+
+# Section definitions
+INFO_CATEGORIES = {
+    "SKILLS": {
+        "weight": 4,
+        "headers": ["skills", "technologies", "expertise", "proficiencies", "languages", "tools", "interest"]},
+    "EXPERIENCE": {
+        "weight": 3,
+        "headers": ["experience", "employment", "projects", "work history", "responsibilities"]},
+    "EDUCATION": {
+        "weight": 2,
+        "headers": ["education", "enrolled", "academic", "degree", "certification", "qualification", "post-secondary", "bachelor", "master", "doctorate", "phd"]},
+    "OTHER": {
+        "weight": 1,
+        "headers": []},
+}
+
+# Order sections are reported and matched in (earlier sections claim a keyword's weight first)
+SECTION_ORDER = ("EXPERIENCE", "EDUCATION", "SKILLS", "OTHER")
+
+# Every header of every category in one automaton; header checks are plain substring checks
+_HEADERS = [(section, header) for section, info in INFO_CATEGORIES.items() for header in info["headers"]]
+_HEADER_MATCHER = KeywordMatcher([header for _, header in _HEADERS], word_boundaries=False)
+_HEADER_PRIORITY = {section: i for i, section in enumerate(INFO_CATEGORIES)}
+
+
+def _header_section(line: str):
+    """Section a header line switches to, or None. Categories are tried in INFO_CATEGORIES order."""
+    sections = {_HEADERS[idx][0] for _, _, idx in _HEADER_MATCHER.iter_matches(line.lower())}
+    if not sections:
+        return None
+    return min(sections, key=_HEADER_PRIORITY.get)
+
+
+@dataclass
+class ResumeSections:
+    """
+    Section segmentation of a document as (start, end) offsets of stripped lines
+    into the original text. Header lines belong to no section.
+    """
+    text: str
+    spans: Dict[str, List[Tuple[int, int]]] = field(default_factory=lambda: {s: [] for s in SECTION_ORDER})
+    # every section line in text order, as (start, end, section), for offset lookups
+    _ordered: List[Tuple[int, int, str]] = field(default_factory=list, repr=False)
+
+    def lines(self, section: str) -> List[str]:
+        return [self.text[start:end] for start, end in self.spans[section]]
+
+    def section_text(self, section: str) -> str:
+        return "\n".join(self.lines(section))
+
+    def as_lines(self) -> Dict[str, List[str]]:
+        """Section -> lines, the format the results page renders (empty sections give [""])."""
+        return {section: self.lines(section) or [""] for section in SECTION_ORDER}
+
+    def find_all(self, matcher: KeywordMatcher) -> Dict[str, Set[str]]:
+        """
+        Keywords found in each section. The whole text is scanned once and every
+        hit is assigned to the section line that contains it.
+        """
+        hits = {section: set() for section in SECTION_ORDER}
+        lowered = self.text.lower()
+        if len(lowered) != len(self.text):
+            # lowercasing changed offsets (rare Unicode case mappings), match section by section
+            for section in SECTION_ORDER:
+                hits[section] = matcher.find_all(self.section_text(section).lower())
+            return hits
+
+        starts = [start for start, _, _ in self._ordered]
+        for start, end, idx in matcher.iter_matches(lowered):
+            i = bisect_right(starts, start) - 1
+            if i >= 0 and end <= self._ordered[i][1]:
+                hits[self._ordered[i][2]].add(matcher.keywords[idx])
+        return hits
+
+
+@timed("segmentation")
+def segment_sections(text: str) -> ResumeSections:
+    """Roughly segment text into sections based on common resume/JD headers, in one pass over the lines."""
+    sections = ResumeSections(text)
+    current_section = "OTHER" # by default
+    offset = 0
+
+    for raw in text.splitlines(keepends=True):
+        line = raw.strip()
+        start = offset + len(raw) - len(raw.lstrip())
+        offset += len(raw)
+
+        # only short lines can be headers
+        header = _header_section(line) if len(line.split()) < 5 else None
+        if header is not None:
+            current_section = header
+            continue
+
+        spans = sections.spans[current_section]
+        if not line and not spans:
+            continue # leading blank lines of a section are dropped
+        spans.append((start, start + len(line)))
+        if line:
+            sections._ordered.append((start, start + len(line), current_section))
+    return sections
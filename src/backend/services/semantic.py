@@ -0,0 +1,178 @@
+"""
+Vector-only semantic similarity.
+
+The spaCy engine parses both documents to get noun chunk vectors. This engine
+skips the pipeline entirely: the model's word vectors are exported once into
+NumPy files, which are memory-mapped at runtime and looked up by token hash.
+
+Build the table (needs en_core_web_md installed):
+    python -m src.backend.services.semantic build
+
+Compare against the spaCy engine on a resume/JD pair:
+    python -m src.backend.services.semantic compare resume.txt jd.txt
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.backend.core.config import settings
+from src.backend.core.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"  # (n_vectors, width) float32
+KEYS_FILE = "keys.npy"  # sorted uint64 string hashes
+ROWS_FILE = "rows.npy"  # row in VECTORS_FILE for each entry of KEYS_FILE
+
+TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+
+
+def build_vector_table(out_dir: str, model: str = "en_core_web_md") -> int:
+    """Export the model's vector table into out_dir. Returns the number of keys written."""
+    import spacy
+
+    nlp = spacy.load(model, exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"])
+    vectors = nlp.vocab.vectors
+    keys = np.fromiter(vectors.key2row.keys(), dtype=np.uint64, count=len(vectors.key2row))
+    rows = np.fromiter(vectors.key2row.values(), dtype=np.int64, count=len(vectors.key2row))
+    order = np.argsort(keys)
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, VECTORS_FILE), np.asarray(vectors.data, dtype=np.float32))
+    np.save(os.path.join(out_dir, KEYS_FILE), keys[order])
+    np.save(os.path.join(out_dir, ROWS_FILE), rows[order].astype(np.int32))
+    return len(keys)
+
+
+def content_tokens(text: str) -> List[str]:
+    """Lowercased word tokens with stop words removed (stands in for noun chunks)."""
+    from spacy.lang.en.stop_words import STOP_WORDS
+
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class VectorTable:
+    """Memory-mapped word vector table with vectorized token lookups."""
+
+    def __init__(self, table_dir: str):
+        self.vectors = np.load(os.path.join(table_dir, VECTORS_FILE), mmap_mode="r")
+        self.keys = np.load(os.path.join(table_dir, KEYS_FILE), mmap_mode="r")
+        self.rows = np.load(os.path.join(table_dir, ROWS_FILE), mmap_mode="r")
+
+    def rows_for(self, tokens: List[str]) -> np.ndarray:
+        """Vector row of each token, -1 for tokens not in the table."""
+        rows = np.full(len(tokens), -1, dtype=np.int64)
+        if not tokens or not len(self.keys):
+            return rows
+        from spacy.strings import hash_string
+
+        hashes = np.fromiter((hash_string(t) for t in tokens), dtype=np.uint64, count=len(tokens))
+        pos = np.searchsorted(self.keys, hashes)
+        pos[pos == len(self.keys)] = 0
+        found = self.keys[pos] == hashes
+        rows[found] = self.rows[pos[found]]
+        return rows
+
+    def lookup(self, tokens: List[str]) -> np.ndarray:
+        """Vector rows for tokens found in the table (unknown tokens are dropped)."""
+        rows = self.rows_for(tokens)
+        return rows[rows >= 0]
+
+    @timed("vector_lookup")
+    def text_vector(self, text: str) -> np.ndarray:
+        """Sum of the word vectors of the content tokens in text."""
+        rows = self.lookup(content_tokens(text))
+        if not len(rows):
+            return np.zeros(self.vectors.shape[1], dtype=np.float32)
+        return self.vectors[rows].sum(axis=0)
+
+    def similarity(self, resume_text: str, job_text: str) -> float:
+        """Cosine similarity of the averaged word vectors (averaging does not change the cosine)."""
+        a = self.text_vector(resume_text)
+        b = self.text_vector(job_text)
+        norm = float(np.linalg.norm(a)) * float(np.linalg.norm(b))
+        if norm == 0:
+            return 0.0
+        return float(np.dot(a, b) / norm)
+
+
+_table: Optional[VectorTable] = None
+_table_missing = False # a failed load is not retried (and logged) for every document
+_table_lock = threading.Lock()
+
+
+def get_vector_table() -> Optional[VectorTable]:
+    """Shared VectorTable, or None if the table has not been built."""
+    global _table, _table_missing
+    if _table is None and not _table_missing:
+        with _table_lock:
+            if _table is None and not _table_missing:
+                try:
+                    _table = VectorTable(settings.VECTOR_TABLE_DIR)
+                except FileNotFoundError:
+                    _table_missing = True
+                    logger.warning("Vector table not found in '%s', run `python -m src.backend.services.semantic build`.",
+                                   settings.VECTOR_TABLE_DIR)
+    return _table
+
+
+def _compare(resume_path: str, jd_path: str, repeat: int, tolerance: float) -> int:
+    from src.backend.services.scoring import analyse_document, semantic_document_score
+
+    with open(resume_path, encoding="utf-8") as f:
+        resume_text = f.read()
+    with open(jd_path, encoding="utf-8") as f:
+        job_text = f.read()
+
+    table = get_vector_table()
+    if table is None:
+        return 2
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        spacy_score = semantic_document_score(analyse_document(resume_text), analyse_document(job_text))
+    spacy_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vector_score = table.similarity(resume_text, job_text)
+    vector_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    diff = abs(spacy_score - vector_score)
+    print(f"spacy:   {spacy_score:.4f} ({spacy_ms:.2f} ms)")
+    print(f"vectors: {vector_score:.4f} ({vector_ms:.2f} ms)")
+    print(f"diff:    {diff:.4f} (tolerance {tolerance})")
+    return 0 if diff <= tolerance else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Vector-only semantic similarity engine")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="export the spaCy vector table to NumPy files")
+    build.add_argument("--out", default=settings.VECTOR_TABLE_DIR)
+    build.add_argument("--model", default="en_core_web_md")
+
+    compare = sub.add_parser("compare", help="benchmark and compare against the spaCy engine")
+    compare.add_argument("resume")
+    compare.add_argument("jd")
+    compare.add_argument("--repeat", type=int, default=20)
+    compare.add_argument("--tolerance", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        count = build_vector_table(args.out, args.model)
+        print(f"Wrote {count} keys to '{args.out}'.")
+        return 0
+    return _compare(args.resume, args.jd, args.repeat, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
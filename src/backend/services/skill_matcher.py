@@ -0,0 +1,123 @@
+"""
+Fuzzy matching of AI-extracted skill lists.
+
+Skills are normalised (case, punctuation, spacing) and mapped through the alias
+table, so "Postgres" / "PostgreSQL" or "ML" / "machine learning" match without
+touching any vectors. JD skills still unmatched after that are compared with
+every resume skill at once: each skill is embedded as the mean of its word
+vectors (the vector table or the spaCy vocab, whichever the semantic engine
+uses) and one matrix multiply of the normalised matrices gives the cosine
+similarity of every resume x JD pair.
+"""
+import json
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.backend.core.config import settings
+from src.backend.core.metrics import timed
+from src.backend.services.nlp import get_nlp
+from src.backend.services.semantic import TOKEN_RE, get_vector_table
+
+_SEPARATORS = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalise_skill(skill: str) -> str:
+    """Lowercase, with punctuation other than + and # collapsed to single spaces ("Node.js" -> "node js")."""
+    return _SEPARATORS.sub(" ", skill.lower()).strip()
+
+
+@lru_cache(maxsize=1)
+def load_aliases(path: Optional[str] = None) -> Dict[str, str]:
+    """Normalised alias -> normalised canonical skill, from a {canonical: [aliases]} JSON file."""
+    try:
+        with open(path or settings.SKILL_ALIAS_FILE, encoding="utf-8") as f:
+            table = json.load(f)
+    except FileNotFoundError:
+        return {}
+    aliases = {}
+    for canonical, names in table.items():
+        target = normalise_skill(canonical)
+        for name in [canonical, *names]:
+            aliases[normalise_skill(name)] = target
+    return aliases
+
+
+def canonical_skill(skill: str) -> str:
+    norm = normalise_skill(skill)
+    return load_aliases().get(norm, norm)
+
+
+def _word_vectors() -> Optional[Tuple[Callable[[List[str]], np.ndarray], np.ndarray]]:
+    """(tokens -> vector rows with -1 for unknown tokens, vector matrix), or None without vectors."""
+    if settings.SEMANTIC_ENGINE == "vectors":
+        table = get_vector_table()
+        if table is not None:
+            return table.rows_for, table.vectors
+    vectors = get_nlp().vocab.vectors
+    if vectors.size == 0:
+        return None
+    from spacy.strings import hash_string
+
+    def rows_for(tokens: List[str]) -> np.ndarray:
+        return np.asarray(vectors.find(keys=[hash_string(t) for t in tokens]), dtype=np.int64)
+
+    return rows_for, np.asarray(vectors.data)
+
+
+def embed_skills(skills: Sequence[str]) -> Optional[np.ndarray]:
+    """
+    Unit-length mean word vector of each skill, one row per skill (zero rows for
+    skills with no known words). All tokens are looked up in a single batch.
+    """
+    source = _word_vectors()
+    if source is None:
+        return None
+    rows_for, data = source
+    token_lists = [TOKEN_RE.findall(skill) for skill in skills]
+    tokens = [t for ts in token_lists for t in ts]
+    out = np.zeros((len(skills), data.shape[1]), dtype=np.float32)
+    if not tokens:
+        return out
+    rows = rows_for(tokens)
+    owner = np.repeat(np.arange(len(skills)), [len(ts) for ts in token_lists])
+    found = rows >= 0
+    if found.any():
+        # owner is sorted, so each skill's found rows are contiguous and one reduceat sums them
+        skill_ids, starts = np.unique(owner[found], return_index=True)
+        out[skill_ids] = np.add.reduceat(np.asarray(data[rows[found]], dtype=np.float32), starts, axis=0)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
+
+
+@timed("skill_matching")
+def match_skills(resume_skills: Sequence[str], jd_skills: Sequence[str],
+                 threshold: Optional[float] = None) -> List[Optional[str]]:
+    """
+    For each JD skill, the resume skill it matches (exact or alias match first,
+    otherwise the most similar resume skill with cosine >= threshold), or None.
+    """
+    threshold = settings.SKILL_MATCH_THRESHOLD if threshold is None else threshold
+    resume_canonical = [canonical_skill(s) for s in resume_skills]
+    by_canonical = {}
+    for skill, canonical in zip(resume_skills, resume_canonical):
+        by_canonical.setdefault(canonical, skill)
+
+    jd_canonical = [canonical_skill(s) for s in jd_skills]
+    matches = [by_canonical.get(c) for c in jd_canonical]
+    pending = [i for i, match in enumerate(matches) if match is None]
+    if not pending or not resume_skills or threshold > 1:
+        return matches
+
+    vectors = embed_skills(resume_canonical + [jd_canonical[i] for i in pending])
+    if vectors is None:
+        return matches
+    similarity = vectors[len(resume_canonical):] @ vectors[:len(resume_canonical)].T # pending JD x resume
+    best = similarity.argmax(axis=1)
+    for row, i in enumerate(pending):
+        if similarity[row, best[row]] >= threshold:
+            matches[i] = resume_skills[best[row]]
+    return matches
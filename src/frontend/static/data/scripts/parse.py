@@ -1,4 +1,6 @@
+import argparse
 import json
+import sys
 
 def convert_txt_to_json(input_filename, output_filename):
     """
@@ -7,21 +9,29 @@ def convert_txt_to_json(input_filename, output_filename):
     data = []
 
     try:
-        with open(input_filename, 'r') as txt_file:
+        with open(input_filename, 'r', encoding='utf-8') as txt_file:
             for line in txt_file:
                 line = line.strip()
                 if line:
-                    try: data.append(line)
-                    except ValueError: print(f"Warning: skipping malformed line in '{input_filename}': '{line}'")
+                    data.append(line)
 
-        with open(output_filename, 'w') as json_file:
-            json.dump(data, json_file, sort_keys=True, indent=4) # pretty printing
+        with open(output_filename, 'w', encoding='utf-8') as json_file:
+            json.dump(data, json_file, indent=4) # pretty printing
             print(f"Successfully parsed '{input_filename}' to '{output_filename}'.")
+        return 0
 
     except FileNotFoundError:
         print(f"Error: Input file '{input_filename}' not found.")
     except Exception as e:
         print(f"Some error occurred: {e}")
+    return 1
 
-# INSERT YOUR FILE NAMES HERE
-convert_txt_to_json('app/assets/data.txt', 'app/assets/skills.json')
\ No newline at end of file
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a text file with one keyword per line into a JSON list")
+    parser.add_argument("input", help="text file, one value per line")
+    parser.add_argument("output", help="JSON file to write, e.g. keywords_<category>.json")
+    args = parser.parse_args(argv)
+    return convert_txt_to_json(args.input, args.output)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,21 @@
+import argparse
 import json
+import sys
 
 def sort_json(input_filename, output_filename):
     """
-    Use sort.py to sort a JSON file alphabetically
+    Use sort.py to sort a JSON file alphabetically (lists case-insensitively, objects by key)
     """
     try:
-        with open(input_filename, 'r') as file:
+        with open(input_filename, 'r', encoding='utf-8') as file:
             data = json.load(file)
-            sorted_data_str = json.dumps(data, sort_keys=True, indent=4)
-            sorted_data = json.loads(sorted_data_str)
+        if isinstance(data, list):
+            data = sorted(data, key=lambda value: (str(value).lower(), str(value)))
 
-        with open(output_filename, 'w') as file:
-            json.dump(sorted_data, file, indent=4) # pretty printing
+        with open(output_filename, 'w', encoding='utf-8') as file:
+            json.dump(data, file, sort_keys=True, indent=4) # pretty printing
             print(f"Successfully sorted '{input_filename}' and saved to '{output_filename}'.")
+        return 0
 
     except FileNotFoundError:
         print(f"Error: Input file '{input_filename}' not found.")
@@ -20,6 +23,14 @@ def sort_json(input_filename, output_filename):
         print(f"Error: Could not decode JSON from '{input_filename}'.")
     except Exception as e:
         print(f"Some error occurred: {e}")
+    return 1
 
-# INSERT YOUR FILE NAMES HERE
-sort_json('app/assets/skills_operations_hard.json', 'app/assets/skills_operations_hard_sorted.json')
\ No newline at end of file
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sort a JSON keyword file alphabetically")
+    parser.add_argument("input", help="JSON file to sort")
+    parser.add_argument("output", nargs="?", help="where to write the result (default: overwrite input)")
+    args = parser.parse_args(argv)
+    return sort_json(args.input, args.output or args.input)
+
+if __name__ == "__main__":
+    sys.exit(main())
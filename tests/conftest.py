@@ -0,0 +1,77 @@
+import glob
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pytest
+
+# the app is imported as src.backend..., run from the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.backend.core.config import settings  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "tests", "engineering")
+
+
+@pytest.fixture
+def vector_engine(tmp_path, monkeypatch):
+    """
+    SEMANTIC_ENGINE=vectors over a small random vector table covering the fixture
+    and keyword vocabulary, so scoring runs without a spaCy model.
+    """
+    from spacy.strings import hash_string
+    from src.backend.services import semantic
+
+    words = set()
+    for path in glob.glob(os.path.join(FIXTURES, "*.txt")) + glob.glob(os.path.join(settings.KEYWORD_DATA_DIR, "keywords_*.json")):
+        with open(path, encoding="utf-8") as f:
+            words.update(semantic.TOKEN_RE.findall(f.read().lower()))
+    keys = np.array(sorted(hash_string(word) for word in words), dtype=np.uint64)
+    rng = np.random.default_rng(0)
+    table_dir = tmp_path / "vectors"
+    table_dir.mkdir()
+    np.save(table_dir / semantic.VECTORS_FILE, rng.normal(size=(len(keys), 16)).astype(np.float32))
+    np.save(table_dir / semantic.KEYS_FILE, keys)
+    np.save(table_dir / semantic.ROWS_FILE, rng.permutation(len(keys)).astype(np.int32))
+
+    monkeypatch.setattr(settings, "SEMANTIC_ENGINE", "vectors")
+    monkeypatch.setattr(settings, "VECTOR_TABLE_DIR", str(table_dir))
+    monkeypatch.setattr(semantic, "_table", None)
+    monkeypatch.setattr(semantic, "_table_missing", False)
+    return semantic.get_vector_table()
+
+
+@pytest.fixture
+def catalogue(tmp_path, monkeypatch):
+    """A keyword catalogue over a copy of the keyword files, safe to edit; checks file mtimes on every get."""
+    from src.backend.services import keyword_catalogue as module
+    from src.backend.services import score_store, scoring
+
+    data_dir = tmp_path / "keywords"
+    data_dir.mkdir()
+    for path in glob.glob(os.path.join(settings.KEYWORD_DATA_DIR, "keywords_*.json")):
+        shutil.copy2(path, data_dir)
+    catalogue = module.KeywordCatalogue(str(data_dir), check_interval=0)
+    for target in (module, scoring, score_store):
+        monkeypatch.setattr(target, "keyword_catalogue", catalogue)
+    return catalogue
+
+
+@pytest.fixture
+def edit_keywords(catalogue):
+    """edit_keywords(category, edit): rewrite the catalogue's keyword file with edit(keywords), with a new mtime."""
+    def edit_keywords(category, edit):
+        _rewrite(os.path.join(catalogue.data_dir, f"keywords_{category}.json"), edit)
+    return edit_keywords
+
+
+def _rewrite(path, edit):
+    with open(path, encoding="utf-8") as f:
+        keywords = json.load(f)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(edit(keywords), f)
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
@@ -0,0 +1,137 @@
+"""AIService against a local stub of the Groq chat completions endpoint."""
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.backend.core.config import settings
+from src.backend.services.ai_cache import cache_key
+from src.backend.services.ai_service import RESUME_PROMPT_VERSION, AIService
+
+RESUME = {"personal_info": {"name": "A", "email": None}, "skills": ["Python"], "summary": "s"}
+JD = {"role_title": "R", "required_skills": ["Python"], "experience_level": "Junior"}
+
+
+class StubGroq:
+    """Chat completions stub: resume prompts take 0.4s, JD prompts 0.6s."""
+
+    def __init__(self):
+        self.calls = 0
+        self.rate_limited = 0 # next calls answered with 429
+        self.stalled = 0 # next calls that hang for longer than AI_TIMEOUT
+        self.app = FastAPI()
+        self.app.post("/openai/v1/chat/completions")(self.chat)
+
+    async def chat(self, request: Request):
+        body = await request.json()
+        self.calls += 1
+        if self.rate_limited > 0:
+            self.rate_limited -= 1
+            return JSONResponse({"error": {"message": "rate limited"}}, status_code=429, headers={"retry-after": "0"})
+        if self.stalled > 0:
+            self.stalled -= 1
+            await asyncio.sleep(1.5)
+        is_resume = "Resume Parser" in body["messages"][1]["content"]
+        await asyncio.sleep(0.4 if is_resume else 0.6)
+        return {
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": json.dumps(RESUME if is_resume else JD)}}],
+        }
+
+
+@pytest.fixture(scope="module")
+def stub():
+    stub = StubGroq()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(stub.app, log_level="error"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    stub.base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    yield stub
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def service(stub, monkeypatch):
+    monkeypatch.setattr(settings, "AI_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "AI_RETRY_BASE_DELAY", 0.01)
+    service = AIService()
+    service.api_key = "test"
+    service.base_url = stub.base_url
+    stub.calls = 0
+    return service
+
+
+def run(service, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await service.aclose()
+    return asyncio.run(main())
+
+
+def test_extract_all_runs_both_calls_concurrently(service):
+    start = time.perf_counter()
+    resume, jd = run(service, service.extract_all("resume text", "job text"))
+    elapsed = time.perf_counter() - start
+    assert resume.skills == ["Python"] and jd.required_skills == ["Python"]
+    assert elapsed < 0.9 # 0.4s + 0.6s if the calls were sequential
+
+
+def test_rate_limited_call_is_retried(service, stub):
+    stub.rate_limited = 1
+    resume = run(service, service.extract_resume_data("resume text"))
+    assert resume is not None and resume.skills == ["Python"]
+    assert stub.calls == 2
+
+
+def test_timed_out_call_is_retried(service, stub, monkeypatch):
+    service.client # built with the default HTTP timeout, so only the per-attempt AI_TIMEOUT fires
+    monkeypatch.setattr(settings, "AI_TIMEOUT", 0.8)
+    stub.stalled = 1
+    resume = run(service, service.extract_resume_data("resume text"))
+    assert resume is not None and resume.skills == ["Python"]
+    assert stub.calls == 2
+
+
+def test_extractions_are_cached_in_memory_and_on_disk(service, stub, monkeypatch, tmp_path):
+    path = tmp_path / "ai_cache.sqlite3"
+    monkeypatch.setattr(settings, "AI_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_CACHE_PATH", str(path))
+
+    async def twice():
+        return [await service.extract_resume_data("resume text") for _ in range(2)]
+    assert [r.skills for r in run(service, twice())] == [["Python"], ["Python"]]
+    assert stub.calls == 1 and service.cache.memory_hits == 1
+
+    # the disk write happens on an I/O thread after the extraction returns
+    deadline = time.monotonic() + 5
+    while service.cache.get_disk(cache_key("resume", "resume text", service.model, RESUME_PROMPT_VERSION)) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    fresh = AIService()
+    fresh.api_key, fresh.base_url = service.api_key, service.base_url
+    assert run(fresh, fresh.extract_resume_data("resume text")).skills == ["Python"]
+    assert stub.calls == 1 and fresh.cache.disk_hits == 1
+
+
+def test_cache_is_not_opened_until_used(monkeypatch, tmp_path):
+    path = tmp_path / "data" / "ai_cache.sqlite3"
+    monkeypatch.setattr(settings, "AI_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_CACHE_PATH", str(path))
+    service = AIService()
+    assert service.cache is not None
+    assert not path.parent.exists()
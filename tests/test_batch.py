@@ -0,0 +1,63 @@
+"""POST /analyse/batch: ranking, top_k and the reported count."""
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic import synthetic_resume
+from src.backend.core import executor
+from src.backend.core.config import settings
+from src.backend.main import app
+from src.backend.services.keyword_catalogue import keyword_catalogue
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "engineering")
+
+
+@pytest.fixture
+def client(vector_engine, monkeypatch):
+    # CPU stages on in-process threads, so they see the test's settings
+    monkeypatch.setattr(settings, "CPU_WORKERS", 0)
+    monkeypatch.setattr(executor, "_pools", {})
+    yield TestClient(app)
+    executor.shutdown_pools()
+
+
+@pytest.fixture
+def batch():
+    with open(os.path.join(FIXTURES, "jd.txt"), encoding="utf-8") as f:
+        job_text = f.read()
+    keywords = keyword_catalogue.get("engineering").keywords
+    resumes = [(f"resume{i}.txt", synthetic_resume(keywords[i * 7:], 1, "engineering", seed=i)) for i in range(5)]
+    return job_text, [("resume_files", (name, text.encode("utf-8"), "text/plain")) for name, text in resumes]
+
+
+def post_batch(client, batch, **data):
+    job_text, files = batch
+    return client.post("/analyse/batch", data={"jobdesc_textarea": job_text, "jobdesc_category": "engineering", **data},
+                       files=files)
+
+
+def test_results_ranked_and_counted(client, batch):
+    response = post_batch(client, batch)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == len(body["results"]) == 5
+    assert [result["rank"] for result in body["results"]] == [1, 2, 3, 4, 5]
+    scores = [result["score"] for result in body["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_top_k_truncates_and_count_matches(client, batch):
+    full = post_batch(client, batch).json()
+    response = post_batch(client, batch, top_k="2")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == len(body["results"]) == 2
+    assert body["results"] == full["results"][:2]
+
+
+@pytest.mark.parametrize("top_k", ["0", "-1"])
+def test_top_k_below_one_rejected(client, batch, top_k):
+    response = post_batch(client, batch, top_k=top_k)
+    assert response.status_code == 400
+    assert "top_k" in response.json()["detail"]
@@ -0,0 +1,120 @@
+"""Bulk scoring interrupted partway and resumed from its checkpoint writes what an uninterrupted run writes."""
+import json
+import os
+import re
+import time
+
+import pytest
+
+from benchmarks.synthetic import synthetic_resume
+from src.backend.services import bulk
+from src.backend.services.keyword_catalogue import keyword_catalogue
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "engineering")
+CATEGORY = "engineering"
+CHUNK_SIZE = 4
+
+# set by a test before the (forked) pool starts: score_chunk fails on the chunk holding this id
+_fail_on = {"id": None}
+score_chunk = bulk.score_chunk
+
+
+def failing_score_chunk(chunk):
+    """score_chunk, slower for even chunks so pool results finish out of order, failing on _fail_on["id"]."""
+    ids = [record_id for record_id, _, _ in chunk]
+    if _fail_on["id"] in ids:
+        raise RuntimeError("worker lost")
+    if int(re.search(r"\d+$", ids[0]).group()) // CHUNK_SIZE % 2 == 0:
+        time.sleep(0.05)
+    return score_chunk(chunk)
+
+
+@pytest.fixture
+def inputs(tmp_path, vector_engine):
+    """An NDJSON file of 30 resumes, including an empty one and an unreadable line."""
+    keywords = keyword_catalogue.get(CATEGORY).keywords
+    lines = [json.dumps({"id": f"resume-{i}", "text": synthetic_resume(keywords[i * 3:], 1, CATEGORY, seed=i)}) for i in range(30)]
+    lines[7] = json.dumps({"id": "resume-7", "text": ""})
+    lines[12] = "{not json"
+    path = tmp_path / "resumes.ndjson"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with open(os.path.join(FIXTURES, "jd.txt"), encoding="utf-8") as f:
+        return f.read(), [str(path)]
+
+
+def run(inputs, out_path, **kwargs):
+    job_text, paths = inputs
+    return bulk.run(job_text, CATEGORY, paths, str(out_path), chunk_size=CHUNK_SIZE, use_ai=False, **kwargs)
+
+
+def read_ids(out):
+    return [json.loads(line)["id"] for line in out.splitlines()]
+
+
+def read(out_path):
+    with open(out_path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def expected(inputs, tmp_path):
+    """Output of an uninterrupted run."""
+    assert run(inputs, tmp_path / "full.ndjson") == 30
+    return read(tmp_path / "full.ndjson")
+
+
+def assert_complete(out_path, expected):
+    out = read(out_path)
+    ids = read_ids(out)
+    assert len(ids) == len(set(ids)) == 30 # every id exactly once
+    assert out == expected
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_interrupted_run_resumes(inputs, tmp_path, expected, monkeypatch, workers):
+    out_path = tmp_path / "out.ndjson"
+    monkeypatch.setattr(bulk, "score_chunk", failing_score_chunk)
+    monkeypatch.setitem(_fail_on, "id", "resume-17") # fifth chunk
+    with pytest.raises(RuntimeError):
+        run(inputs, out_path, workers=workers)
+    # the chunks before the failed one, in input order whatever order the pool finished them in
+    written = read(out_path)
+    assert written == b"".join(expected.splitlines(keepends=True)[:16])
+    written = read_ids(written)
+
+    scored = []
+    monkeypatch.setitem(_fail_on, "id", None)
+    monkeypatch.setattr(bulk, "score_chunk", lambda chunk: scored.extend(r[0] for r in chunk) or failing_score_chunk(chunk))
+    assert run(inputs, out_path, workers=0, resume=True) == 30
+    assert not set(scored) & set(written) # ids already written are skipped, not scored again
+    assert len(scored) + len(written) == 30
+    assert_complete(out_path, expected)
+
+
+def test_partial_final_line_is_truncated(inputs, tmp_path, expected, monkeypatch):
+    out_path = tmp_path / "out.ndjson"
+    monkeypatch.setattr(bulk, "score_chunk", failing_score_chunk)
+    monkeypatch.setitem(_fail_on, "id", "resume-9")
+    with pytest.raises(RuntimeError):
+        run(inputs, out_path)
+    # a crash mid-write leaves half a result after the last checkpoint
+    with open(out_path, "ab") as f:
+        f.write(b'{"id": "resume-8", "score": 1')
+    monkeypatch.setitem(_fail_on, "id", None)
+    assert run(inputs, out_path, resume=True) == 30
+    assert_complete(out_path, expected)
+
+
+def test_resume_of_a_finished_run_writes_nothing(inputs, tmp_path, expected):
+    out_path = tmp_path / "out.ndjson"
+    run(inputs, out_path)
+    assert run(inputs, out_path, resume=True) == 30
+    assert_complete(out_path, expected)
+
+
+def test_checkpoint_of_another_run_is_refused(inputs, tmp_path):
+    out_path = tmp_path / "out.ndjson"
+    run(inputs, out_path)
+    job_text, paths = inputs
+    with pytest.raises(SystemExit):
+        bulk.run(job_text + "\nAlso Rust.", CATEGORY, paths, str(out_path), chunk_size=CHUNK_SIZE, use_ai=False, resume=True)
@@ -0,0 +1,97 @@
+"""The compiled keyword catalogue matches what the keyword files compile to, and never serves a stale category."""
+import os
+import random
+
+import pytest
+
+from benchmarks.synthetic import synthetic_jd, synthetic_resume
+from src.backend.core.config import settings
+from src.backend.services.catalogue_artifact import CatalogueArtifact, FlatMatcher, build
+from src.backend.services.keyword_catalogue import KeywordCatalogue
+from src.backend.services.keyword_matcher import KeywordMatcher
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "engineering")
+JSON_CATALOGUE = KeywordCatalogue(settings.KEYWORD_DATA_DIR, check_interval=3600)
+CATEGORIES = JSON_CATALOGUE.categories()
+
+
+@pytest.fixture(scope="module")
+def artifact_catalogue(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("artifact") / "keywords.bin")
+    build(settings.KEYWORD_DATA_DIR, path)
+    return KeywordCatalogue(settings.KEYWORD_DATA_DIR, check_interval=3600, artifact_path=path)
+
+
+@pytest.fixture(scope="module")
+def texts():
+    """Fixture documents, synthetic documents for every category and seeded random keyword soup."""
+    texts = []
+    for name in sorted(os.listdir(FIXTURES)):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            texts.append(f.read())
+    for category in CATEGORIES:
+        keywords = JSON_CATALOGUE.get(category).keywords
+        texts += [synthetic_jd(keywords, category), synthetic_resume(keywords, 1, category)]
+    rng = random.Random(24)
+    vocabulary = sorted({kw for category in CATEGORIES for kw in JSON_CATALOGUE.get(category).keywords})
+    vocabulary += ["x", "-", "/", "é", "_", "C++", "c#", ".net", "node.js", " "]
+    for _ in range(200):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 40))]
+        texts.append(rng.choice([" ", "", "_", "-", ", "]).join(words))
+    return [text.lower() for text in texts]
+
+
+def matches(matcher, text):
+    return {(start, end, matcher.keywords[idx]) for start, end, idx in matcher.iter_matches(text)}
+
+
+@pytest.mark.parametrize("category", CATEGORIES)
+def test_category_matches_keyword_files(artifact_catalogue, texts, category):
+    expected, entry = JSON_CATALOGUE.get(category), artifact_catalogue.get(category)
+    assert isinstance(entry.matcher, FlatMatcher)
+    assert isinstance(expected.matcher, KeywordMatcher)
+    assert entry.keywords == expected.keywords
+    assert entry.keyword_set == expected.keyword_set
+    assert dict(entry.tokens) == dict(expected.tokens)
+    for text in texts:
+        assert matches(entry.matcher, text) == matches(expected.matcher, text), text
+
+
+@pytest.mark.parametrize("names", [None, ["finance", "marketing"], ["engineering"]])
+def test_union_matches_keyword_files(artifact_catalogue, texts, names):
+    expected, union = JSON_CATALOGUE.union(names), artifact_catalogue.union(names)
+    assert isinstance(union.matcher, FlatMatcher)
+    assert dict(union.tags) == dict(expected.tags)
+    for text in texts:
+        assert union.matcher.find_all(text) == expected.matcher.find_all(text), text
+
+
+def test_category_views_decode_lazily(artifact_catalogue):
+    entry = artifact_catalogue._artifact.category("engineering")
+    keyword = JSON_CATALOGUE.get("engineering").keywords[0]
+    assert keyword in entry.keyword_set and "not a keyword" not in entry.keyword_set
+    assert entry.tokens[keyword] == JSON_CATALOGUE.get("engineering").tokens[keyword]
+    assert len(entry.keywords) == len(JSON_CATALOGUE.get("engineering").keywords)
+    assert entry.keywords._keywords is None # nothing above needed the decoded list
+
+
+def test_newer_keyword_file_falls_back_to_json(tmp_path, catalogue, edit_keywords):
+    path = str(tmp_path / "keywords.bin")
+    build(catalogue.data_dir, path)
+    artifact_catalogue = KeywordCatalogue(catalogue.data_dir, check_interval=0, artifact_path=path)
+    assert isinstance(artifact_catalogue.get("engineering").matcher, FlatMatcher)
+
+    edit_keywords("engineering", lambda keywords: keywords + ["Quantum Basket Weaving"])
+    entry = artifact_catalogue.get("engineering")
+    assert isinstance(entry.matcher, KeywordMatcher)
+    assert "quantum basket weaving" in entry.keyword_set
+    assert entry.matcher.find_all("expert in quantum basket weaving") == {"quantum basket weaving"}
+    assert isinstance(artifact_catalogue.get("finance").matcher, FlatMatcher)
+
+    # a fresh process sees the same: the stale category is read from its file
+    reopened = KeywordCatalogue(catalogue.data_dir, check_interval=0, artifact_path=path)
+    assert "quantum basket weaving" in reopened.get("engineering").keyword_set
+    assert reopened.stats()["disk_reads"] == 1
+    # and a union over it is built from the files, not the artifact's masks
+    assert "quantum basket weaving" in reopened.union(["engineering", "finance"]).tags
+    assert CatalogueArtifact(path).sources["engineering"] != os.path.getmtime(os.path.join(catalogue.data_dir, "keywords_engineering.json"))
@@ -0,0 +1,146 @@
+"""Stage admission, timeouts and broken worker pools, and how the API reports them (429, 504, 503)."""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.backend import main
+from src.backend.core import executor
+from src.backend.core.config import settings
+from src.backend.core.executor import Stage, StageOverloaded, StageTimeout, StageUnavailable
+
+
+def crash_once(flag):
+    if not os.path.exists(flag):
+        open(flag, "w").close()
+        os._exit(1)
+    return os.getpid()
+
+
+def crash_always(*args):
+    os._exit(1)
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    """Fresh shared pools; the process pool has one worker and skips the model warm-up."""
+    monkeypatch.setattr(settings, "CPU_WORKERS", 1)
+    monkeypatch.setattr(executor, "_pools", {})
+    monkeypatch.setattr(executor, "_init_worker", lambda: None)
+    yield
+    executor.shutdown_pools()
+
+
+def test_full_queue_rejected(pools):
+    stage = Stage("test", "thread", concurrency=1, max_queue=1, timeout=5)
+    release = threading.Event()
+
+    async def run():
+        jobs = [asyncio.ensure_future(stage.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert stage.in_flight == 2
+        with pytest.raises(StageOverloaded):
+            await stage.run(time.sleep, 0)
+        release.set()
+        return await asyncio.gather(*jobs)
+
+    assert asyncio.run(run()) == [True, True]
+    assert stage.stats()["rejected"] == 1
+    assert stage.in_flight == 0
+
+
+def test_timed_out_job_keeps_its_slot_until_the_worker_finishes(pools):
+    stage = Stage("test", "thread", concurrency=1, max_queue=0, timeout=0.1)
+    release = threading.Event()
+
+    async def run():
+        with pytest.raises(StageTimeout):
+            await stage.run(release.wait, 5)
+        # the worker is still busy with the abandoned job: no room for another
+        assert stage.in_flight == 1
+        with pytest.raises(StageOverloaded):
+            await stage.run(time.sleep, 0)
+        release.set()
+        for _ in range(100):
+            if stage.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert stage.in_flight == 0
+        return await stage.run(os.getpid)
+
+    assert asyncio.run(run()) == os.getpid()
+    assert stage.stats()["timed_out"] == 1
+
+
+def test_job_queued_past_its_timeout_is_cancelled(pools):
+    stage = Stage("test", "thread", concurrency=2, max_queue=2, timeout=0.2)
+    pool = executor.get_pool("thread")
+    release = threading.Event()
+    blockers = [pool.submit(release.wait, 5) for _ in range(settings.IO_THREADS)] # every pool thread busy
+
+    async def run():
+        with pytest.raises(StageTimeout):
+            await stage.run(time.sleep, 0)
+        await asyncio.sleep(0.01)
+        # never started, so the pool dropped it and the slot is free at once
+        assert stage.in_flight == 0
+
+    asyncio.run(run())
+    release.set()
+    assert all(blocker.result() for blocker in blockers)
+
+
+def test_broken_pool_restarted_once(pools, tmp_path):
+    stage = Stage("test", "process", concurrency=1, max_queue=0, timeout=30)
+
+    async def run():
+        assert await stage.run(crash_once, str(tmp_path / "crashed")) != os.getpid()
+        with pytest.raises(StageUnavailable):
+            await stage.run(crash_always)
+        return await stage.run(os.getpid)
+
+    assert asyncio.run(run()) != os.getpid() # a fresh pool serves the next job
+    assert stage.stats()["broken"] == 2
+    assert stage.in_flight == 0
+
+
+# -- API status codes
+
+@pytest.fixture
+def client(pools):
+    return TestClient(main.app)
+
+
+def post_jd_pdf(client):
+    return client.post("/analyse/batch", data={"jobdesc_category": "engineering"},
+                       files=[("jobdesc_pdf", ("jd.pdf", b"%PDF-1.4", "application/pdf"))])
+
+
+def test_overloaded_stage_is_429(client, monkeypatch):
+    monkeypatch.setattr(main.pdf_stage, "in_flight", main.pdf_stage.concurrency + main.pdf_stage.max_queue)
+    response = post_jd_pdf(client)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_timed_out_stage_is_504(client, monkeypatch):
+    monkeypatch.setattr(settings, "CPU_WORKERS", 0) # the slow stand-in runs on a thread
+    monkeypatch.setattr(main.pdf_stage, "timeout", 0.1)
+    release = threading.Event()
+    monkeypatch.setattr(main, "document_text", lambda *args: release.wait(5))
+    assert post_jd_pdf(client).status_code == 504
+    assert main.pdf_stage.in_flight == 1 # until the abandoned extraction finishes
+    release.set()
+    executor.get_pool("process").shutdown(wait=True)
+    assert main.pdf_stage.in_flight == 0
+
+
+def test_broken_stage_is_503(client, monkeypatch):
+    monkeypatch.setattr(main, "document_text", crash_always)
+    response = post_jd_pdf(client)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert main.pdf_stage.in_flight == 0
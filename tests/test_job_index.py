@@ -0,0 +1,101 @@
+"""JobIndex: adds, replaces, removes and compaction keep search equal to pairwise scoring."""
+import dataclasses
+import os
+
+import pytest
+
+from benchmarks.synthetic import synthetic_jd, synthetic_resume
+from src.backend.services.job_index import JobIndex
+from src.backend.services.keyword_catalogue import keyword_catalogue
+from src.backend.services.scoring import build_document_profile, build_document_profiles, score_documents
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "engineering")
+
+
+@pytest.fixture
+def postings(vector_engine):
+    """(id, category, analysed JD) for synthetic postings across every category plus the fixture JD."""
+    categories = keyword_catalogue.categories()
+    jds = [(f"job{seed}", categories[seed % len(categories)]) for seed in range(12)]
+    texts = [synthetic_jd(keyword_catalogue.get(category).keywords, category, seed) for seed, (_, category) in enumerate(jds)]
+    with open(os.path.join(FIXTURES, "jd.txt"), encoding="utf-8") as f:
+        jds.append(("fixture", "engineering"))
+        texts.append(f.read())
+    return [(posting_id, category, document) for (posting_id, category), document in zip(jds, build_document_profiles(texts))]
+
+
+@pytest.fixture
+def resumes(vector_engine):
+    with open(os.path.join(FIXTURES, "resume_strong.txt"), encoding="utf-8") as f:
+        texts = [f.read()]
+    texts += [synthetic_resume(keyword_catalogue.get(category).keywords, 1, category, seed=3)
+              for category in keyword_catalogue.categories()[:3]]
+    return [build_document_profile(text) for text in texts]
+
+
+def assert_matches_pairwise(index, postings, resumes):
+    """Every live posting is returned, ranked and scored as score_documents ranks and scores it."""
+    live = {posting_id: (category, document) for posting_id, category, document in postings if posting_id in index.postings}
+    assert set(live) == set(index.postings)
+    for resume in resumes:
+        results = index.search(resume, top_k=len(postings))
+        expected = {posting_id: score_documents(resume, document, category)
+                    for posting_id, (category, document) in live.items()}
+        assert {result["id"] for result in results} == set(live)
+        for result in results:
+            score, keyword_score, _, _, _, _, _, semantic = expected[result["id"]]
+            assert result["score"] == pytest.approx(score, abs=0.01)
+            assert result["keyword_score"] == pytest.approx(keyword_score, abs=0.01)
+            assert result["semantic_score"] == pytest.approx(semantic, abs=0.01)
+        # ranked best first by the pairwise score (ties within rounding in any order)
+        scores = [expected[result["id"]][0] for result in results]
+        assert all(a >= b - 0.01 for a, b in zip(scores, scores[1:]))
+
+
+def test_add_replace_remove_compact(tmp_path, postings, resumes):
+    index = JobIndex(str(tmp_path / "index"))
+    assert index.add_many((posting_id, category, posting_id, document) for posting_id, category, document in postings) == len(postings)
+    assert_matches_pairwise(index, postings, resumes)
+
+    # replace: same id, another category and JD
+    _, _, fixture_document = postings[-1]
+    index.add("job5", "science", "replaced", fixture_document)
+    postings[5] = ("job5", "science", fixture_document)
+    assert index.postings["job5"].title == "replaced"
+    assert index.remove("job3") and index.remove("job4")
+    assert not index.remove("job3")
+    assert_matches_pairwise(index, postings, resumes)
+    assert index.stats()["dead_rows"] == 3
+
+    reloaded = JobIndex(str(tmp_path / "index"))
+    assert_matches_pairwise(reloaded, postings, resumes)
+    assert reloaded.compact() == 3
+    assert reloaded.stats()["dead_rows"] == 0
+    assert_matches_pairwise(reloaded, postings, resumes)
+    assert_matches_pairwise(JobIndex(str(tmp_path / "index")), postings, resumes)
+
+
+def test_category_filter(tmp_path, postings, resumes):
+    index = JobIndex(str(tmp_path / "index"))
+    index.add_many((posting_id, category, posting_id, document) for posting_id, category, document in postings)
+    results = index.search(resumes[0], top_k=100, category="engineering")
+    assert results and {result["category"] for result in results} == {"engineering"}
+    assert len(index.search(resumes[0], top_k=2)) == 2
+
+
+def test_engine_is_the_documents(tmp_path, postings, resumes):
+    index = JobIndex(str(tmp_path / "index"))
+    index.add_many((posting_id, category, posting_id, document) for posting_id, category, document in postings[:2])
+    assert index.stats()["engine"] == "vectors"
+
+    # what the profile was analysed with counts, not the setting
+    spacy_resume = dataclasses.replace(resumes[0], engine="spacy")
+    with pytest.raises(ValueError):
+        index.search(spacy_resume)
+    with pytest.raises(ValueError):
+        index.add("other", "engineering", "", dataclasses.replace(postings[2][2], engine="spacy"))
+
+    spacy_index = JobIndex(str(tmp_path / "spacy"))
+    spacy_index.add("job0", postings[0][1], "", dataclasses.replace(postings[0][2], engine="spacy"))
+    assert JobIndex(str(tmp_path / "spacy")).stats()["engine"] == "spacy"
+    assert spacy_index.search(spacy_resume)[0]["id"] == "job0"
@@ -0,0 +1,246 @@
+"""
+KeywordMatcher and section_weighted_score against the regex implementation they replaced.
+
+The reference functions below are the original `\\bkeyword\\b` scoring code, kept
+verbatim so any drift in matching or scoring shows up as a parity failure.
+"""
+import glob
+import json
+import os
+import random
+import re
+
+import pytest
+
+from src.backend.core.config import settings
+from src.backend.services.keyword_catalogue import keyword_catalogue
+from src.backend.services.keyword_matcher import KeywordMatcher
+from src.backend.services.scoring import section_weighted_score
+from src.backend.services.sections import INFO_CATEGORIES, segment_sections
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "engineering")
+CATEGORIES = keyword_catalogue.categories()
+
+
+# -- reference: the regex implementation
+
+def regex_find_all(keywords, text):
+    return {kw for kw in keywords if re.search(r"\b" + re.escape(kw.lower()) + r"\b", text.lower())}
+
+def legacy_segment_sections(text):
+    sections = {"EXPERIENCE": "", "EDUCATION": "", "SKILLS": "", "OTHER": ""}
+    current_section = "OTHER"
+    for line in text.splitlines():
+        line = line.strip()
+        found = False
+        for section, info in INFO_CATEGORIES.items():
+            if (len(line.split()) < 5) and any(h in line.lower() for h in info["headers"]):
+                current_section = section
+                found = True
+                break
+        if not found:
+            if sections[current_section] == "": sections[current_section] = line
+            else: sections[current_section] += "%nl%" + line
+    return sections
+
+def legacy_tokenize(text):
+    return [re.sub(r"[^a-zA-Z0-9]", "", t) for t in text.lower().split() if re.sub(r"[^a-zA-Z0-9]", "", t)]
+
+def legacy_find_keyword_occurrences(tokens, keyword_tokens):
+    k = len(keyword_tokens)
+    for i in range(len(tokens) - k + 1):
+        if tokens[i:i+k] == keyword_tokens:
+            yield i
+
+def legacy_extract_context(tokens, start_idx, kw_len, window=3):
+    before_start = max(0, start_idx - window)
+    after_end = min(len(tokens), start_idx + kw_len + window)
+    return " ".join(tokens[before_start:start_idx]), " ".join(tokens[start_idx + kw_len:after_end])
+
+def legacy_section_weighted_score(resume_sections, job_text, keywords):
+    resume_weight = 0
+    jd_weight = 0
+    section_scores = [0.0, 0.0, 0.0, 0.0]
+    matched_keywords = {}
+    jd_keywords = {}
+    missing_keywords = {}
+    skills_wgt = INFO_CATEGORIES.get("SKILLS", {"weight": 4})["weight"]
+    extra_keywords = []
+
+    for line in job_text.splitlines():
+        for word in line.split():
+            if sum(1 for char in word if char.isupper()) >= 2 and word not in keywords:
+                extra_keywords.append(word.lower())
+    for kw in extra_keywords:
+        jd_keywords.update({kw: skills_wgt})
+    for kw in keywords:
+        pattern = r"\b" + re.escape(kw.lower()) + r"\b"
+        if re.search(pattern, job_text.lower()):
+            jd_keywords.update({kw: skills_wgt})
+
+    for section, res_text in resume_sections.items():
+        if not res_text.strip():
+            continue
+        weight = INFO_CATEGORIES.get(section, {"weight": 1})["weight"]
+        for kw in keywords:
+            pattern = r"\b" + re.escape(kw.lower()) + r"\b"
+            if re.search(pattern, res_text.lower()) and re.search(pattern, job_text.lower()) and kw not in matched_keywords:
+                matched_keywords.update({kw: weight})
+                jd_keywords.update({kw: weight})
+        for kw in extra_keywords:
+            pattern = r"\b" + re.escape(kw.lower()) + r"\b"
+            if re.search(pattern, res_text.lower()) and kw not in matched_keywords:
+                matched_keywords.update({kw: skills_wgt})
+
+    jd_tokens = legacy_tokenize(job_text)
+    for kw, wgt in jd_keywords.items():
+        if kw in matched_keywords:
+            continue
+        kw_tokens = legacy_tokenize(kw)
+        contexts = [list(legacy_extract_context(jd_tokens, idx, len(kw_tokens)))
+                    for idx in legacy_find_keyword_occurrences(jd_tokens, kw_tokens)]
+        missing_keywords[kw] = contexts[0] if contexts else ["", ""]
+
+    section_scores_jd = [0.0, 0.0, 0.0, 0.0]
+    section_scores_res = [0.0, 0.0, 0.0, 0.0]
+    for kw, wgt in jd_keywords.items():
+        if wgt > 0: section_scores_jd[wgt-1] += wgt
+        jd_weight += wgt
+    for kw, wgt in matched_keywords.items():
+        if wgt > 0: section_scores_res[wgt-1] += wgt
+        resume_weight += wgt
+    for k in range(0, len(section_scores)):
+        section_scores[k] = round(section_scores_res[k] / max(section_scores_jd[k], 1) * 100, 2)
+
+    avg_score = resume_weight / max(jd_weight, 1)
+    density = len(matched_keywords) / max(len(jd_keywords), 1)
+    matched_keywords = {key: val for key, val in sorted(matched_keywords.items())}
+    return avg_score, section_scores, density, matched_keywords, missing_keywords
+
+
+# -- fixtures
+
+def read_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+FIXTURE_TEXTS = {os.path.basename(path): read_fixture(path) for path in sorted(glob.glob(os.path.join(FIXTURES, "*.txt")))}
+
+BOUNDARY_KEYWORDS = ["c++", "c", ".net", "net", "r&d", "r", "node.js", "node", "js", "c#", "ci/cd", "a/b testing"]
+
+BOUNDARY_TEXTS = [
+    "c++",
+    "c++ developer",
+    "Senior C++ engineer",
+    "wrote c++17 and c++, then C#",
+    ".net",
+    ".NET Core and ASP.NET",
+    "dotnet, vb.net.",
+    "R&D",
+    "led r&d teams",
+    "r&d-heavy",
+    "node.js",
+    "Node.js backend with node.jsx",
+    "node.js.",
+    "(node.js)",
+    "CI/CD pipelines and A/B testing",
+    "c",
+    "r",
+    "",
+    "\n",
+    "c++\nc#\n.net\nr&d\nnode.js",
+]
+
+
+def read_keyword_files():
+    """category -> keyword list, straight from every keywords_<category>.json."""
+    lists = {}
+    for path in sorted(glob.glob(os.path.join(settings.KEYWORD_DATA_DIR, "keywords_*.json"))):
+        with open(path, encoding="utf-8") as f:
+            lists[os.path.basename(path)[len("keywords_"):-len(".json")]] = json.load(f)
+    return lists
+
+KEYWORD_FILES = read_keyword_files()
+
+# joiners that put word characters, punctuation and section breaks next to keywords
+SEPARATORS = [" ", ", ", "\n", "(", ") ", "/", "-", ".", "_", "x", "9", "", "  ", "+", "#", "&",
+              "\nSKILLS\n", "\nExperience\n", "\nEDUCATION\n"]
+
+def random_text(rng, words, count):
+    """Keywords from every category in random case, joined by random separators."""
+    parts = []
+    for _ in range(count):
+        word = rng.choice(words)
+        parts.append(rng.choice([word, word.upper(), word.lower(), word.title()]) + rng.choice(SEPARATORS))
+    return "".join(parts)
+
+RANDOM_SEED = 1001
+RANDOM_WORDS = sorted({kw for keywords in KEYWORD_FILES.values() for kw in keywords}) + BOUNDARY_KEYWORDS * 20
+
+
+# -- KeywordMatcher.find_all
+
+@pytest.mark.parametrize("text", BOUNDARY_TEXTS)
+def test_find_all_boundaries_match_regex(text):
+    matcher = KeywordMatcher(BOUNDARY_KEYWORDS)
+    assert matcher.find_all(text.lower()) == regex_find_all(BOUNDARY_KEYWORDS, text)
+
+@pytest.mark.parametrize("keyword", BOUNDARY_KEYWORDS)
+def test_find_all_at_text_start_and_end(keyword):
+    matcher = KeywordMatcher([keyword])
+    for text in (keyword, f"{keyword} tail", f"head {keyword}", f"head, {keyword}.", f"{keyword}\n", f"x{keyword}x"):
+        assert matcher.find_all(text) == regex_find_all([keyword], text), text
+
+@pytest.mark.parametrize("category", CATEGORIES)
+@pytest.mark.parametrize("name", sorted(FIXTURE_TEXTS))
+def test_find_all_catalogue_matches_regex(category, name):
+    keywords = keyword_catalogue.get(category).keywords
+    text = FIXTURE_TEXTS[name]
+    assert KeywordMatcher(keywords).find_all(text.lower()) == regex_find_all(keywords, text)
+
+
+# -- section_weighted_score
+
+@pytest.mark.parametrize("category", CATEGORIES)
+@pytest.mark.parametrize("name", sorted(name for name in FIXTURE_TEXTS if name.startswith("resume_")))
+def test_section_weighted_score_matches_regex(category, name):
+    keywords = list(keyword_catalogue.get(category).keywords)
+    resume, job_text = FIXTURE_TEXTS[name], FIXTURE_TEXTS["jd.txt"]
+    expected = legacy_section_weighted_score(legacy_segment_sections(resume), job_text, keywords)
+    actual = section_weighted_score(segment_sections(resume), job_text, keywords)
+    assert actual[:3] == expected[:3]
+    assert list(actual[3].items()) == list(expected[3].items())
+    assert list(actual[4].items()) == list(expected[4].items())
+
+@pytest.mark.parametrize("resume, job_text", [
+    ("SKILLS\nC++, .NET, R&D\nnode.js", "We need C++ and .NET devs for R&D.\nnode.js a plus"),
+    ("c++", "c++"),
+    ("Experience\nBuilt node.js services", "Node.js, CI/CD and A/B testing on AWS"),
+    ("", "C++ and R&D"),
+])
+def test_section_weighted_score_boundaries_match_regex(resume, job_text):
+    expected = legacy_section_weighted_score(legacy_segment_sections(resume), job_text, BOUNDARY_KEYWORDS)
+    actual = section_weighted_score(segment_sections(resume), job_text, BOUNDARY_KEYWORDS)
+    assert actual[:3] == expected[:3]
+    assert list(actual[3].items()) == list(expected[3].items())
+    assert list(actual[4].items()) == list(expected[4].items())
+
+
+# -- randomised parity over every keyword file
+
+@pytest.mark.parametrize("category", sorted(KEYWORD_FILES))
+def test_random_texts_match_regex(category):
+    rng = random.Random(f"{RANDOM_SEED}:{category}")
+    # lowercased as the catalogue serves them, plus punctuated keywords next to the \b boundaries
+    keywords = [kw.lower() for kw in KEYWORD_FILES[category]] + BOUNDARY_KEYWORDS
+    matcher = KeywordMatcher(keywords)
+    for _ in range(30):
+        resume = random_text(rng, RANDOM_WORDS, rng.randint(0, 150))
+        job_text = random_text(rng, RANDOM_WORDS, rng.randint(0, 60))
+        assert matcher.find_all(resume.lower()) == regex_find_all(keywords, resume), resume
+
+        expected = legacy_section_weighted_score(legacy_segment_sections(resume), job_text, keywords)
+        actual = section_weighted_score(segment_sections(resume), job_text, keywords)
+        assert actual[:3] == expected[:3], (resume, job_text)
+        assert list(actual[3].items()) == list(expected[3].items()), (resume, job_text)
+        assert list(actual[4].items()) == list(expected[4].items()), (resume, job_text)
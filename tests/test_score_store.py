@@ -0,0 +1,97 @@
+"""ScoreStore: stored results brought up to date by sync equal a full recompute."""
+import json
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic import synthetic_resume
+from src.backend.services.score_store import ScoreStore
+from src.backend.services.scoring import build_document_profile, get_keywords_list, score_documents
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "engineering")
+CATEGORY = "engineering"
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def full_recompute(resumes, job_text, category):
+    """Expected stored results: every resume scored from scratch."""
+    job_document = build_document_profile(job_text)
+    expected = {}
+    for resume_id, text in resumes:
+        score = score_documents(build_document_profile(text), job_document, category)
+        expected[resume_id] = json.loads(json.dumps({
+            "score": score[0], "keyword_score": score[1], "semantic_score": score[7], "density": score[4],
+            "section_scores": score[3], "matched_keywords": score[5], "missing_keywords": score[6],
+        }))
+    return expected
+
+
+def stored(store, job_id):
+    return {result.pop("id"): result for result in store.results(job_id)}
+
+
+@pytest.fixture
+def resumes(catalogue):
+    keywords = get_keywords_list(CATEGORY)
+    return [("fixture", read_fixture("resume_strong.txt"))] + \
+           [(f"synthetic-{i}", synthetic_resume(keywords[i * 5:], 1, CATEGORY, seed=i)) for i in range(8)]
+
+
+@pytest.fixture
+def store(tmp_path, vector_engine, catalogue):
+    return ScoreStore(str(tmp_path / "scores.sqlite3"))
+
+
+def test_sync_after_keyword_and_jd_edits_equals_full_recompute(store, resumes, edit_keywords):
+    job_text = read_fixture("jd.txt")
+    store.put_job("job", job_text, CATEGORY)
+    store.put_resumes("job", resumes)
+    assert stored(store, "job") == full_recompute(resumes, job_text, CATEGORY)
+
+    # keyword file edit: some keywords dropped, some added that the documents contain
+    edit_keywords(CATEGORY, lambda keywords: keywords[10:] + ["Pytest", "Code Review", "Mentoring", "Distributed Systems"])
+    assert store.sync() == len(resumes)
+    assert stored(store, "job") == full_recompute(resumes, job_text, CATEGORY)
+    assert store.sync() == 0
+    assert store.documents_parsed == len(resumes) + 1 # nothing re-parsed
+
+    # JD edit
+    job_text += "\nNice to have: Kubernetes, Terraform and Go.\n"
+    assert store.put_job("job", job_text, CATEGORY) == len(resumes)
+    assert stored(store, "job") == full_recompute(resumes, job_text, CATEGORY)
+
+
+def test_failed_put_rolls_back_and_store_stays_usable(store, resumes, monkeypatch):
+    store.put_job("job", read_fixture("jd.txt"), CATEGORY)
+
+    def broken(job, key):
+        raise RuntimeError("scoring failed")
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "_score", broken)
+        with pytest.raises(RuntimeError):
+            store.put_resumes("job", resumes[:2])
+
+    assert store.results("job") == []
+    assert store.put_resumes("job", resumes[:2]) == 2
+    assert len(store.results("job")) == 2
+
+
+def test_rows_of_another_format_version_are_rebuilt(store, resumes, tmp_path):
+    job_text = read_fixture("jd.txt")
+    store.put_job("job", job_text, CATEGORY)
+    store.put_resumes("job", resumes[:3])
+    db = sqlite3.connect(str(tmp_path / "scores.sqlite3"))
+    db.execute("UPDATE documents SET version = 0")
+    db.execute("UPDATE results SET fingerprint = 'stale'")
+    db.commit()
+    db.close()
+
+    reopened = ScoreStore(str(tmp_path / "scores.sqlite3"))
+    assert reopened.sync() == 3
+    assert reopened.documents_rebuilt == 4
+    assert stored(reopened, "job") == full_recompute(resumes[:3], job_text, CATEGORY)
@@ -0,0 +1,66 @@
+"""Vector-only semantic engine against the spaCy (Doc.similarity) engine."""
+import logging
+import os
+
+import pytest
+
+from src.backend.core.config import settings
+from src.backend.services import semantic
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "engineering")
+TOLERANCE = 0.1 # same default as `semantic compare`
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def has_model():
+    import spacy
+    return spacy.util.is_package("en_core_web_md")
+
+
+@pytest.fixture
+def reset_table(monkeypatch):
+    monkeypatch.setattr(semantic, "_table", None)
+    monkeypatch.setattr(semantic, "_table_missing", False)
+
+
+def resume_text(name):
+    """Non-empty resumes of different strength against the engineering JD."""
+    from benchmarks.synthetic import synthetic_resume
+    from src.backend.services.keyword_catalogue import keyword_catalogue
+
+    if name == "fixture":
+        return read_fixture("resume_strong.txt")
+    category = "engineering" if name == "engineering" else "marketing"
+    return synthetic_resume(keyword_catalogue.get(category).keywords, 1, category)
+
+
+@pytest.mark.skipif(not has_model(), reason="en_core_web_md is not installed")
+@pytest.mark.parametrize("resume", ["fixture", "engineering", "marketing"])
+def test_vector_similarity_within_tolerance_of_spacy(tmp_path, resume):
+    from src.backend.services.scoring import extract_keywords, semantic_match_score
+
+    semantic.build_vector_table(str(tmp_path))
+    table = semantic.VectorTable(str(tmp_path))
+    text, job_text = resume_text(resume), read_fixture("jd.txt")
+    assert text.strip()
+
+    # the original engine: Doc.similarity over the re-parsed noun chunks
+    spacy_score = semantic_match_score(extract_keywords(text), extract_keywords(job_text))
+    assert abs(spacy_score - table.similarity(text, job_text)) <= TOLERANCE
+
+
+def test_missing_table_is_looked_up_and_logged_once(tmp_path, monkeypatch, reset_table, caplog):
+    monkeypatch.setattr(settings, "VECTOR_TABLE_DIR", str(tmp_path / "missing"))
+    loads = []
+    real_load = semantic.np.load
+    monkeypatch.setattr(semantic.np, "load", lambda *args, **kwargs: loads.append(args) or real_load(*args, **kwargs))
+
+    with caplog.at_level(logging.WARNING, logger=semantic.__name__):
+        assert semantic.get_vector_table() is None
+        assert semantic.get_vector_table() is None
+    assert len(loads) == 1
+    assert len([r for r in caplog.records if "Vector table not found" in r.getMessage()]) == 1
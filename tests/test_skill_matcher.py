@@ -0,0 +1,102 @@
+"""Skill matching: alias normalisation, the similarity threshold and the no-vectors fallback."""
+import numpy as np
+import pytest
+
+from src.backend.core.config import settings
+from src.backend.services import semantic, skill_matcher
+from src.backend.services.skill_matcher import canonical_skill, embed_skills, match_skills, normalise_skill
+
+# 2-d word vectors: rabbitmq is ~0.9 cosine from kafka, excel is orthogonal to both
+WORD_VECTORS = {
+    "kafka": [1.0, 0.0],
+    "rabbitmq": [0.9, 0.436],
+    "excel": [0.0, 1.0],
+}
+
+
+@pytest.fixture
+def word_vectors(tmp_path, monkeypatch):
+    """SEMANTIC_ENGINE=vectors over a table holding only WORD_VECTORS."""
+    from spacy.strings import hash_string
+
+    words = sorted(WORD_VECTORS, key=hash_string)
+    np.save(tmp_path / semantic.VECTORS_FILE, np.array([WORD_VECTORS[w] for w in words], dtype=np.float32))
+    np.save(tmp_path / semantic.KEYS_FILE, np.array([hash_string(w) for w in words], dtype=np.uint64))
+    np.save(tmp_path / semantic.ROWS_FILE, np.arange(len(words), dtype=np.int32))
+    monkeypatch.setattr(settings, "SEMANTIC_ENGINE", "vectors")
+    monkeypatch.setattr(settings, "VECTOR_TABLE_DIR", str(tmp_path))
+    monkeypatch.setattr(semantic, "_table", None)
+    monkeypatch.setattr(semantic, "_table_missing", False)
+
+
+@pytest.fixture
+def no_vectors(monkeypatch):
+    """The spaCy engine over a pipeline without word vectors."""
+    import spacy
+
+    monkeypatch.setattr(settings, "SEMANTIC_ENGINE", "spacy")
+    monkeypatch.setattr(skill_matcher, "get_nlp", lambda: spacy.blank("en"))
+
+
+# -- normalisation and aliases
+
+@pytest.mark.parametrize("skill, expected", [
+    ("Node.js", "node js"),
+    ("  C++ ", "c++"),
+    ("C#/.NET", "c# net"),
+    ("CI / CD", "ci cd"),
+])
+def test_normalise_skill(skill, expected):
+    assert normalise_skill(skill) == expected
+
+
+@pytest.mark.parametrize("skill, expected", [
+    ("Postgres", "postgresql"),
+    ("psql", "postgresql"),
+    ("PostgreSQL", "postgresql"),
+    ("ML", "machine learning"),
+    ("machine-learning", "machine learning"),
+    ("K8s", "kubernetes"),
+    ("Fortran", "fortran"), # no alias: just normalised
+])
+def test_canonical_skill(skill, expected):
+    assert canonical_skill(skill) == expected
+
+
+def test_alias_matches_need_no_vectors(no_vectors):
+    resume = ["Postgres", "ML", "Excel"]
+    assert match_skills(resume, ["PostgreSQL", "Machine Learning", "excel", "Kafka"]) == ["Postgres", "ML", "Excel", None]
+
+
+# -- similarity threshold
+
+def test_similar_skill_matched_at_or_above_threshold(word_vectors):
+    resume = ["RabbitMQ", "Excel"]
+    assert match_skills(resume, ["Kafka"], threshold=0.8) == ["RabbitMQ"]
+    assert match_skills(resume, ["Kafka"], threshold=0.95) == [None]
+
+
+def test_threshold_defaults_to_setting(word_vectors, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_MATCH_THRESHOLD", 0.8)
+    assert match_skills(["RabbitMQ"], ["Kafka"]) == ["RabbitMQ"]
+    monkeypatch.setattr(settings, "SKILL_MATCH_THRESHOLD", 0.95)
+    assert match_skills(["RabbitMQ"], ["Kafka"]) == [None]
+
+
+def test_threshold_above_one_is_exact_and_alias_only(word_vectors):
+    # "Kafka Streams" embeds exactly like "Kafka" (streams has no vector), yet only names match
+    resume = ["Kafka Streams", "Postgres"]
+    assert match_skills(resume, ["Kafka", "PostgreSQL"], threshold=1.0) == ["Kafka Streams", "Postgres"]
+    assert match_skills(resume, ["Kafka", "PostgreSQL"], threshold=1.01) == [None, "Postgres"]
+
+
+def test_skill_without_known_words_is_not_matched(word_vectors):
+    assert match_skills(["Kafka", "Excel"], ["Fortran"], threshold=0.5) == [None]
+    assert not embed_skills(["fortran"]).any()
+
+
+# -- no vectors
+
+def test_no_vectors_falls_back_to_exact_and_alias(no_vectors):
+    assert embed_skills(["kafka"]) is None
+    assert match_skills(["RabbitMQ", "Postgres"], ["Kafka", "psql"], threshold=0.0) == [None, "Postgres"]